@@ -10,9 +10,12 @@ class ProtoAnimator(ABC):
     """an animator mainly stores the information of which parameters will be animated and performs logic on the input values.
     it outputs only the necessary animations as an animation group and rescales them by the relative run time"""
 
-    def __new__(cls, *objs, rel_start=0, rel_stop=1, relative=False, multiplicative=False, unpack_groups=True, animation_type="xvector", category=None, composition_mode=False):
+    def __new__(cls, *objs, rel_start=0, rel_stop=1, relative=False, multiplicative=False, unpack_groups=True, animation_type="xvector", category=None, composition_mode=False, easing=None, key_mode="adaptive"):
         cls.document = c4d.documents.GetActiveDocument()
         cls.animation_type = animation_type
+        # easing written as keys of the vector and completion animations, see pydeation.animation.easing
+        cls.easing = easing
+        cls.key_mode = key_mode
         # changes return values so it works with xcompositions
         cls.composition_mode = composition_mode
         cls.objs = cls.flatten_input(*objs, unpack_groups=unpack_groups)
@@ -79,26 +82,29 @@ class ProtoAnimator(ABC):
             cls.specify_xpression()
             for obj in cls.objs:
                 # check if object already has animator
-                if cls.__name__ in obj.xpressions:
-                    xanimator = obj.xpressions[cls.__name__]
+                xpression_key = cls.specify_xpression_key(obj)
+                if xpression_key in obj.xpressions:
+                    xanimator = obj.xpressions[xpression_key]
                 else:
                     link_target = cls.specify_target(obj)  # get link target
                     # only one descId in dict anyway, might be different for other animators
                     target_parameter_desc_id = list(cls.desc_ids.values())[0]
+                    # parameters of helper objects are remembered per helper object
+                    parameter_key = str(target_parameter_desc_id)
+                    if link_target is not None and link_target is not obj:
+                        parameter_key = (parameter_key, link_target)
                     # check if object already has accessed given parameter
-                    if str(target_parameter_desc_id) in obj.accessed_parameters:
-                        parameter = obj.accessed_parameters[str(
-                            target_parameter_desc_id)]
+                    if parameter_key in obj.accessed_parameters:
+                        parameter = obj.accessed_parameters[parameter_key]
                     else:
                         parameter = UParameter(
                             obj, target_parameter_desc_id, link_target=link_target, name=cls.parameter_name)
                         # remember parameter
-                        obj.accessed_parameters[str(
-                            target_parameter_desc_id)] = parameter
+                        obj.accessed_parameters[parameter_key] = parameter
                     xanimator = XAnimator(
                         obj, interpolate=cls.interpolate, formula=cls.formula, params=cls.udatas, name=cls.__name__)
                     # remember xanimator
-                    obj.xpressions[cls.__name__] = xanimator
+                    obj.xpressions[xpression_key] = xanimator
                     xanimation = XAnimation(
                         xanimator, target=obj, parameter=parameter, reverse_parameter_range=cls.reverse_parameter_range)
                 if cls.composition_mode:
@@ -113,6 +119,11 @@ class ProtoAnimator(ABC):
         """specifies the details of the xpresso setup"""
         pass
 
+    @classmethod
+    def specify_xpression_key(cls, obj):
+        """specifies the key the xanimator is remembered by on the object, one xanimator per animator by default"""
+        return cls.__name__
+
     @classmethod
     def flatten_input(cls, *objs, unpack_groups=True):
         """flattens the input to the specified depth:
@@ -138,7 +149,7 @@ class ProtoAnimator(ABC):
         # seperately add completion animation for xanimators
         if cls.animation_type == "xvector":
             completion_animation = CompletionAnimation(
-                obj, cls.completion_sliders[obj].desc_id, value_ini=0, value_fin=1)
+                obj, cls.completion_sliders[obj].desc_id, value_ini=0, value_fin=1, easing=cls.easing, key_mode=cls.key_mode)
             animations.append(completion_animation)
         # create animation for each value
         for i, value in enumerate(cls.values):
@@ -148,7 +159,7 @@ class ProtoAnimator(ABC):
                 # create animation on target
                 if cls.animation_type == "vector":
                     animation = VectorAnimation(
-                        target, list(cls.desc_ids.values())[i], value_fin=value, relative=relative, multiplicative=multiplicative, value_type=cls.animation_parameters[obj][i].value_type)
+                        target, list(cls.desc_ids.values())[i], value_fin=value, relative=relative, multiplicative=multiplicative, value_type=cls.animation_parameters[obj][i].value_type, easing=cls.easing, key_mode=cls.key_mode)
                 elif cls.animation_type == "xvector":
                     # check if list is not empty
                     if cls.animation_parameters[obj]:
@@ -263,7 +274,10 @@ class FillAnimator(ProtoAnimator):
 class ComposedAnimator(ProtoAnimator):
     """this class serves as a blueprint for Animators that are composed from simpler ones"""
 
-    def __new__(cls, rel_start=0, rel_stop=1, category=None):
+    def __new__(cls, rel_start=0, rel_stop=1, category=None, easing=None, key_mode="adaptive"):
+        # the easing is written by the composed animators, subclasses forward it when composing them
+        cls.easing = easing
+        cls.key_mode = key_mode
         animation_group_rescaled = cls.rescale_animation_group(
             rel_start, rel_stop)
         # add category for visibility handling
@@ -286,9 +300,11 @@ class ComposedXAnimator(ProtoAnimator):
         - values and xanimators must have the same order
         - the composition level specifies which xtag in the composition hierarchy the xpression is assigned to"""
 
-    def __new__(cls, rel_start=0, rel_stop=1, category=None, composition_mode=False, composition_level=1):
+    def __new__(cls, rel_start=0, rel_stop=1, category=None, composition_mode=False, composition_level=1, easing=None, key_mode="adaptive"):
         cls.composition_mode = composition_mode
         cls.composition_level = composition_level
+        cls.easing = easing
+        cls.key_mode = key_mode
         cls.create_xpression()
         if cls.composition_mode:
             return cls.xcomposers
@@ -341,7 +357,7 @@ class ComposedXAnimator(ProtoAnimator):
         animations = []
         # seperately add completion animation for xcomposition
         completion_animation = CompletionAnimation(
-            obj, cls.completion_sliders[obj].desc_id, value_ini=0, value_fin=1)
+            obj, cls.completion_sliders[obj].desc_id, value_ini=0, value_fin=1, easing=cls.easing, key_mode=cls.key_mode)
         animations.append(completion_animation)
         # create animation for each value
         for i, value in enumerate(cls.values):
@@ -1,5 +1,9 @@
 from abc import ABC, abstractmethod
 from pydeation.constants import WHITE
+from pydeation.animation.easing import get_easing, check_key_mode, sample_adaptive, get_bezier_tangents
+from pydeation.animation.timing import to_seconds, to_frame
+from fractions import Fraction
+import numpy as np
 import c4d
 
 
@@ -7,7 +11,7 @@ class KeyFrame:
     """a keyframe object is responsible for creating a keyframe in c4d for a single target for a single description id
     with a specific value and time"""
 
-    def __init__(self, target, desc_id, value=None, time=None):
+    def __init__(self, target, desc_id, value=None, time=None, interpolation=None):
         self.document = c4d.documents.GetActiveDocument()  # get document
         self.target = target
         self.desc_id = desc_id
@@ -16,6 +20,8 @@ class KeyFrame:
         self.curve = self.get_curve(self.track)
         self.key = self.set_key(self.time)
         self.value = self.set_value(value)
+        if interpolation is not None:
+            self.key.SetInterpolation(self.curve, interpolation)
 
     def get_track(self):
         """finds or create the animation track for the given target"""
@@ -49,6 +55,27 @@ class KeyFrame:
         else:  # general case
             self.key.SetValue(self.curve, value)
 
+    def set_tangent(self, side, time, value):
+        """sets the left or right tangent of the key given as time in seconds and value, disabling the auto tangents"""
+        self.key.ChangeNBit(c4d.NBIT_CKEY_AUTO, c4d.NBITCONTROL_CLEAR)
+        if side == "left":
+            self.key.SetTimeLeft(self.curve, c4d.BaseTime(time))
+            self.key.SetValueLeft(self.curve, value)
+        else:
+            self.key.SetTimeRight(self.curve, c4d.BaseTime(time))
+            self.key.SetValueRight(self.curve, value)
+
+
+class PointKeyFrame(KeyFrame):
+    """a point keyframe stores the positions of all points of an editable point object in its point level animation track"""
+
+    def set_value(self, value):
+        """writes the points to the object and captures them in the key"""
+        points = [c4d.Vector(*point) for point in np.asarray(value, dtype=float).tolist()]
+        self.target.obj.SetAllPoints(points)
+        self.target.obj.Message(c4d.MSG_UPDATE)
+        self.track.FillKey(self.document, self.target.obj, self.key)
+
 
 class Animation(ABC):
     """an animation object is responsible for setting keyframes for a single description id for a single object"""
@@ -56,6 +83,7 @@ class Animation(ABC):
     def __init__(self, target, desc_id, value_type, name=None):
         self.document = c4d.documents.GetActiveDocument()  # get document
         self.abs_run_time = 1  # set default to 1 second
+        self.play_start = None  # exact time in seconds at which the play starts, set by the scene
         self.target = target  # the target that is animated on
         self.desc_id = desc_id  # holds the description id of the animation
         # the param id is needed to receive the current value
@@ -100,19 +128,34 @@ class Animation(ABC):
         current_value = self.target.obj[param_id]
         return current_value
 
-    def global_time(self, time: c4d.BaseTime):
-        """adds the current document time to the scaled run time"""
-        current_time = self.document.GetTime()
-        global_time = current_time + time
-        return global_time
+    def global_frame(self, time):
+        """converts the scaled run time to the frame of the absolute time it ends at
+        the start of the play is the exact time given by the scene or the current document frame"""
+        fps = self.document.GetFps()
+        play_start = self.play_start
+        if play_start is None:
+            play_start = Fraction(self.document.GetTime().GetFrame(fps), fps)
+        return to_frame(play_start + to_seconds(time), fps)
+
+    def frame_to_time(self, frame):
+        """converts a frame to a base time, the only place where the frames become times"""
+        return c4d.BaseTime(frame, self.document.GetFps())
 
 
 class VectorAnimation(Animation):
     """a vector animation object is responsible for setting an initial and final keyframe for a single description id for a single object
-    the keyframes are spaced internally only on a relative scale and have to be scaled by the absolute run time provided by the Scene.play() function"""
+    the keyframes are spaced internally only on a relative scale and have to be scaled by the absolute run time provided by the Scene.play() function
+    an easing from pydeation.animation.easing replaces the default spline between the two keyframes by the eased curve written as:
+        - "adaptive": linear keys on the frames needed to follow the curve within the tolerance
+        - "dense": linear keys on every frame
+        - "tangents": two keys with the tangents of a cubic bezier easing"""
 
-    def __init__(self, target, desc_id, value_fin=None, value_ini=None, value_type=float, rel_start=0, rel_stop=1, relative=False, multiplicative=False, **kwargs):
+    def __init__(self, target, desc_id, value_fin=None, value_ini=None, value_type=float, rel_start=0, rel_stop=1, relative=False, multiplicative=False, easing=None, key_mode="adaptive", tolerance=1e-3, **kwargs):
         super().__init__(target, desc_id, value_type, **kwargs)
+        self.easing = get_easing(easing)
+        check_key_mode(self.easing, key_mode)
+        self.key_mode = key_mode
+        self.tolerance = tolerance  # maximum deviation of adaptive keys relative to the value range
         # used for multiplicative relative animations like e.g. scale
         self.multiplicative = multiplicative
         self.relative = relative  # specifies whether animation is relative or absolute
@@ -143,18 +186,61 @@ class VectorAnimation(Animation):
         """sets the actual keyframes of the animation"""
         # translate relative to absolute run time
         self.scale_relative_run_time(self.abs_run_time)
-        # calculate offset frame for initial keyframe
-        offset = 1 / self.document.GetFps()
-        # set keyframes
+        if self.easing is not None and self.frame_stop - 1 > self.frame_start:
+            self.execute_eased()
+            return
+        # set keyframes, the final keyframe sits on the last frame of the window
         self.key_ini = KeyFrame(
-            self.target, self.desc_id, value=self.value_ini, time=self.global_time(self.abs_start))  # create initial keyframe
+            self.target, self.desc_id, value=self.value_ini, time=self.frame_to_time(self.frame_start))  # create initial keyframe
         self.key_fin = KeyFrame(
-            self.target, self.desc_id, value=self.value_fin, time=self.global_time(self.abs_stop - offset))  # create final keyframe
+            self.target, self.desc_id, value=self.value_fin, time=self.frame_to_time(self.frame_stop - 1))  # create final keyframe
+
+    def get_eased_values(self, frames):
+        """returns the values of the eased curve at the frames"""
+        progress = (np.asarray(frames, dtype=float) - self.frame_start) / (self.frame_stop - 1 - self.frame_start)
+        eased = np.asarray(self.easing(np.clip(progress, 0, 1)), dtype=float)
+        return [self.cast_value(self.value_ini + weight * (self.value_fin - self.value_ini)) for weight in eased.tolist()]
+
+    def cast_value(self, value):
+        """casts an interpolated value to the value type, integer and boolean values are rounded first"""
+        if self.value_type in (int, bool):
+            value = round(value)
+        return self.value_type(value)
+
+    def get_key_frames(self):
+        """returns the frames of the keys written for the eased curve"""
+        frames = np.arange(self.frame_start, self.frame_stop)
+        if self.key_mode == "tangents":
+            return frames[[0, -1]]
+        if self.key_mode == "adaptive":
+            progress = np.asarray(self.easing(np.linspace(0, 1, len(frames))), dtype=float)
+            return frames[sample_adaptive(progress, tolerance=self.tolerance)]
+        return frames
+
+    def execute_eased(self):
+        """writes the eased curve as keys instead of the default spline"""
+        frames = self.get_key_frames()
+        values = self.get_eased_values(frames)
+        if self.key_mode == "tangents":
+            tangent_right, tangent_left = get_bezier_tangents(
+                self.easing, (frames[-1] - frames[0]) / self.document.GetFps(), self.value_fin - self.value_ini)
+            self.key_ini = KeyFrame(self.target, self.desc_id, value=values[0], time=self.frame_to_time(
+                frames[0]), interpolation=c4d.CINTERPOLATION_SPLINE)
+            self.key_fin = KeyFrame(self.target, self.desc_id, value=values[-1], time=self.frame_to_time(
+                frames[-1]), interpolation=c4d.CINTERPOLATION_SPLINE)
+            self.key_ini.set_tangent("right", *tangent_right)
+            self.key_fin.set_tangent("left", *tangent_left)
+            return
+        keys = [KeyFrame(self.target, self.desc_id, value=value, time=self.frame_to_time(frame), interpolation=c4d.CINTERPOLATION_LINEAR)
+                for frame, value in zip(frames.tolist(), values)]
+        self.key_ini, self.key_fin = keys[0], keys[-1]
 
     def scale_relative_run_time(self, abs_run_time):
-        """scales the relative run time by the absolute run time"""
+        """scales the relative run time by the absolute run time and places it on the global frames"""
         self.abs_start = self.rel_start * abs_run_time
         self.abs_stop = self.rel_stop * abs_run_time
+        self.frame_start = self.global_frame(self.abs_start)
+        self.frame_stop = self.global_frame(self.abs_stop)
 
     def rescale_relative_run_time(self, super_rel_run_time):
         """rescales the current relative run time using the superordinate relative run time"""
@@ -213,6 +299,40 @@ class CompletionAnimation(VectorAnimation):
             return f"CompletionAnimation: {self.name}, {self.target}, {self.value_ini}, {self.value_fin}"
 
 
+class PointAnimation(VectorAnimation):
+    """a point animation interpolates all points of an editable point object between two arrays of points
+    using point level animation keyframes, the point count stays constant over the animation"""
+
+    def __init__(self, target, points_fin, points_ini=None, **kwargs):
+        desc_id = c4d.DescID(c4d.DescLevel(c4d.CTpla, c4d.CTpla, 0))
+        super().__init__(target, desc_id, value_fin=points_fin,
+                         value_ini=points_ini, value_type=self.to_points, **kwargs)
+
+    def __repr__(self):
+        """sets the string representation for printing"""
+        if self.name is None:
+            return f"PointAnimation: {self.target}, {len(self.value_fin)} points"
+        else:
+            return f"PointAnimation: {self.name}, {self.target}, {len(self.value_fin)} points"
+
+    @staticmethod
+    def to_points(value):
+        """converts the value to an array of points"""
+        return np.asarray(value, dtype=float).reshape(-1, 3)
+
+    def get_current_value(self):
+        """returns the current points of the object"""
+        return [[point.x, point.y, point.z] for point in self.target.obj.GetAllPoints()]
+
+    def execute(self):
+        """sets the actual keyframes of the animation"""
+        self.scale_relative_run_time(self.abs_run_time)
+        self.key_ini = PointKeyFrame(
+            self.target, self.desc_id, value=self.value_ini, time=self.frame_to_time(self.frame_start))
+        self.key_fin = PointKeyFrame(
+            self.target, self.desc_id, value=self.value_fin, time=self.frame_to_time(self.frame_stop - 1))
+
+
 class StateAnimation(Animation):
     """a state animation object is responsible for setting a single keyframe for a single (state like e.g. visibility) description id for a single object
     the keyframe is placed internally only on a relative scale and has to be scaled by the absolute run time provided by the Scene.play() function"""
@@ -234,7 +354,7 @@ class StateAnimation(Animation):
         self.scale_relative_run_time(
             self.abs_run_time)  # translates the relative to absolute run time
         self.key = KeyFrame(
-            self.target, self.desc_id, value=self.value, time=self.global_time(self.abs_start))  # create initial keyframe
+            self.target, self.desc_id, value=self.value, time=self.frame_to_time(self.frame_start))  # create initial keyframe
 
     def set_value(self, value):
         """sets the value of the animation"""
@@ -244,8 +364,9 @@ class StateAnimation(Animation):
         self.value = self.value_type(value)
 
     def scale_relative_run_time(self, abs_run_time):
-        """scales the relative run time by the absolute run time"""
+        """scales the relative run time by the absolute run time and places it on the global frames"""
         self.abs_start = self.rel_start * abs_run_time
+        self.frame_start = self.global_frame(self.abs_start)
 
     def rescale_relative_run_time(self, super_rel_run_time):
         """rescales the current relative run time using the superordinate relative run time
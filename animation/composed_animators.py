@@ -1,18 +1,21 @@
-from pydeation.animation.abstract_animators import ComposedAnimator, ComposedXAnimator
+from pydeation.animation.abstract_animators import ProtoAnimator, ComposedAnimator, ComposedXAnimator
 from pydeation.animation.object_animators import *
 from pydeation.animation.sketch_animators import *
 from pydeation.animation.fill_animators import *
+from pydeation.animation.animation import VectorAnimation, AnimationGroup
+from pydeation.animation.easing import get_easing
+import numpy as np
 
 class Transform(ComposedAnimator):
 
-    def __new__(cls, *objs, x=None, y=None, z=None, h=None, p=None, b=None, scale=None, scale_x=None, scale_y=None, scale_z=None, relative=True, transform_children=False, **kwargs):
+    def __new__(cls, *objs, x=None, y=None, z=None, h=None, p=None, b=None, scale=None, scale_x=None, scale_y=None, scale_z=None, relative=True, transform_children=False, easing=None, key_mode="adaptive", **kwargs):
         # compute values
         scale_x, scale_y, scale_z = cls.digest_values(
             scale, scale_x, scale_y, scale_z)
         # compose animators
-        cls.compose_animators(Move(*objs, x=x, y=y, z=z, relative=relative, unpack_groups=transform_children), Rotate(
-            *objs, h=h, p=p, b=b, relative=relative, unpack_groups=transform_children), Scale(*objs, x=scale_x, y=scale_y, z=scale_z, relative=relative, unpack_groups=transform_children))
-        return super().__new__(cls, **kwargs)
+        cls.compose_animators(Move(*objs, x=x, y=y, z=z, relative=relative, unpack_groups=transform_children, easing=easing, key_mode=key_mode), Rotate(
+            *objs, h=h, p=p, b=b, relative=relative, unpack_groups=transform_children, easing=easing, key_mode=key_mode), Scale(*objs, x=scale_x, y=scale_y, z=scale_z, relative=relative, unpack_groups=transform_children, easing=easing, key_mode=key_mode))
+        return super().__new__(cls, easing=easing, key_mode=key_mode, **kwargs)
 
     @classmethod
     def digest_values(cls, scale, scale_x, scale_y, scale_z):
@@ -23,12 +26,12 @@ class Transform(ComposedAnimator):
 
 class DrawThenFill(ComposedAnimator):
 
-    def __new__(cls, *objs, drawing=1, filling=1, **kwargs):
+    def __new__(cls, *objs, drawing=1, filling=1, easing=None, key_mode="adaptive", **kwargs):
         # compose animators
         cls.compose_animators(
-            Draw(*objs, drawing=drawing),
-            Fill(*objs, filling=filling))
-        return super().__new__(cls, category="constructive", **kwargs)
+            Draw(*objs, drawing=drawing, easing=easing, key_mode=key_mode),
+            Fill(*objs, filling=filling, easing=easing, key_mode=key_mode))
+        return super().__new__(cls, category="constructive", easing=easing, key_mode=key_mode, **kwargs)
 
 
 class ChangeFillColor(ComposedXAnimator):
@@ -91,4 +94,65 @@ class ChangeFillColorGB(ComposedXAnimator):
     @classmethod
     def set_values(cls, color):
         color_g, color_b = color.y, color.z
-        cls.values = [color_g, color_b]
\ No newline at end of file
+        cls.values = [color_g, color_b]
+
+
+class Stagger:
+    """builds a cascade of one animator over many objects in a single animation group
+    the animator is called once for all objects and the windows of the objects are computed in one vectorised step:
+        - lag_ratio is the fraction of a window after which the next object starts
+        - start_easing optionally maps the evenly spaced start positions in [0, 1] to eased ones
+        - easing and key_mode are passed on to the animator and shape the animations themselves
+    the relative run times are written to the animations directly instead of nesting rescaled groups"""
+
+    def __new__(cls, animator, *objs, lag_ratio=0.1, start_easing=None, rel_start=0, rel_stop=1, easing=None, key_mode="adaptive", **kwargs):
+        objs = ProtoAnimator.flatten_input(*objs, unpack_groups=kwargs.get("unpack_groups", True))
+        if not objs:
+            # nothing to stagger, the animator is not called without objects
+            return AnimationGroup()
+        windows = cls.get_windows(len(objs), lag_ratio=lag_ratio, easing=get_easing(start_easing))
+        windows = rel_start + windows * (rel_stop - rel_start)
+        kwargs.update(easing=easing, key_mode=key_mode)
+        animation_group = animator(*objs, **kwargs)
+        animations = animation_group.animations
+        indices = {id(obj): index for index, obj in enumerate(objs)}
+        obj_indices = np.array([indices.get(id(obj), -1) for obj in animation_group.get_objs()], dtype=int)
+        if len(obj_indices) and obj_indices.min() < 0:
+            # the animator targets objects not given e.g. the children of groups so every object gets its own call
+            animation_groups = [animator(obj, **kwargs) for obj in objs]
+            animations = [animation for animation_group in animation_groups for animation in animation_group.animations]
+            obj_indices = np.repeat(np.arange(len(objs)), [len(group.animations) for group in animation_groups])
+        cls.rescale_animations(animations, windows[obj_indices])
+        return AnimationGroup(*animations, category=animation_group.category)
+
+    @staticmethod
+    def get_windows(count, lag_ratio=0.1, easing=None):
+        """returns the relative windows of the objects as array of shape (count, 2) spanning [0, 1]"""
+        if count == 0:
+            return np.zeros((0, 2))
+        # every window has the same length and the last one ends at one
+        length = 1 / (1 + (count - 1) * lag_ratio)
+        positions = np.arange(count) / max(count - 1, 1)
+        if easing is not None:
+            # overshooting easings like back or elastic would move windows outside of [0, 1]
+            positions = np.clip(np.asarray(easing(positions), dtype=float), 0, 1)
+        starts = positions * (1 - length)
+        return np.stack([starts, starts + length], axis=1)
+
+    @staticmethod
+    def rescale_animations(animations, windows):
+        """writes the relative run times of the animations rescaled into their windows"""
+        rel_starts = np.array([animation.rel_start for animation in animations], dtype=float)
+        rel_stops = np.array([getattr(animation, "rel_stop", animation.rel_start) for animation in animations], dtype=float)
+        lengths = windows[:, 1] - windows[:, 0]
+        rel_starts = (windows[:, 0] + rel_starts * lengths).tolist()
+        rel_stops = (windows[:, 0] + rel_stops * lengths).tolist()
+        for animation, rel_start, rel_stop in zip(animations, rel_starts, rel_stops):
+            animation.rel_start = rel_start
+            if isinstance(animation, VectorAnimation):
+                animation.rel_stop = rel_stop
+
+
+class LaggedStart(Stagger):
+    """alias of stagger"""
+    pass
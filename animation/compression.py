@@ -0,0 +1,58 @@
+from pydeation.animation.curves import find_redundant_keys, find_repeated_keys
+from pydeation.utils import iterate_atoms
+import numpy as np
+import c4d
+
+
+def read_keys(curve):
+    """returns the times, values, interpolation flags, automatic tangent flags and tangent values of the keys of a value curve"""
+    keys = [curve.GetKey(index) for index in range(curve.GetKeyCount())]
+    interpolations = [key.GetInterpolation() for key in keys]
+    return {"times": np.array([key.GetTime().Get() for key in keys]),
+            "values": np.array([key.GetValue() for key in keys]),
+            "step": np.array([interpolation == c4d.CINTERPOLATION_STEP for interpolation in interpolations]),
+            "linear": np.array([interpolation == c4d.CINTERPOLATION_LINEAR for interpolation in interpolations]),
+            "auto": np.array([bool(key.GetNBit(c4d.NBIT_CKEY_AUTO)) for key in keys]),
+            "value_left": np.array([key.GetValueLeft() for key in keys]),
+            "value_right": np.array([key.GetValueRight() for key in keys])}
+
+
+def compress_track(atom, track, tolerance=1e-6):
+    """removes the redundant keys of a value or data track, tracks of other categories are skipped
+    a value track whose value never changes is removed and its value kept as static value of the parameter
+    returns the number of removed keys and whether the track was removed"""
+    category = track.GetTrackCategory()
+    curve = track.GetCurve()
+    if category == c4d.CTRACK_CATEGORY_VALUE:
+        keys = read_keys(curve)
+        redundant = find_redundant_keys(**keys, tolerance=tolerance)
+        if len(redundant) and redundant.all():
+            desc_id = track.GetDescriptionID()
+            value = float(keys["values"][0])
+            if desc_id[desc_id.GetDepth() - 1].dtype == c4d.DTYPE_LONG:
+                value = int(round(value))
+            atom[desc_id] = value
+            track.Remove()
+            return len(redundant), True
+    elif category == c4d.CTRACK_CATEGORY_DATA:
+        # data keys hold their value until the next key, the track itself is kept
+        redundant = find_repeated_keys([curve.GetKey(index).GetGeData() for index in range(curve.GetKeyCount())])
+    else:
+        return 0, False
+    for index in np.flatnonzero(redundant)[::-1]:
+        curve.DelKey(int(index))
+    return int(redundant.sum()), False
+
+
+def compress_keyframes(document, tolerance=1e-6):
+    """removes redundant keys and constant tracks from all tracks of the document
+    returns a report of the removed keys and tracks"""
+    report = {"keys": 0, "keys_removed": 0, "tracks": 0, "tracks_removed": 0}
+    for atom in iterate_atoms(document):
+        for track in atom.GetCTracks():
+            report["tracks"] += 1
+            report["keys"] += track.GetCurve().GetKeyCount()
+            keys_removed, track_removed = compress_track(atom, track, tolerance=tolerance)
+            report["keys_removed"] += keys_removed
+            report["tracks_removed"] += track_removed
+    return report
@@ -0,0 +1,55 @@
+import numpy as np
+
+
+def find_redundant_keys(times, values, step, linear, auto=None, value_left=None, value_right=None, tolerance=1e-6):
+    """returns a mask of the keys of a value curve that can be removed without changing the curve
+    keys are given by their times, values, interpolation flags (spline if neither step nor linear),
+    automatic tangent flags and the values of their left and right tangents:
+        - keys repeating the value of both neighbours with flat segments around them,
+          leading and trailing keys repeating their only neighbour
+        - inner keys of linear segments lying on the line through their neighbours
+    keys are kept if removing them recomputes automatic tangents used by a spline segment"""
+    times = np.asarray(times, dtype=float)
+    values = np.asarray(values, dtype=float)
+    key_count = len(values)
+    if key_count < 2:
+        return np.zeros(key_count, dtype=bool)
+    step = np.asarray(step, dtype=bool)
+    linear = np.asarray(linear, dtype=bool)
+    spline = ~step & ~linear
+    auto = np.zeros(key_count, dtype=bool) if auto is None else np.asarray(auto, dtype=bool)
+    value_left = np.zeros(key_count) if value_left is None else np.asarray(value_left, dtype=float)
+    value_right = np.zeros(key_count) if value_right is None else np.asarray(value_right, dtype=float)
+    # a segment is flat if its keys share the value and a spline segment leaves it with flat tangents
+    equal = np.abs(np.diff(values)) <= tolerance
+    flat_tangents = (np.abs(value_right[:-1]) <= tolerance) & (np.abs(value_left[1:]) <= tolerance)
+    flat = equal & (~spline[:-1] | flat_tangents)
+    redundant = np.concatenate([[True], flat]) & np.concatenate([flat, [True]])
+    if key_count > 2:
+        # the segments before and after an inner key have to be linear
+        inner_linear = linear[:-2] & linear[1:-1]
+        spans = times[2:] - times[:-2]
+        weights = np.divide(times[1:-1] - times[:-2], spans,
+                            out=np.zeros_like(spans), where=spans > 0)
+        interpolated = values[:-2] + weights * (values[2:] - values[:-2])
+        collinear = inner_linear & (np.abs(values[1:-1] - interpolated) <= tolerance)
+        redundant[1:-1] |= collinear
+    # the neighbours of a removed key recompute their automatic tangents,
+    # which changes the curve wherever a spline segment uses them afterwards
+    indices = np.arange(key_count)
+    spline_before_previous = np.concatenate([[False, False], spline[:-2]])
+    spline_previous = np.concatenate([[False], spline[:-1]])
+    spline_next = np.concatenate([spline[1:], [False]])
+    auto_previous = np.concatenate([[False], auto[:-1]])
+    auto_next = np.concatenate([auto[1:], [False]])
+    previous_used = spline_before_previous | (spline_previous & (indices < key_count - 1))
+    next_used = (spline_previous & (indices > 0)) | (spline_next & (indices < key_count - 2))
+    redundant &= ~(auto_previous & previous_used) & ~(auto_next & next_used)
+    return redundant
+
+
+def find_repeated_keys(values):
+    """returns a mask of the keys of a data curve repeating the value of the previous key"""
+    repeated = np.zeros(len(values), dtype=bool)
+    repeated[1:] = [value == previous_value for previous_value, value in zip(values[:-1], values[1:])]
+    return repeated
@@ -0,0 +1,188 @@
+import numpy as np
+
+# constants of the back and elastic easings
+BACK_OVERSHOOT = 1.70158
+ELASTIC_PERIOD = 2 * np.pi / 3
+
+
+def linear(s):
+    return np.asarray(s, dtype=float)
+
+
+def cubic_in(s):
+    s = np.asarray(s, dtype=float)
+    return s**3
+
+
+def cubic_out(s):
+    s = np.asarray(s, dtype=float)
+    return 1 - (1 - s)**3
+
+
+def cubic_in_out(s):
+    s = np.asarray(s, dtype=float)
+    return np.where(s < 0.5, 4 * s**3, 1 - (2 - 2 * s)**3 / 2)
+
+
+def expo_in(s):
+    s = np.asarray(s, dtype=float)
+    return np.where(s <= 0, 0, 2**(10 * s - 10))
+
+
+def expo_out(s):
+    s = np.asarray(s, dtype=float)
+    return np.where(s >= 1, 1, 1 - 2**(-10 * s))
+
+
+def expo_in_out(s):
+    s = np.asarray(s, dtype=float)
+    eased = np.where(s < 0.5, 2**(20 * s - 10) / 2, (2 - 2**(10 - 20 * s)) / 2)
+    return np.where(s <= 0, 0, np.where(s >= 1, 1, eased))
+
+
+def back_in(s):
+    s = np.asarray(s, dtype=float)
+    return (BACK_OVERSHOOT + 1) * s**3 - BACK_OVERSHOOT * s**2
+
+
+def back_out(s):
+    s = np.asarray(s, dtype=float)
+    return 1 + (BACK_OVERSHOOT + 1) * (s - 1)**3 + BACK_OVERSHOOT * (s - 1)**2
+
+
+def back_in_out(s):
+    s = np.asarray(s, dtype=float)
+    overshoot = BACK_OVERSHOOT * 1.525
+    return np.where(s < 0.5, (2 * s)**2 * ((overshoot + 1) * 2 * s - overshoot) / 2,
+                    ((2 * s - 2)**2 * ((overshoot + 1) * (2 * s - 2) + overshoot) + 2) / 2)
+
+
+def elastic_in(s):
+    s = np.asarray(s, dtype=float)
+    eased = -2**(10 * s - 10) * np.sin((10 * s - 10.75) * ELASTIC_PERIOD)
+    return np.where(s <= 0, 0, np.where(s >= 1, 1, eased))
+
+
+def elastic_out(s):
+    s = np.asarray(s, dtype=float)
+    eased = 2**(-10 * s) * np.sin((10 * s - 0.75) * ELASTIC_PERIOD) + 1
+    return np.where(s <= 0, 0, np.where(s >= 1, 1, eased))
+
+
+def elastic_in_out(s):
+    s = np.asarray(s, dtype=float)
+    period = 2 * np.pi / 4.5
+    sine = np.sin((20 * s - 11.125) * period)
+    eased = np.where(s < 0.5, -2**(20 * s - 10) * sine / 2, 2**(-20 * s + 10) * sine / 2 + 1)
+    return np.where(s <= 0, 0, np.where(s >= 1, 1, eased))
+
+
+class CubicBezier:
+    """easing given by a cubic bezier from (0, 0) to (1, 1) with the control points (x1, y1) and (x2, y2)
+    like the css timing functions, x1 and x2 have to lie in [0, 1] so the curve is a function of time"""
+
+    def __init__(self, x1, y1, x2, y2):
+        if not (0 <= x1 <= 1 and 0 <= x2 <= 1):
+            raise ValueError("x1 and x2 must lie in [0, 1]!")
+        self.x1, self.y1, self.x2, self.y2 = x1, y1, x2, y2
+
+    def __repr__(self):
+        return f"CubicBezier({self.x1}, {self.y1}, {self.x2}, {self.y2})"
+
+    @staticmethod
+    def bezier(u, p1, p2):
+        """evaluates one coordinate of the bezier at the curve parameter"""
+        return 3 * (1 - u)**2 * u * p1 + 3 * (1 - u) * u**2 * p2 + u**3
+
+    @staticmethod
+    def bezier_derivative(u, p1, p2):
+        return 3 * (1 - u)**2 * p1 + 6 * (1 - u) * u * (p2 - p1) + 3 * u**2 * (1 - p2)
+
+    def solve(self, s, iterations=8):
+        """returns the curve parameters at which the x coordinate equals s using newton steps guarded by bisection"""
+        s = np.clip(np.asarray(s, dtype=float), 0, 1)
+        u = s.copy()
+        lower, upper = np.zeros_like(s), np.ones_like(s)
+        for _ in range(iterations):
+            error = self.bezier(u, self.x1, self.x2) - s
+            lower = np.where(error < 0, u, lower)
+            upper = np.where(error > 0, u, upper)
+            slope = self.bezier_derivative(u, self.x1, self.x2)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                u_newton = u - error / slope
+            # fall back to bisection where the newton step leaves the bracket
+            inside = (slope > 1e-6) & (u_newton >= lower) & (u_newton <= upper)
+            u = np.where(error == 0, u, np.where(inside, u_newton, (lower + upper) / 2))
+        return u
+
+    def __call__(self, s):
+        return self.bezier(self.solve(s), self.y1, self.y2)
+
+
+EASINGS = {
+    "linear": linear,
+    "cubic_in": cubic_in, "cubic_out": cubic_out, "cubic_in_out": cubic_in_out,
+    "expo_in": expo_in, "expo_out": expo_out, "expo_in_out": expo_in_out,
+    "back_in": back_in, "back_out": back_out, "back_in_out": back_in_out,
+    "elastic_in": elastic_in, "elastic_out": elastic_out, "elastic_in_out": elastic_in_out,
+    # css timing functions, being cubic beziers they can be written as key tangents
+    "ease": CubicBezier(0.25, 0.1, 0.25, 1), "ease_in": CubicBezier(0.42, 0, 1, 1),
+    "ease_out": CubicBezier(0, 0, 0.58, 1), "ease_in_out": CubicBezier(0.42, 0, 0.58, 1)
+}
+
+
+# ways of writing an eased curve as keys
+KEY_MODES = ("adaptive", "dense", "tangents")
+
+
+def get_easing(easing):
+    """returns the easing function given by name or callable"""
+    if easing is None or callable(easing):
+        return easing
+    if easing not in EASINGS:
+        raise ValueError(f"unknown easing {easing}, use one of {list(EASINGS)} or a callable!")
+    return EASINGS[easing]
+
+
+def check_key_mode(easing, key_mode):
+    """raises if the eased curve cannot be written as keys in the given mode"""
+    if key_mode not in KEY_MODES:
+        raise ValueError(f"unknown key mode {key_mode}, use one of {list(KEY_MODES)}!")
+    if key_mode == "tangents" and easing is not None and not isinstance(easing, CubicBezier):
+        raise ValueError("only cubic bezier easings can be written as tangents, use the adaptive or dense key mode!")
+
+
+def sample_dense(easing, count):
+    """returns the eased progress at count evenly spaced positions from zero to one"""
+    return np.asarray(get_easing(easing)(np.linspace(0, 1, count)), dtype=float)
+
+
+def sample_adaptive(values, tolerance=1e-3):
+    """returns the indices of the samples to keep so that linear interpolation between them
+    deviates from all samples by at most the tolerance, the worst sample of every segment is added per pass"""
+    values = np.asarray(values, dtype=float)
+    positions = np.arange(len(values))
+    kept = np.unique([0, len(values) - 1])
+    while True:
+        deviations = np.abs(values - np.interp(positions, kept, values[kept]))
+        # the segment every sample belongs to
+        segments = np.searchsorted(kept, positions, side="right") - 1
+        candidates = deviations > tolerance
+        if not candidates.any():
+            return kept
+        # pick the sample with the largest deviation per segment
+        order = np.lexsort((-deviations, segments))
+        first = np.append(True, np.diff(segments[order]) != 0)
+        worst = order[first]
+        worst = worst[candidates[worst]]
+        kept = np.union1d(kept, worst)
+
+
+def get_bezier_tangents(easing, time_span, value_span):
+    """returns the right tangent of the initial key and the left tangent of the final key as (time, value) pairs
+    so the curve between the keys follows a cubic bezier easing exactly"""
+    if not isinstance(easing, CubicBezier):
+        raise ValueError("only cubic bezier easings can be written as tangents!")
+    tangent_right = (easing.x1 * time_span, easing.y1 * value_span)
+    tangent_left = ((easing.x2 - 1) * time_span, (easing.y2 - 1) * value_span)
+    return tangent_right, tangent_left
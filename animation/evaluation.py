@@ -0,0 +1,203 @@
+import numpy as np
+
+# functions and constants available in the formulas of xpresso formula nodes
+FORMULA_NAMESPACE = {
+    "sin": np.sin, "cos": np.cos, "tan": np.tan, "asin": np.arcsin, "acos": np.arccos, "atan": np.arctan,
+    "sinh": np.sinh, "cosh": np.cosh, "tanh": np.tanh, "exp": np.exp, "log": np.log, "ln": np.log,
+    "log10": np.log10, "sqrt": np.sqrt, "abs": np.abs, "floor": np.floor, "ceil": np.ceil,
+    "round": lambda x: np.sign(x) * np.floor(np.abs(x) + 0.5),  # rounds half away from zero
+    "min": np.minimum, "max": np.maximum, "Pi": np.pi, "PI": np.pi, "pi": np.pi
+}
+
+# interpolations of the segments following a key
+SPLINE, LINEAR, STEP = 0, 1, 2
+
+# this formula ensures that the output value is 1 at frame = frame_fin - 1
+STEP_FORMULA = "ceil(t*round(1/(delta_t))*(1+delta_t))/round(1/(delta_t))"
+
+
+def get_param_id(desc_id):
+    """returns the parameter id of a description id in the form used by the animations
+    parameter ids are passed through unchanged"""
+    if isinstance(desc_id, (int, tuple)):
+        return desc_id
+    param_id = tuple(desc_id[level].id for level in range(desc_id.GetDepth()))
+    return param_id[0] if len(param_id) == 1 else param_id
+
+
+def evaluate_formula(formula, variables):
+    """evaluates the formula of a formula node for arrays of variable values"""
+    namespace = dict(FORMULA_NAMESPACE, **variables)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.asarray(eval(formula.replace("^", "**"), {"__builtins__": {}}, namespace), dtype=float)
+
+
+def evaluate_keys(key_times, key_values, key_interpolations, times):
+    """evaluates a curve given by keys at the times, both given in frames
+    keys at the same time are overwritten by the later one, the curve is constant outside the keys,
+    step keys hold their value, linear keys interpolate linearly and spline keys use the default
+    spline interpolation which for flat tangents is the cubic ease 3s^2-2s^3"""
+    times = np.asarray(times, dtype=float)
+    key_times = np.asarray(key_times, dtype=float)
+    order = np.argsort(key_times, kind="stable")
+    # keep the last of coincident keys
+    last = np.append(np.diff(key_times[order]) > 1e-9, True)
+    order = order[last]
+    key_times = key_times[order]
+    key_values = np.asarray(key_values, dtype=float)[order]
+    key_interpolations = np.asarray(key_interpolations, dtype=int)[order]
+    indices = np.clip(np.searchsorted(key_times, times, side="right") - 1, 0, len(key_times) - 1)
+    next_indices = np.minimum(indices + 1, len(key_times) - 1)
+    spans = key_times[next_indices] - key_times[indices]
+    progress = np.divide(times - key_times[indices], spans,
+                         out=np.zeros_like(times), where=spans > 0)
+    progress = np.clip(progress, 0, 1)
+    interpolations = key_interpolations[indices]
+    eased = np.where(interpolations == LINEAR, progress, progress * progress * (3 - 2 * progress))
+    eased[interpolations == STEP] = 0
+    return key_values[indices] + eased * (key_values[next_indices] - key_values[indices])
+
+
+class ParameterEvaluator:
+    """computes parameter values from the animations recorded in a schedule without evaluating the document
+    internally times are given in frames and only converted from seconds by values_over
+    parameters driven by xanimators are simulated frame by frame like the xpresso setup:
+    an input source is active while its completion is strictly between 0 and 1 and not descending,
+    otherwise the parameter holds its value"""
+
+    def __init__(self, schedule, fps):
+        self.schedule = schedule
+        self.fps = fps
+
+    def get_keys(self, target, param_id):
+        """returns the frames, values and interpolations of the keys written by the animations of a parameter
+        eased animations contribute their curve sampled on every frame"""
+        # imported here so the evaluation of curves and xpressions does not depend on c4d
+        from pydeation.animation.animation import VectorAnimation, StateAnimation
+        key_times, key_values, key_interpolations = [], [], []
+        for index in self.schedule.find(target, param_id):
+            animation = self.schedule.animations[index]
+            start, stop = self.schedule.starts[index], self.schedule.stops[index]
+            if isinstance(animation, VectorAnimation) and getattr(animation, "easing", None) is not None and stop - 1 > start:
+                frames = list(range(start, stop))
+                key_times += frames
+                key_values += animation.get_eased_values(frames)
+                key_interpolations += [LINEAR] * len(frames)
+            elif isinstance(animation, VectorAnimation):
+                key_times += [start, stop - 1]
+                key_values += [animation.value_ini, animation.value_fin]
+                key_interpolations += [SPLINE, SPLINE]
+            elif isinstance(animation, StateAnimation):
+                key_times.append(start)
+                key_values.append(animation.value)
+                key_interpolations.append(STEP)
+        return key_times, key_values, key_interpolations
+
+    def get_static_value(self, target, param_id):
+        """returns the value the parameter of a target holds without keys"""
+        return float(target.obj[param_id])
+
+    def evaluate_curve(self, target, param_id, times):
+        """evaluates the keys of a parameter, parameters without keys hold their static value"""
+        key_times, key_values, key_interpolations = self.get_keys(target, param_id)
+        if not key_times:
+            return np.full(np.shape(times), self.get_static_value(target, param_id))
+        return evaluate_keys(key_times, key_values, key_interpolations, times)
+
+    def find_access_control(self, target, param_id):
+        """returns the access control of the xpresso setup driving the parameter of a target if any"""
+        holder = target
+        linked_tag = getattr(target, "linked_tag", None)
+        if linked_tag is not None:
+            holder = linked_tag.linked_object  # materials are driven by the xpressions of their object
+        candidates = list(getattr(holder, "accessed_parameters", {}).values())
+        candidates += list(getattr(holder, "xpressions", {}).values())
+        for candidate in candidates:
+            access_control = getattr(candidate, "access_control", None)
+            if access_control is None or not access_control.input_sources:
+                continue
+            parameter_target = access_control.link_target or access_control.target
+            if parameter_target is target and get_param_id(access_control.parameter.desc_id) == param_id:
+                return access_control
+        return None
+
+    def evaluate(self, target, param_id, times):
+        """evaluates the parameter at the times in frames"""
+        times = np.asarray(times, dtype=float)
+        access_control = self.find_access_control(target, param_id)
+        if access_control is None:
+            return self.evaluate_curve(target, param_id, times)
+        # the xpressions are evaluated on whole frames
+        frames = np.floor(times + 1e-6).astype(int)
+        frame_values = self.evaluate_frames(
+            target, param_id, access_control, max(frames.max(initial=0), 0) + 1)
+        return frame_values[np.clip(frames, 0, None)]
+
+    def get_driver(self, source, interpolate, input_range, frames):
+        """returns the activity and the driver output of an input source on the frames
+        for interpolating sources the output is the interpolation weight"""
+        completion = self.evaluate(source.target, get_param_id(
+            source.completion_slider.desc_id), frames)
+        previous_completion = self.evaluate(source.target, get_param_id(
+            source.completion_slider.desc_id), frames - 1)
+        active = (completion != 0) & (completion != 1) & (completion >= previous_completion)
+        delta = np.where(active & (completion > previous_completion),
+                         completion - previous_completion, 1)
+        stepped = np.minimum(evaluate_formula(STEP_FORMULA, {"t": completion, "delta_t": delta}), 1)
+        if input_range is not None:
+            # range mappers of compositions clamp the stepped completion to the input range
+            start, stop = input_range
+            return active, np.clip((stepped - start) / (stop - start), 0, 1)
+        if interpolate:
+            return active, stepped
+        variables = {"t": completion}
+        for udata, param_name in zip(source.udatas, source.param_names):
+            variables[param_name] = self.evaluate(
+                source.target, get_param_id(udata.desc_id), frames)
+        return active, np.broadcast_to(evaluate_formula(source.formula or "t", variables), completion.shape)
+
+    def evaluate_frames(self, target, param_id, access_control, frame_count):
+        """simulates the access control of a parameter on the frames from zero"""
+        frames = np.arange(frame_count)
+        keyed = bool(self.schedule.find(target, param_id))
+        base_values = self.evaluate_curve(target, param_id, frames)
+        reverse = access_control.reverse_parameter_range
+        if reverse:
+            base_values = 1 - base_values
+        # the first active input source overrides the parameter
+        owners = np.full(frame_count, -1)
+        drivers = []
+        for index, (source, interpolate, input_range) in enumerate(access_control.input_sources):
+            active, driver = self.get_driver(source, interpolate, input_range, frames)
+            owners[active & (owners < 0)] = index
+            drivers.append(driver)
+        values = base_values.copy()
+        # runs of consecutive frames driven by the same input source
+        changes = np.flatnonzero(np.diff(owners) != 0) + 1
+        run_starts = np.concatenate([[0], changes])
+        run_stops = np.append(changes, frame_count)
+        held_value = base_values[0]
+        for run_start, run_stop in zip(run_starts.tolist(), run_stops.tolist()):
+            owner = owners[run_start]
+            if owner < 0:
+                if not keyed:
+                    values[run_start:run_stop] = held_value
+                held_value = values[run_stop - 1]
+                continue
+            source, interpolate, input_range = access_control.input_sources[owner]
+            driver = drivers[owner][run_start:run_stop]
+            if interpolate and input_range is None:
+                # the interpolator freezes the value the parameter held before the run
+                value_ini = values[run_start - 1] if run_start else base_values[0]
+                value_fin = self.evaluate(source.target, get_param_id(
+                    source.interpolation_target.desc_id), frames[run_start:run_stop])
+                driver = value_ini + driver * (value_fin - value_ini)
+            values[run_start:run_stop] = driver
+            held_value = values[run_stop - 1]
+        if reverse:
+            values = 1 - values
+        return values
+
+    def values_over(self, target, param, times):
+        """evaluates the parameter given by description id or parameter id at the times in seconds"""
+        return self.evaluate(target, get_param_id(param), np.asarray(times, dtype=float) * self.fps)
@@ -0,0 +1,144 @@
+import numpy as np
+
+
+class IntervalTree:
+    """static interval tree over closed intervals
+    the intervals are sorted by start and form an implicit balanced binary search tree
+    in which every node holds the maximum stop of its subtree, queries take O(log n + k) for k results"""
+
+    def __init__(self, starts, stops):
+        starts = np.asarray(starts, dtype=float)
+        stops = np.asarray(stops, dtype=float)
+        self.order = np.argsort(starts, kind="stable")
+        self.starts = starts[self.order]
+        self.stops = stops[self.order]
+        self.max_stops = np.empty(len(self.starts))
+        if len(self.starts):
+            self.build_max_stops(0, len(self.starts))
+
+    def build_max_stops(self, low, high):
+        """computes the maximum stops of the subtrees bottom up without recursion"""
+        # nodes are visited in pre order and processed in reverse so children come first
+        nodes = []
+        stack = [(low, high)]
+        while stack:
+            low, high = stack.pop()
+            if low >= high:
+                continue
+            middle = (low + high) // 2
+            nodes.append((low, middle, high))
+            stack += [(low, middle), (middle + 1, high)]
+        stops = self.stops.tolist()
+        max_stops = [0.0] * len(stops)
+        for low, middle, high in reversed(nodes):
+            max_stop = stops[middle]
+            if low < middle:
+                max_stop = max(max_stop, max_stops[(low + middle) // 2])
+            if middle + 1 < high:
+                max_stop = max(max_stop, max_stops[(middle + 1 + high) // 2])
+            max_stops[middle] = max_stop
+        self.max_stops = np.array(max_stops)
+
+    def __len__(self):
+        return len(self.starts)
+
+    def overlapping(self, start, stop):
+        """returns the indices of the intervals overlapping the closed window in input order"""
+        starts, stops, max_stops = self.starts, self.stops, self.max_stops
+        found = []
+        stack = [(0, len(starts))]
+        while stack:
+            low, high = stack.pop()
+            if low >= high:
+                continue
+            middle = (low + high) // 2
+            # no interval in this subtree reaches the window
+            if max_stops[middle] < start:
+                continue
+            stack.append((low, middle))
+            # intervals right of the middle start even later
+            if starts[middle] <= stop:
+                if stops[middle] >= start:
+                    found.append(middle)
+                stack.append((middle + 1, high))
+        return np.sort(self.order[found])
+
+    def active_at(self, time):
+        """returns the indices of the intervals containing the time in input order"""
+        return self.overlapping(time, time)
+
+
+class AnimationConflictWarning(UserWarning):
+    """warns about animations driving the same parameter in overlapping windows"""
+
+
+class AnimationSchedule:
+    """records the animations executed by a scene with their absolute windows in frames
+    and indexes them in an interval tree built on the first query after a change
+    the windows are half open, a window ends on the frame after its final keyframe"""
+
+    def __init__(self):
+        self.animations = []
+        self.starts = []
+        self.stops = []
+        self.indices = {}  # indices of the animations by target and parameter
+        self.tree = None
+
+    def add(self, animations):
+        """adds executed animations"""
+        for animation in animations:
+            start = animation.frame_start
+            stop = getattr(animation, "frame_stop", animation.frame_start)
+            self.indices.setdefault((id(animation.target), animation.param_id), []).append(
+                len(self.animations))
+            self.animations.append(animation)
+            self.starts.append(start)
+            self.stops.append(stop)
+        self.tree = None
+
+    def find(self, target, param_id):
+        """returns the indices of the animations of a parameter of a target in execution order"""
+        return self.indices.get((id(target), param_id), [])
+
+    def get_tree(self):
+        if self.tree is None:
+            # the tree holds the closed windows from the initial to the final keyframe
+            last_frames = np.maximum(np.array(self.stops) - 1, self.starts)
+            self.tree = IntervalTree(self.starts, last_frames)
+        return self.tree
+
+    def active_at(self, frame):
+        """returns the animations active at the frame"""
+        return [self.animations[index] for index in self.get_tree().active_at(frame)]
+
+    def overlapping(self, start, stop):
+        """returns the animations overlapping the inclusive frame window"""
+        return [self.animations[index] for index in self.get_tree().overlapping(start, stop)]
+
+    def find_conflicts(self):
+        """returns pairs of vector animations driving the same parameter of the same target in overlapping windows
+        windows only touching at their ends are chained and do not conflict"""
+        # imported here so the schedule and its interval tree do not depend on c4d
+        from pydeation.animation.animation import VectorAnimation
+        groups = {}
+        for index, animation in enumerate(self.animations):
+            if isinstance(animation, VectorAnimation) and self.stops[index] > self.starts[index]:
+                groups.setdefault((id(animation.target), animation.param_id), []).append(index)
+        all_starts = np.array(self.starts)
+        all_stops = np.array(self.stops)
+        conflicts = []
+        for indices in groups.values():
+            if len(indices) < 2:
+                continue
+            indices = np.array(indices)
+            order = np.argsort(all_starts[indices], kind="stable")
+            indices = indices[order]
+            starts = all_starts[indices]
+            stops = all_stops[indices]
+            # the earlier animation reaching furthest is the one a later animation collides with
+            reach = np.maximum.accumulate(stops)
+            holders = np.maximum.accumulate(np.where(stops == reach, np.arange(len(stops)), 0))
+            for position in np.flatnonzero(starts[1:] < reach[:-1]) + 1:
+                conflicts.append((self.animations[indices[holders[position - 1]]],
+                                  self.animations[indices[position]]))
+        return conflicts
@@ -0,0 +1,16 @@
+from fractions import Fraction
+import math
+
+
+def to_seconds(seconds):
+    """converts a time in seconds to a fraction, floats become the nearest fraction with a small denominator
+    so times like 1/3 of a second map to the same frame wherever they occur, fractions are kept exact"""
+    if isinstance(seconds, Fraction):
+        return seconds
+    return Fraction(seconds).limit_denominator(2**20)
+
+
+def to_frame(seconds, fps):
+    """converts a time in seconds to the nearest whole frame rounding halves up
+    only absolute times should be converted so the rounding errors of consecutive plays do not add up"""
+    return math.floor(to_seconds(seconds) * fps + Fraction(1, 2))
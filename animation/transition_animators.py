@@ -1,13 +1,29 @@
 from pydeation.objects.abstract_objects import LineObject
 from pydeation.objects.custom_objects import Group
+from pydeation.objects.line_objects import Spline
 from pydeation.objects.helper_objects import MoSpline, SplineEffector, LinearField, SphericalField
 from pydeation.animation.abstract_animators import ProtoAnimator, abstractmethod
 from pydeation.animation.object_animators import Hide, Show
-from pydeation.animation.animation import AnimationGroup
-from pydeation.utils import match_indices
+from pydeation.animation.animation import AnimationGroup, PointAnimation
+from pydeation.geometry.sampling import transform_points
+from pydeation.geometry.correspondence import solve_correspondence
+from pydeation.utils import match_indices, matrix_to_array
+from pydeation.constants import WHITE
+import numpy as np
 import c4d
 
 
+def match_spline_segments(spline_ini, spline_fin, match_segments=True):
+    """returns the pairs of segment indices used to morph between two splines:
+        - True: segments are matched by centroid, area and length
+        - "index": segments are matched by index in the most natural way using modulo"""
+    if match_segments == "index":
+        indices_ini, indices_fin = match_indices(
+            spline_ini.get_segment_count(), spline_fin.get_segment_count())
+        return list(indices_ini), list(indices_fin)
+    return solve_correspondence(spline_ini.get_sampler(), spline_fin.get_sampler())
+
+
 class TransitionAnimator(ProtoAnimator):
     """abstract animator for handling transition animations"""
     def __new__(cls, obj_ini, obj_fin, transition_obj, **kwargs):
@@ -37,14 +53,24 @@ class TransitionAnimator(ProtoAnimator):
 
 
 class Morph(TransitionAnimator):
+    """morphs one spline into another using mograph helper rigs
+    rigs are pooled on the initial spline per transition and reused as long as the segment counts are unchanged,
+    so only repeating a transition reuses its rig while every step of a chain A->B->C builds its own:
+    the spline links of a rig are not animated and retargeting it would change the earlier steps too
+    every rig is driven by an xanimator and a completion parameter of its own
+    the baked mode interpolates resampled points on a single spline instead, see BakedMorph"""
 
-    def __new__(cls, spline_ini: LineObject, spline_fin: LineObject, match_segments=True, mode="linear", linear_field_length=50, **kwargs):
+    def __new__(cls, spline_ini: LineObject, spline_fin: LineObject, match_segments=True, mode="linear", linear_field_length=50, point_count=100, **kwargs):
+        if mode == "baked":
+            return BakedMorph(spline_ini, spline_fin, match_segments=match_segments, point_count=point_count, **kwargs)
         # calculate linear field offset
         cls.mode = mode
         cls.match_segments = match_segments
         cls.linear_field_length = linear_field_length
-        cls.bounding_box = spline_ini.obj.GetRad()
-        cls.bounding_box_center = spline_ini.obj.GetMp() + spline_ini.obj.GetAbsPos()
+        minimum, maximum = spline_ini.get_bounding_box()
+        cls.bounding_box = c4d.Vector(*((maximum - minimum) / 2).tolist())
+        cls.bounding_box_center = c4d.Vector(
+            *((minimum + maximum) / 2).tolist()) + spline_ini.obj.GetAbsPos()
         cls.insert_helper_objects(spline_ini, spline_fin)
         cls.set_values()
         morph_animations = super().__new__(cls, spline_ini, spline_fin, cls.morph_setup, category="neutral",
@@ -53,19 +79,36 @@ class Morph(TransitionAnimator):
 
     @classmethod
     def insert_helper_objects(cls, spline_ini, spline_fin):
-        # get segment count of splines
-        spline_ini_clone = spline_ini.obj.GetClone()
-        spline_ini_clone_editable = cls.make_editable(spline_ini_clone)
-        spline_fin_clone = spline_fin.obj.GetClone()
-        spline_fin_clone_editable = cls.make_editable(spline_fin_clone)
-        segment_count_ini = spline_ini_clone_editable.GetSegmentCount() + \
-            1  # shift to natural counting
-        segment_count_fin = spline_fin_clone_editable.GetSegmentCount() + \
-            1  # shift to natural counting
-        if cls.mode == "match_segments":
+        # segment counts are cached on the splines
+        segment_count_ini = spline_ini.get_segment_count()
+        segment_count_fin = spline_fin.get_segment_count()
+        # reuse the rig of an identical earlier transition
+        rigs = spline_ini.helper_objects.setdefault("morph_rigs", {})
+        rig_key = (spline_fin, cls.mode, cls.match_segments,
+                   cls.linear_field_length)
+        rig = rigs.get(rig_key)
+        if rig is None or rig["segment_counts"] != (segment_count_ini, segment_count_fin):
+            rig = cls.create_rig(spline_ini, spline_fin,
+                                 segment_count_ini, segment_count_fin)
+            rigs[rig_key] = rig
+        cls.morph_setup = rig["morph_setup"]
+        # add to helper_objects
+        spline_ini.helper_objects["morph_mosplines"] = rig["mosplines"]
+        spline_ini.helper_objects["morph_field"] = rig["field"]
+        if cls.match_segments:
+            spline_ini.helper_objects["morph_spline_effectors_ini"] = rig["spline_effectors_ini"]
+            spline_ini.helper_objects["morph_spline_effectors_fin"] = rig["spline_effectors_fin"]
+        else:
+            spline_ini.helper_objects["morph_spline_effectors"] = rig["spline_effectors"]
+
+    @classmethod
+    def create_rig(cls, spline_ini, spline_fin, segment_count_ini, segment_count_fin):
+        """builds the mospline and spline effector setup for the given segment counts"""
+        if cls.match_segments:
             segment_count = max(segment_count_ini, segment_count_fin)
         else:
             segment_count = segment_count_fin
+        rig = {"segment_counts": (segment_count_ini, segment_count_fin)}
         # get helper objects
         if cls.mode == "linear":
             field = LinearField(direction="x-", length=cls.linear_field_length)
@@ -85,33 +128,35 @@ class Morph(TransitionAnimator):
                             for i in range(segment_count)], name="MoSplines")
         # add spline effectors to mosplines
         if cls.match_segments:
-            # we want to match the segments in the most natural way using modulu
-            indices_ini, indices_fin = match_indices(
-                segment_count_ini, segment_count_fin)
+            indices_ini, indices_fin = match_spline_segments(
+                spline_ini, spline_fin, match_segments=cls.match_segments)
             for i, j, mospline in zip(indices_ini, indices_fin, mosplines):
                 mospline.add_effectors(
                     spline_effectors_ini[i], spline_effectors_fin[j])
-            cls.morph_setup = Group(mosplines, spline_effectors_fin, spline_effectors_ini,
-                                    field, name=f"Morph:{spline_ini.name}->{spline_fin.name}")
+            rig["morph_setup"] = Group(mosplines, spline_effectors_fin, spline_effectors_ini,
+                                       field, name=f"Morph:{spline_ini.name}->{spline_fin.name}")
+            rig["spline_effectors_ini"] = spline_effectors_ini
+            rig["spline_effectors_fin"] = spline_effectors_fin
         else:
             for mospline, spline_effector in zip(mosplines, spline_effectors):
                 mospline.add_effectors(spline_effector)
-            cls.morph_setup = Group(mosplines, spline_effectors,
-                                    field, name=f"Morph:{spline_ini.name}->{spline_fin.name}")
-        # add to helper_objects
-        spline_ini.helper_objects["morph_mosplines"] = mosplines
-        spline_ini.helper_objects["morph_field"] = field
-        if cls.match_segments:
-            spline_ini.helper_objects["morph_spline_effectors_ini"] = spline_effectors_ini
-            spline_ini.helper_objects["morph_spline_effectors_fin"] = spline_effectors_fin
-        else:
-            spline_ini.helper_objects["morph_spline_effectors"] = spline_effectors
+            rig["morph_setup"] = Group(mosplines, spline_effectors,
+                                       field, name=f"Morph:{spline_ini.name}->{spline_fin.name}")
+            rig["spline_effectors"] = spline_effectors
+        rig["mosplines"] = mosplines
+        rig["field"] = field
+        return rig
 
     @classmethod
     def specify_target(cls, obj):
         target = obj.helper_objects["morph_field"]
         return target
 
+    @classmethod
+    def specify_xpression_key(cls, obj):
+        # every rig has an xanimator of its own so A->C does not drive the field of the rig of A->B
+        return (cls.__name__, cls.morph_setup)
+
     @classmethod
     def set_values(cls):
         cls.values = [1]
@@ -133,3 +178,79 @@ class Morph(TransitionAnimator):
         cls.parameter_name = "MorphCompletion"
         if cls.mode == "linear":
             cls.formula = f"t*2*{cls.bounding_box.x * 1.3 + cls.linear_field_length}-{cls.bounding_box.x * 1.3 + cls.linear_field_length}"
+
+
+class BakedMorph(TransitionAnimator):
+    """morphs one spline into another by resampling both splines to matching point counts per segment
+    and interpolating the points of a single spline with point level animation keyframes
+    no mograph rig is evaluated so the render cost per frame does not depend on the segment count"""
+
+    def __new__(cls, spline_ini: LineObject, spline_fin: LineObject, match_segments=True, point_count=100, **kwargs):
+        cls.match_segments = match_segments
+        cls.point_count = point_count
+        cls.insert_helper_objects(spline_ini, spline_fin)
+        cls.set_values()
+        morph_animations = super().__new__(cls, spline_ini, spline_fin, cls.morph_spline, category="neutral",
+                                           animation_type="points", **kwargs)
+        return morph_animations
+
+    @classmethod
+    def get_segment_pairs(cls, spline_ini, spline_fin):
+        """returns the pairs of initial and final segment indices, None refers to the whole initial spline"""
+        if cls.match_segments:
+            return match_spline_segments(spline_ini, spline_fin, match_segments=cls.match_segments)
+        # the whole initial spline flows into every final segment
+        segment_count_fin = spline_fin.get_segment_count()
+        return [None] * segment_count_fin, list(range(segment_count_fin))
+
+    @classmethod
+    def insert_helper_objects(cls, spline_ini, spline_fin):
+        sampler_ini = spline_ini.get_sampler()
+        sampler_fin = spline_fin.get_sampler()
+        indices_ini, indices_fin = cls.get_segment_pairs(
+            spline_ini, spline_fin)
+        # morph segments are only closed if both segments are closed
+        closed = [index_ini is not None and sampler_ini.closed[index_ini] and sampler_fin.closed[index_fin]
+                  for index_ini, index_fin in zip(indices_ini, indices_fin)]
+        points_ini = sampler_ini.resample(
+            indices_ini, cls.point_count, closed=closed).reshape(-1, 3)
+        points_fin = sampler_fin.resample(
+            indices_fin, cls.point_count, closed=closed).reshape(-1, 3)
+        # create morph spline with one segment per pair
+        if hasattr(spline_ini, "sketch_material"):
+            color = spline_ini.sketch_material.color
+        else:
+            color = WHITE
+        cls.morph_spline = Spline(spline_type="linear", color=color,
+                                  name=f"Morph:{spline_ini.name}->{spline_fin.name}")
+        # express the points in the local space of the morph spline
+        to_local = matrix_to_array(~cls.morph_spline.obj.GetMg())
+        cls.points_ini = transform_points(transform_points(
+            points_ini, matrix_to_array(spline_ini.obj.GetMg())), to_local)
+        cls.points_fin = transform_points(transform_points(
+            points_fin, matrix_to_array(spline_fin.obj.GetMg())), to_local)
+        cls.morph_spline.set_points(cls.points_ini, segments=[cls.point_count] * len(closed),
+                                    closed=closed)
+        spline_ini.helper_objects["morph_spline"] = cls.morph_spline
+
+    @classmethod
+    def specify_target(cls, obj):
+        target = obj.helper_objects["morph_spline"]
+        return target
+
+    @classmethod
+    def set_values(cls):
+        cls.values = [cls.points_fin]
+
+    @classmethod
+    def specify_desc_ids(cls):
+        cls.desc_ids = {
+            "points": c4d.DescID(c4d.DescLevel(c4d.CTpla, c4d.CTpla, 0))
+        }
+
+    @classmethod
+    def build_animation_group_per_object(cls, obj, relative=False, multiplicative=False):
+        """animates the points of the morph spline from the initial to the final shape"""
+        point_animation = PointAnimation(
+            cls.specify_target(obj), cls.points_fin, points_ini=cls.points_ini)
+        return AnimationGroup(point_animation)
@@ -0,0 +1,111 @@
+from concurrent.futures import ThreadPoolExecutor
+import importlib.util
+import subprocess
+import inspect
+import json
+import time
+import sys
+import os
+
+# marks the line of the worker output holding the result
+RESULT_PREFIX = "PYDEATION_RESULT "
+
+# interpreter providing the c4d module e.g. c4dpy, can be a headless stand-in
+DEFAULT_INTERPRETER = os.environ.get("PYDEATION_PYTHON", sys.executable)
+
+
+def get_scene_spec(scene):
+    """returns the "path:ClassName" specification of a scene class
+    specifications are passed through unchanged"""
+    if isinstance(scene, str):
+        return scene
+    return f"{os.path.abspath(inspect.getsourcefile(scene))}:{scene.__qualname__}"
+
+
+def load_scene_class(scene_spec):
+    """imports the scene class given by its specification"""
+    path, class_name = scene_spec.rsplit(":", 1)
+    # scene scripts may import modules next to them
+    sys.path.insert(0, os.path.dirname(path))
+    module_name = os.path.splitext(os.path.basename(path))[0]
+    spec = importlib.util.spec_from_file_location(module_name, path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    spec.loader.exec_module(module)
+    scene_class = module
+    for name in class_name.split("."):
+        scene_class = getattr(scene_class, name)
+    return scene_class
+
+
+def build_scene(scene_spec, output_directory, resolution="default"):
+    """builds a scene in the current process, saves its document and returns the build statistics"""
+    import c4d
+    from pydeation.utils import iterate_hierarchy
+    scene_class = load_scene_class(scene_spec)
+    start_time = time.perf_counter()
+    scene = scene_class(resolution=resolution, interactive=False)
+    build_time = time.perf_counter() - start_time
+    path = os.path.join(output_directory, f"{scene.scene_name}.c4d")
+    if not c4d.documents.SaveDocument(scene.document, path, c4d.SAVEDOCUMENTFLAGS_DONTADDTORECENTLIST, c4d.FORMAT_C4DEXPORT):
+        raise IOError(f"could not save {path}")
+    return {"document": path, "build_time": build_time, "file_size": os.path.getsize(path),
+            "object_count": sum(1 for _ in iterate_hierarchy(scene.document.GetFirstObject()))}
+
+
+class BatchBuilder:
+    """builds scenes in parallel, every scene in a worker process of its own with its own document
+    workers run the given interpreter which has to provide the c4d module, e.g. c4dpy or a headless stand-in
+    scenes are given as classes or as "path:ClassName" specifications"""
+
+    def __init__(self, scenes, output_directory, workers=None, timeout=None, resolution="default", interpreter=DEFAULT_INTERPRETER):
+        self.scene_specs = [get_scene_spec(scene) for scene in scenes]
+        self.output_directory = os.path.abspath(output_directory)
+        self.workers = workers or os.cpu_count()
+        self.timeout = timeout  # per scene in seconds
+        self.resolution = resolution
+        self.interpreter = interpreter
+        self.results = []
+
+    def build_in_worker(self, scene_spec):
+        """runs a worker process for a single scene and returns its result"""
+        result = {"scene": scene_spec, "status": "failed", "error": None}
+        command = [self.interpreter, os.path.abspath(__file__), scene_spec,
+                   self.output_directory, self.resolution]
+        start_time = time.perf_counter()
+        try:
+            process = subprocess.run(
+                command, capture_output=True, text=True, timeout=self.timeout)
+        except subprocess.TimeoutExpired:
+            result["status"] = "timeout"
+            result["error"] = f"exceeded {self.timeout} seconds"
+            return result
+        finally:
+            result["process_time"] = time.perf_counter() - start_time
+        lines = [line for line in process.stdout.splitlines()
+                 if line.startswith(RESULT_PREFIX)]
+        if process.returncode == 0 and lines:
+            result.update(json.loads(lines[-1][len(RESULT_PREFIX):]))
+            result["status"] = "built"
+        else:
+            result["error"] = process.stderr.strip().splitlines()[-20:]
+        return result
+
+    def run(self):
+        """builds all scenes and returns their results in the given order"""
+        os.makedirs(self.output_directory, exist_ok=True)
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            self.results = list(executor.map(
+                self.build_in_worker, self.scene_specs))
+        return self.results
+
+    @property
+    def failures(self):
+        """holds the results of scenes that failed or timed out"""
+        return [result for result in self.results if result["status"] != "built"]
+
+
+if __name__ == "__main__":
+    # worker entry point: scene specification, output directory, resolution
+    statistics = build_scene(*sys.argv[1:4])
+    print(RESULT_PREFIX + json.dumps(statistics))
@@ -0,0 +1,54 @@
+"""measures the time to first use of pydeation through the lazy namespace against the star import
+every statement runs in a fresh interpreter so earlier imports do not distort the timings
+run inside cinema 4d e.g. using c4dpy: c4dpy benchmarks/import_time.py
+outside of cinema the statements needing c4d are reported as unavailable"""
+import subprocess
+import tempfile
+import sys
+import os
+
+STATEMENTS = {
+    "lazy namespace": "import pydeation.imports as pd",
+    "lazy index": "import pydeation.imports as pd; pd.get_origins()",
+    "lazy first name": "import pydeation.imports as pd; pd.Circle",
+    "lazy scene": "import pydeation.imports as pd; pd.Scene; pd.Circle; pd.Draw",
+    "star import": "from pydeation.imports import *",
+}
+
+TEMPLATE = """import time
+time_ini = time.perf_counter()
+{statement}
+print(time.perf_counter() - time_ini)
+"""
+
+REPETITIONS = 5
+
+
+def measure(statement):
+    """returns the fastest time of the statement over fresh interpreters and the error if it failed"""
+    with tempfile.NamedTemporaryFile("w", suffix=".py", delete=False) as script:
+        script.write(TEMPLATE.format(statement=statement))
+    try:
+        times = []
+        for _ in range(REPETITIONS):
+            process = subprocess.run([sys.executable, script.name], capture_output=True, text=True)
+            if process.returncode:
+                return None, process.stderr.strip().splitlines()[-1]
+            times.append(float(process.stdout.strip().splitlines()[-1]))
+        return min(times), None
+    finally:
+        os.remove(script.name)
+
+
+def main():
+    print(f"{'statement':>16} {'time [ms]':>10}")
+    for name, statement in STATEMENTS.items():
+        duration, error = measure(statement)
+        if error is None:
+            print(f"{name:>16} {duration * 1e3:>10.1f}")
+        else:
+            print(f"{name:>16} {'unavailable':>10} {error}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""measures a chain of 20 morphs between splines with varying segment counts
+the chain is played twice: the first pass builds one rig per step, the repeated pass reuses the pooled rigs
+run inside cinema 4d e.g. using c4dpy: c4dpy benchmarks/morph_chain.py"""
+from pydeation.animation.transition_animators import Morph
+from pydeation.objects.line_objects import Spline
+from pydeation.utils import iterate_hierarchy
+import numpy as np
+import time
+import c4d
+
+STEP_COUNT = 20
+POINTS_PER_SEGMENT = 32
+
+
+def create_spline(rng, segment_count):
+    """returns a spline of closed circles with random centers and radii"""
+    angles = np.linspace(0, 2 * np.pi, POINTS_PER_SEGMENT, endpoint=False)
+    circles = [np.column_stack([np.cos(angles), np.sin(angles), np.zeros_like(angles)]) * rng.uniform(20, 80) +
+               rng.uniform(-200, 200, size=3) * [1, 1, 0] for _ in range(segment_count)]
+    return Spline(points=np.concatenate(circles), segments=[POINTS_PER_SEGMENT] * segment_count, closed=True)
+
+
+def count_objects(document):
+    first_object = document.GetFirstObject()
+    return 0 if first_object is None else sum(1 for _ in iterate_hierarchy(first_object))
+
+
+def play_chain(splines):
+    """returns the time per step of morphing along the chain"""
+    time_ini = time.perf_counter()
+    for spline_ini, spline_fin in zip(splines[:-1], splines[1:]):
+        Morph(spline_ini, spline_fin)
+    return (time.perf_counter() - time_ini) / (len(splines) - 1)
+
+
+def main():
+    document = c4d.documents.BaseDocument()
+    c4d.documents.InsertBaseDocument(document)
+    c4d.documents.SetActiveDocument(document)
+    rng = np.random.default_rng(0)
+    splines = [create_spline(rng, segment_count) for segment_count in rng.integers(1, 4, STEP_COUNT + 1)]
+    print(f"{'pass':>10} {'per step [ms]':>14} {'rigs':>6} {'objects':>8}")
+    for name in ("chain", "repeated"):
+        per_step = play_chain(splines)
+        rig_count = sum(len(spline.helper_objects.get("morph_rigs", {})) for spline in splines)
+        print(f"{name:>10} {per_step * 1e3:>14.1f} {rig_count:>6} {count_objects(document):>8}")
+    c4d.documents.KillDocument(document)
+
+
+if __name__ == "__main__":
+    main()
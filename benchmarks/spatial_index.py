@@ -0,0 +1,51 @@
+"""measures the neighbour queries of SpatialIndex on uniform, clustered and outlier position sets
+runs without cinema 4d: python benchmarks/spatial_index.py"""
+from pydeation.geometry.spatial import SpatialIndex
+import numpy as np
+import time
+
+POINT_COUNTS = (5000, 50000)
+K = 8
+
+
+def get_position_sets(rng, point_count):
+    """position sets for which a grid sized by the bounding box degrades to comparing all pairs"""
+    clustered = np.vstack([rng.normal(scale=0.01, size=(point_count // 2, 3)),
+                           rng.normal(scale=100, size=(point_count - point_count // 2, 3)) + 1e4])
+    return {
+        "uniform": rng.uniform(size=(point_count, 3)),
+        "normal + outlier": np.vstack([rng.normal(size=(point_count, 3)), [[1e6, 0, 0]]]),
+        "two clusters": clustered,
+    }
+
+
+def measure(function, *args):
+    time_ini = time.perf_counter()
+    result = function(*args)
+    return time.perf_counter() - time_ini, result
+
+
+def check_knn(positions, neighbours, sample_count=200):
+    """compares the neighbours of some positions with a brute force search"""
+    samples = np.linspace(0, len(positions) - 1, sample_count).astype(int)
+    distances = np.linalg.norm(positions[samples, None] - positions[None], axis=2)
+    distances[np.arange(sample_count), samples] = np.inf
+    expected = np.sort(distances, axis=1)[:, :neighbours.shape[1]]
+    found = np.linalg.norm(positions[neighbours[samples]] - positions[samples, None], axis=2)
+    return np.allclose(found, expected)
+
+
+def main():
+    rng = np.random.default_rng(0)
+    print(f"{'positions':>10} {'set':>18} {'build [s]':>10} {f'knn({K}) [s]':>11} {'gabriel [s]':>12} {'exact':>6}")
+    for point_count in POINT_COUNTS:
+        for name, positions in get_position_sets(rng, point_count).items():
+            build, index = measure(SpatialIndex, positions)
+            knn, (neighbours, _) = measure(index.knn, K)
+            gabriel, _ = measure(index.gabriel_edges)
+            exact = check_knn(positions, neighbours)
+            print(f"{len(positions):>10} {name:>18} {build:>10.3f} {knn:>11.3f} {gabriel:>12.3f} {exact!s:>6}")
+
+
+if __name__ == "__main__":
+    main()
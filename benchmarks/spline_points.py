@@ -0,0 +1,38 @@
+"""measures the point and tangent throughput of Spline.update_points against writing one point at a time
+run inside cinema 4d e.g. using c4dpy: c4dpy benchmarks/spline_points.py"""
+from pydeation.objects.line_objects import Spline
+import numpy as np
+import time
+import c4d
+
+POINT_COUNTS = (10**4, 10**5, 10**6)
+
+
+def write_per_point(spline, points, tangents):
+    """the approach replaced by update_points"""
+    for index, (point, tangent) in enumerate(zip(points.tolist(), tangents.tolist())):
+        spline.obj.SetPoint(index, c4d.Vector(*point))
+        spline.obj.SetTangent(index, -c4d.Vector(*tangent), c4d.Vector(*tangent))
+    spline.obj.Message(c4d.MSG_UPDATE)
+
+
+def measure(function, *args):
+    time_ini = time.perf_counter()
+    function(*args)
+    return time.perf_counter() - time_ini
+
+
+def main():
+    rng = np.random.default_rng(0)
+    print(f"{'points':>10} {'per point [s]':>14} {'update_points [s]':>18} {'points/s':>12}")
+    for point_count in POINT_COUNTS:
+        points = rng.normal(size=(point_count, 3))
+        tangents = rng.normal(size=(point_count, 3))
+        spline = Spline(points=points)
+        per_point = measure(write_per_point, spline, points, tangents)
+        bulk = measure(spline.update_points, points, tangents)
+        print(f"{point_count:>10} {per_point:>14.3f} {bulk:>18.3f} {point_count / bulk:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
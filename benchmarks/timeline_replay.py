@@ -0,0 +1,55 @@
+"""measures replaying an exported timeline against rebuilding a scene by executing its animations
+the scene is built once exporting its timeline, then rebuilt both ways and the keys of the documents are compared
+run inside cinema 4d e.g. using c4dpy: c4dpy benchmarks/timeline_replay.py"""
+from pydeation.scene import Scene
+from pydeation.objects.line_objects import Circle
+from pydeation.animation.sketch_animators import Draw
+from pydeation.animation.object_animators import Move
+from pydeation.utils import iterate_atoms
+import tempfile
+import time
+import os
+
+OBJECT_COUNTS = (100, 1000)
+PLAY_COUNT = 20
+
+
+def create_scene_class(object_count):
+    """returns a scene drawing and moving the given number of circles over several plays"""
+
+    class ReplayBenchmark(Scene):
+
+        def construct(self):
+            circles = [Circle(radius=10, x=(index % 40) * 25, y=(index // 40) * 25) for index in range(object_count)]
+            self.play(Draw(*circles))
+            for step in range(PLAY_COUNT):
+                self.play(Move(*circles, y=(-1)**step * 10), run_time=0.5)
+
+    return ReplayBenchmark
+
+
+def count_keys(document):
+    return sum(track.GetCurve().GetKeyCount() for atom in iterate_atoms(document) for track in atom.GetCTracks())
+
+
+def measure(scene_class, **kwargs):
+    """returns the build time and the key count of the scene"""
+    time_ini = time.perf_counter()
+    scene = scene_class(interactive=False, **kwargs)
+    return time.perf_counter() - time_ini, count_keys(scene.document)
+
+
+def main():
+    print(f"{'objects':>8} {'rebuild [s]':>12} {'replay [s]':>11} {'keys rebuild':>13} {'keys replay':>12}")
+    with tempfile.TemporaryDirectory() as directory:
+        for object_count in OBJECT_COUNTS:
+            scene_class = create_scene_class(object_count)
+            timeline_path = os.path.join(directory, f"timeline_{object_count}.npz")
+            scene_class(interactive=False, timeline_path=timeline_path)
+            rebuild, rebuild_keys = measure(scene_class)
+            replay, replay_keys = measure(scene_class, replay_path=timeline_path)
+            print(f"{object_count:>8} {rebuild:>12.2f} {replay:>11.2f} {rebuild_keys:>13} {replay_keys:>12}")
+
+
+if __name__ == "__main__":
+    main()
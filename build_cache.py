@@ -0,0 +1,315 @@
+from pydeation.utils import iterate_atoms
+from collections import OrderedDict
+from fractions import Fraction
+import numpy as np
+import hashlib
+import inspect
+import textwrap
+import bisect
+import types
+import json
+import time
+import ast
+import os
+import c4d
+
+LIBRARY_PATH = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_DIRECTORY = os.path.join(
+    os.path.expanduser("~"), ".pydeation", "build_cache")
+
+# methods of the scene that end a top level statement worth snapshotting
+BOUNDARY_METHODS = ("play", "wait", "checkpoint")
+
+# stands in for the scene inside stored snapshots
+SCENE_REFERENCE = object()
+
+# values that are immutable or global and therefore shared between snapshots
+# description ids are treated as values as pydeation never changes them after creation
+SHARED_TYPES = (type, types.ModuleType, types.FunctionType, types.BuiltinFunctionType,
+                str, bytes, int, float, complex, bool, type(None), range, slice, Fraction,
+                np.generic, c4d.DescID, c4d.DescLevel)
+
+_default_build_cache = None
+
+
+def get_default_build_cache():
+    """returns the build cache shared by all scenes of the session"""
+    global _default_build_cache
+    if _default_build_cache is None:
+        _default_build_cache = BuildCache()
+    return _default_build_cache
+
+
+def get_library_fingerprint():
+    """hashes the modification times and sizes of the pydeation sources"""
+    digest = hashlib.sha1()
+    for directory, _, file_names in sorted(os.walk(LIBRARY_PATH)):
+        for file_name in sorted(file_names):
+            if file_name.endswith(".py"):
+                status = os.stat(os.path.join(directory, file_name))
+                digest.update(
+                    f"{file_name}:{status.st_mtime_ns}:{status.st_size}".encode())
+    return digest.hexdigest()
+
+
+def map_atoms(document, clone):
+    """maps the atoms of a document to their counterparts in a clone of it"""
+    return dict(zip(iterate_atoms(document), iterate_atoms(clone)))
+
+
+def copy_container(container, mapping):
+    """copies a base container replacing the linked atoms by their counterparts in the mapping"""
+    copy = container.GetClone(c4d.COPYFLAGS_NONE)
+    for index, item in container:
+        if isinstance(item, c4d.BaseList2D):
+            copy.SetLink(index, mapping.get(item, item))
+        elif isinstance(item, c4d.BaseContainer):
+            copy.SetContainer(index, copy_container(item, mapping))
+    return copy
+
+
+def map_port(port, mapping):
+    """returns the port with the same sub id on the counterpart of the node of an xpresso port"""
+    node = port.GetNode()
+    if node not in mapping:
+        # ports of nodes outside the document are shared like their nodes
+        return port
+    mapped_node = mapping[node]
+    if port.GetIO() == c4d.GV_PORT_INPUT:
+        mapped_ports = mapped_node.GetInPorts()
+    else:
+        mapped_ports = mapped_node.GetOutPorts()
+    for mapped_port in mapped_ports:
+        if mapped_port.GetSubID() == port.GetSubID():
+            return mapped_port
+    raise ValueError(f"port {port.GetName(node)} has no counterpart on the cloned node {mapped_node.GetName()}")
+
+
+def rebind(value, mapping, memo):
+    """copies python state replacing atoms and xpresso ports by their counterparts in the mapping
+    containers, arrays, instances and mutable c4d values are copied, immutable values are shared
+    raises a TypeError for values it cannot copy rather than sharing them between documents"""
+    key = id(value)
+    if key in memo:
+        return memo[key]
+    if isinstance(value, c4d.modules.graphview.GvPort):
+        copy = map_port(value, mapping)
+    elif isinstance(value, c4d.C4DAtom):
+        # atoms outside the document are shared
+        return mapping.get(value, value)
+    elif isinstance(value, SHARED_TYPES):
+        return value
+    elif isinstance(value, c4d.Vector):
+        copy = c4d.Vector(value)
+    elif isinstance(value, c4d.Matrix):
+        copy = c4d.Matrix(c4d.Vector(value.off), c4d.Vector(value.v1),
+                          c4d.Vector(value.v2), c4d.Vector(value.v3))
+    elif isinstance(value, c4d.BaseTime):
+        copy = c4d.BaseTime(value.GetNumerator(), value.GetDenominator())
+    elif isinstance(value, c4d.BaseContainer):
+        copy = copy_container(value, mapping)
+    elif isinstance(value, np.ndarray):
+        if value.dtype == object:
+            raise TypeError("object arrays cannot be copied into a snapshot")
+        copy = value.copy()
+    elif isinstance(value, list):
+        copy = memo[key] = []
+        copy.extend(rebind(item, mapping, memo) for item in value)
+    elif isinstance(value, tuple):
+        copy = tuple(rebind(item, mapping, memo) for item in value)
+    elif isinstance(value, dict):
+        # keeps the type and default factory of dict subclasses
+        copy = memo[key] = value.copy()
+        copy.clear()
+        copy.update((rebind(item_key, mapping, memo), rebind(item, mapping, memo))
+                    for item_key, item in value.items())
+    elif isinstance(value, (set, frozenset)):
+        copy = type(value)(rebind(item, mapping, memo) for item in value)
+    elif isinstance(value, types.MethodType):
+        copy = types.MethodType(
+            value.__func__, rebind(value.__self__, mapping, memo))
+    elif hasattr(value, "__dict__"):
+        copy = memo[key] = object.__new__(type(value))
+        copy.__dict__.update((name, rebind(attribute, mapping, memo))
+                             for name, attribute in value.__dict__.items())
+    else:
+        raise TypeError(
+            f"values of type {type(value).__name__} cannot be copied into a snapshot")
+    memo[key] = copy
+    return copy
+
+
+class Snapshot:
+    """holds a clone of the document and the python state of a scene
+    taken at the end of a top level statement of construct"""
+
+    def __init__(self, scene, statement_index, fingerprint, local_variables, name=None):
+        self.statement_index = statement_index
+        self.fingerprint = fingerprint
+        self.name = name
+        self.time = scene.document.GetTime()
+        self.document = scene.document.GetClone(c4d.COPYFLAGS_NONE)
+        memo = {id(scene): SCENE_REFERENCE}
+        self.state = rebind({"scene": scene.get_snapshot_state(), "locals": local_variables},
+                            map_atoms(scene.document, self.document), memo)
+
+    def restore(self, scene):
+        """returns a fresh copy of the document and the python state bound to the given scene"""
+        document = self.document.GetClone(c4d.COPYFLAGS_NONE)
+        document.SetTime(self.time)
+        memo = {id(SCENE_REFERENCE): scene}
+        state = rebind(self.state, map_atoms(self.document, document), memo)
+        return document, state["scene"], state["locals"]
+
+
+class ConstructSource:
+    """splits the construct method of a scene class into top level statements
+    and fingerprints every prefix of them together with the rest of the scene module,
+    the constructor arguments and the library sources"""
+
+    def __init__(self, scene_class, arguments):
+        self.construct = scene_class.construct
+        self.filename = inspect.getsourcefile(self.construct)
+        self.scene_key = f"{self.filename}:{scene_class.__qualname__}"
+        lines, first_line = inspect.getsourcelines(self.construct)
+        module_lines = inspect.getsource(
+            inspect.getmodule(self.construct)).splitlines(True)
+        # the module without construct is part of every fingerprint
+        del module_lines[first_line - 1:first_line - 1 + len(lines)]
+        tree = ast.parse(textwrap.dedent("".join(lines)))
+        ast.increment_lineno(tree, first_line - 1)
+        self.statements = tree.body[0].body
+        self.statement_lines = [
+            statement.lineno for statement in self.statements]
+        digest = hashlib.sha1()
+        digest.update(get_library_fingerprint().encode())
+        digest.update("".join(module_lines).encode())
+        digest.update(repr(sorted(arguments.items())).encode())
+        # line numbers are left out so moving code does not invalidate the prefix
+        self.fingerprints = []
+        for statement in self.statements:
+            digest.update(ast.dump(statement).encode())
+            self.fingerprints.append(digest.hexdigest())
+        self.key = self.fingerprints[-1] if self.fingerprints else digest.hexdigest()
+
+    def get_statement_index(self, line):
+        """returns the index of the top level statement containing the line"""
+        return bisect.bisect_right(self.statement_lines, line) - 1
+
+    def is_boundary(self, statement_index):
+        """checks whether the statement consists of a single play, wait or checkpoint call"""
+        statement = self.statements[statement_index]
+        if not isinstance(statement, ast.Expr) or not isinstance(statement.value, ast.Call):
+            return False
+        function = statement.value.func
+        return (isinstance(function, ast.Attribute) and function.attr in BOUNDARY_METHODS
+                and isinstance(function.value, ast.Name) and function.value.id == "self")
+
+    def compile_tail(self, statement_index, local_names):
+        """compiles the statements following the given one into a function taking the local variables"""
+        parameters = ", ".join(["self"] + [name for name in local_names if name != "self"])
+        tree = ast.parse(f"def construct_tail({parameters}):\n    pass")
+        tail = self.statements[statement_index + 1:]
+        if tail:
+            tree.body[0].body = tail
+        ast.fix_missing_locations(tree)
+        namespace = dict(self.construct.__globals__)
+        exec(compile(tree, self.filename, "exec"), namespace)
+        return namespace["construct_tail"]
+
+
+class BuildCache:
+    """caches built documents on disk by the fingerprint of the complete construct source
+    and snapshots of construct in memory by the fingerprint of the statements preceding them
+    documents are evicted least recently used first once the size or entry limit is exceeded
+    both ways of reusing a build are opt in:
+        - restore_snapshots takes and restores snapshots and checkpoints, they copy the python state of the scene
+          and have not been verified inside cinema yet, they only live as long as the session
+        - load_documents loads the document of an unchanged scene from disk, it holds no python state
+          so the scene has no objects, schedule or section times and its stats and parameter evaluation raise
+    without either the documents are only saved for later sessions"""
+
+    def __init__(self, directory=DEFAULT_DIRECTORY, max_size=2**31, max_entries=64, max_snapshots=16, snapshot_interval=1, restore_snapshots=False, load_documents=False):
+        self.directory = directory
+        self.restore_snapshots = restore_snapshots
+        self.load_documents = load_documents
+        self.max_size = max_size
+        self.max_entries = max_entries
+        self.max_snapshots = max_snapshots
+        self.snapshot_interval = snapshot_interval  # minimum build time in seconds between snapshots
+        self.snapshots = OrderedDict()
+        self.checkpoints = {}  # named snapshots by scene and name, never evicted
+        os.makedirs(self.directory, exist_ok=True)
+        self.index_path = os.path.join(self.directory, "index.json")
+        self.index = self.read_index()
+
+    def read_index(self):
+        """reads the index of cached documents"""
+        if not os.path.exists(self.index_path):
+            return {}
+        with open(self.index_path) as index_file:
+            return json.load(index_file)
+
+    def write_index(self):
+        """writes the index of cached documents"""
+        with open(self.index_path, "w") as index_file:
+            json.dump(self.index, index_file)
+
+    def get_document_path(self, key):
+        return os.path.join(self.directory, f"{key}.c4d")
+
+    def load_document(self, key):
+        """returns the cached document for the key or None
+        the scene writes its render settings to the loaded document again"""
+        path = self.get_document_path(key)
+        if key not in self.index or not os.path.exists(path):
+            return None
+        self.index[key]["last_used"] = time.time()
+        self.write_index()
+        return c4d.documents.LoadDocument(path, c4d.SCENEFILTER_OBJECTS | c4d.SCENEFILTER_MATERIALS)
+
+    def save_document(self, key, document):
+        """saves the document for the key and evicts the least recently used documents"""
+        path = self.get_document_path(key)
+        if not c4d.documents.SaveDocument(document, path, c4d.SAVEDOCUMENTFLAGS_DONTADDTORECENTLIST, c4d.FORMAT_C4DEXPORT):
+            return
+        self.index[key] = {"size": os.path.getsize(path),
+                           "last_used": time.time()}
+        self.evict()
+        self.write_index()
+
+    def evict(self):
+        """removes the least recently used documents until the cache fits the limits"""
+        while self.index and (len(self.index) > self.max_entries
+                              or sum(entry["size"] for entry in self.index.values()) > self.max_size):
+            key = min(self.index, key=lambda key: self.index[key]["last_used"])
+            path = self.get_document_path(key)
+            if os.path.exists(path):
+                os.remove(path)
+            del self.index[key]
+
+    def add_snapshot(self, snapshot):
+        """stores a snapshot and drops the least recently used ones beyond the limit"""
+        self.snapshots[snapshot.fingerprint] = snapshot
+        self.snapshots.move_to_end(snapshot.fingerprint)
+        while len(self.snapshots) > self.max_snapshots:
+            self.snapshots.popitem(last=False)
+
+    def add_checkpoint(self, scene_key, snapshot):
+        """stores a named snapshot replacing earlier ones of the same name"""
+        self.checkpoints[(scene_key, snapshot.name)] = snapshot
+
+    def find_checkpoint(self, scene_key, name, fingerprints):
+        """returns the named snapshot if the statements preceding it are unchanged or None"""
+        snapshot = self.checkpoints.get((scene_key, name))
+        if snapshot is None or fingerprints[snapshot.statement_index:snapshot.statement_index + 1] != [snapshot.fingerprint]:
+            return None
+        return snapshot
+
+    def find_snapshot(self, fingerprints):
+        """returns the snapshot of the longest matching prefix or None"""
+        for fingerprint in reversed(fingerprints):
+            if fingerprint in self.snapshots:
+                self.snapshots.move_to_end(fingerprint)
+                return self.snapshots[fingerprint]
+        return None
@@ -21,6 +21,29 @@ SPLINE_THICKNESS = 3
 # math
 PI = np.pi
 
+# render resolutions
+RESOLUTIONS = {
+    "verylow": (320, 180),
+    "low": (480, 270),
+    "default": (1280, 720),
+    "high": (2560, 1440),
+    "veryhigh": (3840, 2160)
+}
+
+# render profiles trading quality for speed, a resolution of None keeps the one of the scene
+RENDER_PROFILES = {
+    "draft": {"resolution": "verylow", "line_quality": "draft", "antialiasing": c4d.RDATA_ANTIALIASING_NONE,
+              "frame_step": 4, "fills": False, "custom_tags": False},
+    "review": {"resolution": "low", "line_quality": "draft", "antialiasing": c4d.RDATA_ANTIALIASING_NONE,
+               "frame_step": 2, "fills": True, "custom_tags": False},
+    "final": {"resolution": None, "line_quality": "full", "antialiasing": c4d.RDATA_ANTIALIASING_BEST,
+              "frame_step": 1, "fills": True, "custom_tags": True}
+}
+
+# container ids of the tags created by pydeation holding their role and the material of a disabled fill tag
+TAG_ROLE_ID = 1060340
+DISABLED_MATERIAL_ID = 1060341
+
 # paths
 SVG_PATH = "/Users/davidrug/Library/Preferences/Maxon/Maxon Cinema 4D R26_8986B2D7/python39/libs/pydeation/assets/svg"
 
@@ -0,0 +1,25 @@
+import numpy as np
+
+
+def box_from_center(center, radius):
+    """returns the axis aligned box given by its center and radius as minimum and maximum"""
+    center = np.asarray(center, dtype=float)
+    radius = np.abs(np.asarray(radius, dtype=float))
+    return center - radius, center + radius
+
+
+def transform_box(minimum, maximum, matrix):
+    """returns the axis aligned box enclosing a box transformed by a 4x3 matrix given as offset followed by the three axes"""
+    matrix = np.asarray(matrix, dtype=float)
+    center = (np.asarray(minimum) + np.asarray(maximum)) / 2
+    radius = (np.asarray(maximum) - np.asarray(minimum)) / 2
+    # the extent along every axis is the sum of the absolute projections of the box axes
+    new_center = matrix[0] + center @ matrix[1:]
+    new_radius = radius @ np.abs(matrix[1:])
+    return new_center - new_radius, new_center + new_radius
+
+
+def union_boxes(boxes):
+    """returns the smallest box enclosing all given boxes"""
+    minima, maxima = zip(*boxes)
+    return np.min(minima, axis=0), np.max(maxima, axis=0)
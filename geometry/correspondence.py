@@ -0,0 +1,126 @@
+from collections import OrderedDict
+import numpy as np
+
+# solved correspondences by geometry hashes of the initial and final spline, least recently used first
+CORRESPONDENCE_CACHE = OrderedDict()
+MAX_CORRESPONDENCES = 1024
+
+
+def linear_sum_assignment(cost):
+    """solves the rectangular linear assignment problem using shortest augmenting paths
+    returns the row and column indices of the optimal assignment sorted by row"""
+    cost = np.asarray(cost, dtype=float)
+    transposed = cost.shape[0] > cost.shape[1]
+    if transposed:
+        cost = cost.T
+    row_count, column_count = cost.shape
+    row_potentials = np.zeros(row_count)
+    column_potentials = np.zeros(column_count)
+    row_of_column = np.full(column_count, -1)
+    column_of_row = np.full(row_count, -1)
+    for current_row in range(row_count):
+        shortest = np.full(column_count, np.inf)
+        path = np.full(column_count, -1)
+        visited_rows = np.zeros(row_count, dtype=bool)
+        visited_columns = np.zeros(column_count, dtype=bool)
+        row = current_row
+        minimum = 0
+        sink = -1
+        # grow the alternating tree until it reaches an unassigned column
+        while sink == -1:
+            visited_rows[row] = True
+            reduced_costs = minimum + cost[row] - \
+                row_potentials[row] - column_potentials
+            improved = ~visited_columns & (reduced_costs < shortest)
+            shortest[improved] = reduced_costs[improved]
+            path[improved] = row
+            candidates = np.where(visited_columns, np.inf, shortest)
+            column = int(np.argmin(candidates))
+            minimum = candidates[column]
+            if minimum == np.inf:
+                raise ValueError("cost matrix is infeasible")
+            visited_columns[column] = True
+            if row_of_column[column] == -1:
+                sink = column
+            else:
+                row = row_of_column[column]
+        # update the potentials
+        row_potentials[current_row] += minimum
+        other_rows = visited_rows.copy()
+        other_rows[current_row] = False
+        row_potentials[other_rows] += minimum - \
+            shortest[column_of_row[other_rows]]
+        column_potentials[visited_columns] -= minimum - \
+            shortest[visited_columns]
+        # augment along the path
+        column = sink
+        while True:
+            row = path[column]
+            row_of_column[column] = row
+            column_of_row[row], column = column, column_of_row[row]
+            if row == current_row:
+                break
+    rows = np.arange(row_count)
+    if transposed:
+        order = np.argsort(column_of_row)
+        return column_of_row[order], rows[order]
+    return rows, column_of_row
+
+
+def segment_features(sampler, point_count=32):
+    """returns the centroid, area and length of every segment of a spline sampler
+    centroids are relative to the centroid of the whole spline"""
+    segment_count = len(sampler.segments)
+    points = sampler.resample(range(segment_count), point_count,
+                              closed=sampler.closed)
+    centroids = points.mean(axis=1)
+    weights = sampler.segment_lengths / max(sampler.length, 1e-12)
+    centroids -= weights @ centroids if sampler.length else centroids.mean(axis=0)
+    # vector area of the closed outline of every segment
+    cross_products = np.cross(points, np.roll(points, -1, axis=1))
+    areas = np.linalg.norm(cross_products.sum(axis=1), axis=1) / 2
+    return centroids, areas, sampler.segment_lengths.copy()
+
+
+def correspondence_cost(features_ini, features_fin, weights=(1, 0.5, 0.5)):
+    """returns the cost matrix of matching segments by their centroid, area and length
+    all terms are measured in units of length and normalised by the joint extent of both splines"""
+    centroids_ini, areas_ini, lengths_ini = features_ini
+    centroids_fin, areas_fin, lengths_fin = features_fin
+    scale = max(np.ptp(np.concatenate([centroids_ini, centroids_fin]), axis=0).max(),
+                lengths_ini.max(), lengths_fin.max(), 1e-12)
+    centroid_costs = np.linalg.norm(
+        centroids_ini[:, None, :] - centroids_fin[None, :, :], axis=2)
+    area_costs = np.abs(np.sqrt(areas_ini)[:, None] - np.sqrt(areas_fin)[None, :])
+    length_costs = np.abs(lengths_ini[:, None] - lengths_fin[None, :])
+    centroid_weight, area_weight, length_weight = weights
+    return (centroid_weight * centroid_costs + area_weight * area_costs + length_weight * length_costs) / scale
+
+
+def solve_correspondence(sampler_ini, sampler_fin, weights=(1, 0.5, 0.5)):
+    """matches the segments of two splines by their geometry
+    segments of the spline with more segments that are left over after the optimal assignment
+    are matched to their cheapest partner so every segment of both splines is used
+    results are cached by the geometry hashes of both splines, the least recently used beyond MAX_CORRESPONDENCES are dropped"""
+    cache_key = (sampler_ini.get_geometry_hash(),
+                 sampler_fin.get_geometry_hash(), tuple(weights))
+    if cache_key not in CORRESPONDENCE_CACHE:
+        cost = correspondence_cost(segment_features(sampler_ini),
+                                   segment_features(sampler_fin), weights=weights)
+        indices_ini, indices_fin = linear_sum_assignment(cost)
+        # match the left over segments
+        left_over_ini = np.setdiff1d(np.arange(cost.shape[0]), indices_ini)
+        left_over_fin = np.setdiff1d(np.arange(cost.shape[1]), indices_fin)
+        indices_ini = np.concatenate([indices_ini, left_over_ini,
+                                      indices_ini[np.argmin(cost[indices_ini][:, left_over_fin], axis=0)] if len(left_over_fin) else []])
+        indices_fin = np.concatenate([indices_fin,
+                                      indices_fin[np.argmin(cost[left_over_ini][:, indices_fin], axis=1)] if len(left_over_ini) else [],
+                                      left_over_fin])
+        order = np.lexsort((indices_fin, indices_ini))
+        CORRESPONDENCE_CACHE[cache_key] = (indices_ini[order].astype(int).tolist(),
+                                           indices_fin[order].astype(int).tolist())
+        while len(CORRESPONDENCE_CACHE) > MAX_CORRESPONDENCES:
+            CORRESPONDENCE_CACHE.popitem(last=False)
+    CORRESPONDENCE_CACHE.move_to_end(cache_key)
+    indices_ini, indices_fin = CORRESPONDENCE_CACHE[cache_key]
+    return list(indices_ini), list(indices_fin)
@@ -0,0 +1,112 @@
+import numpy as np
+
+# fields stored for every bin, each as x and y coordinate
+BIN_FIELDS = ("first", "last", "min", "max")
+
+
+def reduce_bins(keys, bins):
+    """combines bins sharing a key, the bins are expected in chronological order"""
+    if not len(keys):
+        return keys, bins
+    order = np.argsort(keys, kind="stable")
+    sorted_keys = keys[order]
+    unique_keys, starts = np.unique(sorted_keys, return_index=True)
+    stops = np.append(starts[1:], len(sorted_keys)) - 1
+    reduced = {"first": bins["first"][order[starts]],
+               "last": bins["last"][order[stops]]}
+    # extremes are found as first entry of every group sorted by value
+    min_order = np.lexsort((bins["min"][:, 1], keys))
+    max_order = np.lexsort((-bins["max"][:, 1], keys))
+    reduced["min"] = bins["min"][min_order[starts]]
+    reduced["max"] = bins["max"][max_order[starts]]
+    return unique_keys, reduced
+
+
+class MinMaxDecimator:
+    """decimates a series streamed in chunks by keeping the first, last, minimum and maximum sample per bin
+    bins double their width whenever the series outgrows the capacity so the length need not be known in advance
+    the series is expected to be ordered by x"""
+
+    def __init__(self, bin_count, x_range=None):
+        self.bin_count = bin_count
+        self.capacity = 2 * bin_count
+        self.keys = np.zeros(0, dtype=np.int64)
+        self.bins = {field: np.zeros((0, 2)) for field in BIN_FIELDS}
+        if x_range is None:
+            self.x_start = None
+            self.bin_width = None
+        else:
+            self.x_start = x_range[0]
+            self.bin_width = max(x_range[1] - x_range[0], 1e-12) / bin_count
+
+    def add(self, xs, ys):
+        """adds a chunk of samples"""
+        samples = np.column_stack([xs, ys]).astype(float)
+        if not len(samples):
+            return
+        if self.x_start is None:
+            self.x_start = samples[0, 0]
+            self.bin_width = max(samples[-1, 0] - samples[0, 0], 1e-12) / self.capacity
+        keys = np.floor((samples[:, 0] - self.x_start) /
+                        self.bin_width).astype(np.int64)
+        while keys.max() >= self.capacity:
+            # merge neighbouring bins
+            self.bin_width *= 2
+            keys //= 2
+            self.keys, self.bins = reduce_bins(self.keys // 2, self.bins)
+        chunk_keys, chunk_bins = reduce_bins(
+            keys, {field: samples for field in BIN_FIELDS})
+        self.keys, self.bins = reduce_bins(np.concatenate([self.keys, chunk_keys]), {
+            field: np.concatenate([self.bins[field], chunk_bins[field]]) for field in BIN_FIELDS})
+
+    def get_extent(self):
+        """returns the x and y range of all samples added so far"""
+        x_range = (self.bins["first"][0, 0], self.bins["last"][-1, 0])
+        y_range = (self.bins["min"][:, 1].min(), self.bins["max"][:, 1].max())
+        return x_range, y_range
+
+    def get_points(self):
+        """returns the decimated samples with at most four samples per final bin in chronological order"""
+        if not len(self.keys):
+            return np.zeros((0, 2))
+        # regroup to exactly bin_count bins over the actual extent
+        (x_min, x_max), _ = self.get_extent()
+        bin_width = max(x_max - x_min, 1e-12) / self.bin_count
+        keys = np.clip(((self.bins["first"][:, 0] - x_min) // bin_width).astype(np.int64),
+                       0, self.bin_count - 1)
+        _, bins = reduce_bins(keys, self.bins)
+        candidates = np.stack([bins[field] for field in BIN_FIELDS], axis=1)
+        # order the samples within every bin by x
+        order = np.argsort(candidates[:, :, 0], axis=1, kind="stable")
+        candidates = np.take_along_axis(candidates, order[:, :, None], axis=1).reshape(-1, 2)
+        duplicates = np.all(candidates[1:] == candidates[:-1], axis=1)
+        return candidates[np.concatenate([[True], ~duplicates])]
+
+
+def simplify_polyline(points, epsilon):
+    """simplifies a polyline using the ramer-douglas-peucker algorithm with an explicit stack"""
+    points = np.asarray(points, dtype=float)
+    if len(points) < 3:
+        return points
+    keep = np.zeros(len(points), dtype=bool)
+    keep[[0, -1]] = True
+    stack = [(0, len(points) - 1)]
+    while stack:
+        start, stop = stack.pop()
+        if stop - start < 2:
+            continue
+        # distances of the inner points to the chord
+        chord = points[stop] - points[start]
+        offsets = points[start + 1:stop] - points[start]
+        chord_length_squared = chord @ chord
+        if chord_length_squared > 0:
+            weights = np.clip(offsets @ chord / chord_length_squared, 0, 1)
+            distances = np.linalg.norm(offsets - weights[:, None] * chord, axis=1)
+        else:
+            distances = np.linalg.norm(offsets, axis=1)
+        index = int(np.argmax(distances))
+        if distances[index] > epsilon:
+            split = start + 1 + index
+            keep[split] = True
+            stack += [(start, split), (split, stop)]
+    return points[keep]
@@ -0,0 +1,68 @@
+import numpy as np
+
+
+def edge_count(node_count):
+    """returns the number of edges of the complete graph without self loops"""
+    return node_count * (node_count - 1) // 2
+
+
+def unrank_edges(ranks, node_count):
+    """translates ranks of the row major enumeration of the upper triangle into index pairs (i, j) with i < j"""
+    ranks = np.asarray(ranks, dtype=np.int64)
+    # row i starts at rank i * (2n - i - 1) / 2
+    b = 2 * node_count - 1
+    rows = np.floor((b - np.sqrt(b * b - 8 * ranks.astype(float))) / 2).astype(np.int64)
+    # correct floating point errors at row boundaries
+    row_starts = rows * (b - rows) // 2
+    rows -= (row_starts > ranks)
+    row_starts = rows * (b - rows) // 2
+    next_row_starts = (rows + 1) * (b - rows - 1) // 2
+    rows += (next_row_starts <= ranks)
+    row_starts = rows * (b - rows) // 2
+    columns = ranks - row_starts + rows + 1
+    return np.column_stack([rows, columns])
+
+
+def sample_ranks(total, sample_size, generator):
+    """returns sample_size distinct ranks below total in ascending order without enumerating all ranks
+    random ranks are drawn in batches and duplicates are rejected until the sample is complete"""
+    ranks = np.zeros(0, dtype=np.int64)
+    while len(ranks) < sample_size:
+        # draw enough to cover the expected share of duplicates
+        missing = sample_size - len(ranks)
+        batch_size = int(missing / (1 - len(ranks) / total)) + 16
+        ranks = np.unique(np.concatenate([ranks, generator.integers(0, total, size=batch_size)]))
+    if len(ranks) > sample_size:
+        # a random subset of the sorted ranks as trimming the tail would bias the sample
+        ranks = np.sort(generator.choice(ranks, size=sample_size, replace=False))
+    return ranks
+
+
+def iterate_edges(node_count, completeness=1, random_seed=None, chunk_size=2**16):
+    """yields a fraction of the edges of the complete graph in chunks of index pairs ordered by rank
+    the ranks are sampled by rejection and unranked chunk by chunk so memory stays proportional to the sample,
+    samples of more than half of the edges are taken by excluding a sample of the rest"""
+    total = edge_count(node_count)
+    sample_size = min(max(round(total * completeness), 0), total)
+    generator = np.random.default_rng(random_seed)
+    if sample_size <= total // 2:
+        ranks = sample_ranks(total, sample_size, generator)
+        for start in range(0, len(ranks), chunk_size):
+            yield unrank_edges(ranks[start:start + chunk_size], node_count)
+        return
+    excluded_ranks = sample_ranks(total, total - sample_size, generator)
+    for start in range(0, total, chunk_size):
+        ranks = np.arange(start, min(start + chunk_size, total))
+        low, high = np.searchsorted(excluded_ranks, [start, start + chunk_size])
+        ranks = np.delete(ranks, excluded_ranks[low:high] - start)
+        if len(ranks):
+            yield unrank_edges(ranks, node_count)
+
+
+def sample_edges(node_count, completeness=1, random_seed=None):
+    """samples a fraction of the edges of the complete graph as array of index pairs ordered by rank,
+    see iterate_edges"""
+    edges = list(iterate_edges(node_count, completeness=completeness, random_seed=random_seed))
+    if not edges:
+        return np.zeros((0, 2), dtype=np.int64)
+    return np.concatenate(edges)
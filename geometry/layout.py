@@ -0,0 +1,182 @@
+from pydeation.geometry.sampling import sample_polyline
+import numpy as np
+
+# axes spanning the planes, the first axis holds the sine and the second the cosine component
+PLANE_AXES = {"xy": (0, 1), "zy": (2, 1), "xz": (0, 2)}
+
+
+def embed_in_plane(coordinates, plane="xy", center=(0, 0, 0)):
+    """lifts an array of two dimensional coordinates into three dimensional positions on the given plane"""
+    coordinates = np.asarray(coordinates, dtype=float)
+    positions = np.zeros((len(coordinates), 3))
+    first_axis, second_axis = PLANE_AXES[plane]
+    positions[:, first_axis] = coordinates[:, 0]
+    positions[:, second_axis] = coordinates[:, 1]
+    positions += np.asarray(center, dtype=float)
+    return positions
+
+
+def project_to_plane(positions, plane="xy"):
+    """returns the two dimensional coordinates of positions on the given plane"""
+    positions = np.asarray(positions, dtype=float)
+    first_axis, second_axis = PLANE_AXES[plane]
+    return positions[:, [first_axis, second_axis]]
+
+
+def circle_layout(count, radius=100, center=(0, 0, 0), plane="xy", phi_offset=0):
+    """places points evenly on a circle starting at the top going clockwise"""
+    phis = phi_offset + 2 * np.pi * np.arange(count) / max(count, 1)
+    coordinates = radius * np.column_stack([np.sin(phis), np.cos(phis)])
+    return embed_in_plane(coordinates, plane=plane, center=center)
+
+
+def line_layout(count, point_ini=(-100, 0, 0), point_fin=(100, 0, 0)):
+    """places points evenly on a line including both end points"""
+    vector_ini = np.asarray(point_ini, dtype=float)
+    vector_fin = np.asarray(point_fin, dtype=float)
+    ts = np.linspace(0, 1, count)[:, None]
+    return vector_ini + ts * (vector_fin - vector_ini)
+
+
+def grid_layout(count, columns=None, spacing=100, center=(0, 0, 0), plane="xy"):
+    """places points row by row on a grid centered around the given center"""
+    if columns is None:
+        columns = int(np.ceil(np.sqrt(count)))
+    columns = max(min(columns, count), 1)
+    rows = int(np.ceil(count / columns))
+    spacing_x, spacing_y = np.broadcast_to(np.asarray(spacing, dtype=float), (2,))
+    indices = np.arange(count)
+    column_indices, row_indices = indices % columns, indices // columns
+    # rows go downwards like text
+    coordinates = np.column_stack([
+        (column_indices - (columns - 1) / 2) * spacing_x,
+        ((rows - 1) / 2 - row_indices) * spacing_y])
+    return embed_in_plane(coordinates, plane=plane, center=center)
+
+
+def spiral_layout(count, spacing=50, mode="fermat", turns=3, center=(0, 0, 0), plane="xy"):
+    """places points on a spiral:
+        - fermat: sunflower pattern with even density, spacing is the distance between neighbours
+        - archimedean: points on an arm with the given number of turns and constant arm distance"""
+    indices = np.arange(count)
+    if mode == "fermat":
+        golden_angle = np.pi * (3 - np.sqrt(5))
+        phis = indices * golden_angle
+        radii = spacing * np.sqrt(indices)
+    elif mode == "archimedean":
+        phis = np.linspace(0, 2 * np.pi * turns, count)
+        radii = spacing * phis / (2 * np.pi)
+    else:
+        raise ValueError("mode must be 'fermat' or 'archimedean'")
+    coordinates = radii[:, None] * np.column_stack([np.sin(phis), np.cos(phis)])
+    return embed_in_plane(coordinates, plane=plane, center=center)
+
+
+def polyline_layout(count, points, closed=False):
+    """places points evenly spaced by arc length along a polyline"""
+    if closed:
+        fractions = np.arange(count) / max(count, 1)
+    else:
+        fractions = np.linspace(0, 1, count)
+    return sample_polyline(points, fractions, closed=closed)
+
+
+def exact_repulsion(coordinates, k_squared, chunk_size=2048):
+    """returns the repulsive displacement between all pairs of points, evaluated in chunks of rows"""
+    count = len(coordinates)
+    displacements = np.zeros_like(coordinates)
+    for start in range(0, count, chunk_size):
+        stop = min(start + chunk_size, count)
+        deltas = coordinates[start:stop, None, :] - coordinates[None, :, :]
+        distances_squared = np.einsum("ijk,ijk->ij", deltas, deltas)
+        distances_squared[np.arange(stop - start), np.arange(start, stop)] = np.inf
+        distances_squared = np.maximum(distances_squared, 1e-9)
+        displacements[start:stop] = k_squared * \
+            np.einsum("ijk,ij->ik", deltas, 1 / distances_squared)
+    return displacements
+
+
+def grid_repulsion(coordinates, k_squared, points_per_cell=32, chunk_size=2048):
+    """approximates the repulsive displacement by binning the points into a grid
+    points in the same cell repel exactly, other cells act through their weighted centroid"""
+    count = len(coordinates)
+    cells_per_axis = max(int(np.ceil(np.sqrt(count / points_per_cell))), 1)
+    minimum = coordinates.min(axis=0)
+    cell_size = np.maximum(np.ptp(coordinates, axis=0), 1e-9) / cells_per_axis
+    cell_coordinates = np.minimum(
+        ((coordinates - minimum) // cell_size).astype(int), cells_per_axis - 1)
+    cell_ids = cell_coordinates[:, 0] * cells_per_axis + cell_coordinates[:, 1]
+    # aggregate cells
+    occupied_cells, cell_indices, cell_counts = np.unique(
+        cell_ids, return_inverse=True, return_counts=True)
+    cell_indices = cell_indices.ravel()
+    centroids = np.column_stack([np.bincount(cell_indices, weights=coordinates[:, axis])
+                                 for axis in range(2)]) / cell_counts[:, None]
+    displacements = np.zeros_like(coordinates)
+    # far field through centroids, own cell excluded
+    for start in range(0, count, chunk_size):
+        stop = min(start + chunk_size, count)
+        deltas = coordinates[start:stop, None, :] - centroids[None, :, :]
+        distances_squared = np.maximum(
+            np.einsum("ijk,ijk->ij", deltas, deltas), 1e-9)
+        weights = cell_counts[None, :] / distances_squared
+        weights[np.arange(stop - start), cell_indices[start:stop]] = 0
+        displacements[start:stop] = k_squared * \
+            np.einsum("ijk,ij->ik", deltas, weights)
+    # near field between all pairs sharing a cell
+    order = np.argsort(cell_indices, kind="stable")
+    cell_starts = np.concatenate([[0], np.cumsum(cell_counts)[:-1]])
+    partner_counts = cell_counts[cell_indices[order]]
+    sources = np.repeat(order, partner_counts)
+    group_starts = np.repeat(
+        np.cumsum(partner_counts) - partner_counts, partner_counts)
+    partner_offsets = np.arange(len(sources)) - group_starts
+    partners = order[np.repeat(
+        cell_starts[cell_indices[order]], partner_counts) + partner_offsets]
+    distinct = sources != partners
+    sources, partners = sources[distinct], partners[distinct]
+    deltas = coordinates[sources] - coordinates[partners]
+    distances_squared = np.maximum(np.einsum("ij,ij->i", deltas, deltas), 1e-9)
+    forces = k_squared * deltas / distances_squared[:, None]
+    for axis in range(2):
+        displacements[:, axis] += np.bincount(
+            sources, weights=forces[:, axis], minlength=count)
+    return displacements
+
+
+def force_directed_layout(positions, edges, iterations=50, ideal_length=100, plane="xy", random_seed=420, repulsion=None):
+    """relaxes the positions of a node graph in the given plane using the fruchterman-reingold model
+    repulsion is either exact or grid approximated, by default grid is used for more than 2000 nodes"""
+    positions = np.asarray(positions, dtype=float)
+    edges = np.asarray(edges, dtype=int).reshape(-1, 2)
+    count = len(positions)
+    if count < 2:
+        return positions.copy()
+    if repulsion is None:
+        repulsion = "exact" if count <= 2000 else "grid"
+    repulsions = {"exact": exact_repulsion, "grid": grid_repulsion}
+    center = positions.mean(axis=0)
+    coordinates = project_to_plane(positions - center, plane=plane)
+    # spread out coincident starting positions
+    if np.ptp(coordinates, axis=0).max() == 0:
+        generator = np.random.default_rng(random_seed)
+        coordinates = generator.uniform(-1, 1, (count, 2)) * ideal_length * np.sqrt(count)
+    temperature = ideal_length * np.sqrt(count) / 10
+    cooling = temperature / iterations
+    k_squared = ideal_length ** 2
+    for _ in range(iterations):
+        displacements = repulsions[repulsion](coordinates, k_squared)
+        # attraction along edges
+        if len(edges):
+            deltas = coordinates[edges[:, 0]] - coordinates[edges[:, 1]]
+            distances = np.linalg.norm(deltas, axis=1, keepdims=True)
+            forces = deltas * distances / ideal_length
+            np.subtract.at(displacements, edges[:, 0], forces)
+            np.add.at(displacements, edges[:, 1], forces)
+        # limit displacement by temperature
+        lengths = np.linalg.norm(displacements, axis=1, keepdims=True)
+        coordinates += displacements / np.maximum(lengths, 1e-9) * \
+            np.minimum(lengths, temperature)
+        temperature = max(temperature - cooling, ideal_length / 100)
+    coordinates -= coordinates.mean(axis=0)
+    return embed_in_plane(coordinates, plane=plane, center=center)
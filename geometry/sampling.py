@@ -0,0 +1,188 @@
+import hashlib
+import numpy as np
+
+
+def cumulative_lengths(points, closed=False):
+    """returns the cumulative arc length at every vertex of a polyline
+    for closed polylines the closing edge is appended as an extra entry"""
+    points = np.asarray(points, dtype=float)
+    if closed and len(points) > 1:
+        points = np.concatenate([points, points[:1]])
+    edge_lengths = np.linalg.norm(np.diff(points, axis=0), axis=1)
+    lengths = np.concatenate([[0], np.cumsum(edge_lengths)])
+    return lengths
+
+
+def sample_polyline(points, fractions, closed=False, lengths=None):
+    """returns the points at the given fractions of the arc length of a polyline"""
+    points = np.asarray(points, dtype=float)
+    fractions = np.clip(np.asarray(fractions, dtype=float), 0, 1)
+    if closed and len(points) > 1:
+        points = np.concatenate([points, points[:1]])
+    if len(points) == 1:
+        return np.repeat(points, len(fractions), axis=0)
+    if lengths is None:
+        lengths = cumulative_lengths(points)
+    # find the edge each fraction falls on
+    distances = fractions * lengths[-1]
+    edge_indices = np.searchsorted(lengths, distances, side="right") - 1
+    edge_indices = np.clip(edge_indices, 0, len(points) - 2)
+    # interpolate linearly on the edge
+    edge_lengths = lengths[edge_indices + 1] - lengths[edge_indices]
+    safe_edge_lengths = np.where(edge_lengths > 0, edge_lengths, 1)
+    weights = (distances - lengths[edge_indices]) / safe_edge_lengths
+    weights = np.where(edge_lengths > 0, weights, 0)[:, None]
+    sampled_points = points[edge_indices] * (1 - weights) + \
+        points[edge_indices + 1] * weights
+    return sampled_points
+
+
+def transform_points(points, matrix):
+    """applies a 4x3 matrix given as offset followed by the three axes to an array of points"""
+    points = np.asarray(points, dtype=float)
+    matrix = np.asarray(matrix, dtype=float)
+    return matrix[0] + points @ matrix[1:]
+
+
+class SplineSampler:
+    """holds an arc length lookup table of a spline given as its interpolated segments
+    and answers batched queries on it"""
+
+    def __init__(self, segments, closed=None):
+        self.segments = [np.asarray(segment, dtype=float).reshape(-1, 3)
+                         for segment in segments]
+        if closed is None:
+            closed = [False] * len(self.segments)
+        self.closed = list(closed)
+        self.geometry_hash = None
+        self.build_lookup_table()
+
+    def __repr__(self):
+        return f"SplineSampler: {len(self.segments)} segments, length {self.length}"
+
+    def build_lookup_table(self):
+        """concatenates the segments and accumulates their lengths"""
+        segment_points = []
+        segment_lengths = []
+        for segment, closed in zip(self.segments, self.closed):
+            if closed and len(segment) > 1:
+                segment = np.concatenate([segment, segment[:1]])
+            segment_points.append(segment)
+            segment_lengths.append(cumulative_lengths(segment))
+        self.segment_lengths = np.array([lengths[-1] if len(lengths) else 0
+                                         for lengths in segment_lengths])
+        self.length = float(self.segment_lengths.sum())
+        # offset the segment lengths to one global arc length
+        self.segment_offsets = np.concatenate(
+            [[0], np.cumsum(self.segment_lengths)])
+        self.points = np.concatenate(segment_points) if segment_points else np.zeros((0, 3))
+        self.lengths = np.concatenate([lengths + offset for lengths, offset in zip(
+            segment_lengths, self.segment_offsets)]) if segment_lengths else np.zeros(0)
+        self.point_segments = np.concatenate([np.full(len(points), i) for i, points in enumerate(
+            segment_points)]) if segment_points else np.zeros(0, dtype=int)
+        # edges connect consecutive points of the same segment only
+        self.edge_starts = np.flatnonzero(
+            self.point_segments[:-1] == self.point_segments[1:])
+        # range of edges belonging to every segment
+        edge_segments = self.point_segments[self.edge_starts]
+        segment_indices = np.arange(len(self.segments))
+        self.segment_edge_starts = np.searchsorted(edge_segments, segment_indices)
+        self.segment_edge_stops = np.searchsorted(edge_segments, segment_indices, side="right")
+
+    def get_geometry_hash(self):
+        """returns a hash of the segment points and closures that identifies the geometry independent of the object"""
+        if self.geometry_hash is None:
+            digest = hashlib.sha1()
+            for segment, closed in zip(self.segments, self.closed):
+                digest.update(np.round(segment, 6).tobytes())
+                digest.update(bytes([closed]))
+            self.geometry_hash = digest.hexdigest()
+        return self.geometry_hash
+
+    def points_at(self, fractions, segment=None):
+        """returns the points at the given fractions of the arc length
+        of the whole spline or optionally of a single segment"""
+        fractions = np.clip(np.atleast_1d(np.asarray(fractions, dtype=float)), 0, 1)
+        if segment is None:
+            distances = fractions * self.length
+            return self.points_at_distances(distances)
+        distances = self.segment_offsets[segment] + \
+            fractions * self.segment_lengths[segment]
+        return self.points_at_distances(distances, segments=np.full(len(distances), segment))
+
+    def points_at_distances(self, distances, segments=None):
+        """returns the points at the given absolute arc lengths
+        optionally the points are restricted to given segments so segment ends do not jump to the next segment"""
+        distances = np.asarray(distances, dtype=float)
+        edge_indices = np.searchsorted(
+            self.lengths[self.edge_starts], distances, side="right") - 1
+        if segments is None:
+            edge_indices = np.clip(edge_indices, 0, len(self.edge_starts) - 1)
+        else:
+            edge_indices = np.clip(edge_indices, self.segment_edge_starts[segments],
+                                   np.maximum(self.segment_edge_stops[segments] - 1, self.segment_edge_starts[segments]))
+        edge_indices = self.edge_starts[edge_indices]
+        edge_lengths = self.lengths[edge_indices + 1] - self.lengths[edge_indices]
+        safe_edge_lengths = np.where(edge_lengths > 0, edge_lengths, 1)
+        weights = np.clip((distances - self.lengths[edge_indices]) / safe_edge_lengths, 0, 1)
+        weights = np.where(edge_lengths > 0, weights, 0)[:, None]
+        return self.points[edge_indices] * (1 - weights) + self.points[edge_indices + 1] * weights
+
+    def sample_evenly(self, count, segment=None):
+        """returns count points evenly spaced by arc length, closed splines do not repeat their start point"""
+        closed = self.closed[segment] if segment is not None else (
+            len(self.segments) == 1 and self.closed[0])
+        if closed:
+            fractions = np.arange(count) / max(count, 1)
+        else:
+            fractions = np.linspace(0, 1, count)
+        return self.points_at(fractions, segment=segment)
+
+    def resample(self, segment_indices, point_count, closed=False):
+        """returns point_count points evenly spaced by arc length for every given segment as array of shape (segments, point_count, 3)
+        a segment index of None refers to the whole spline, closed segments do not repeat their start point"""
+        closed = np.broadcast_to(np.asarray(closed, dtype=bool), (len(segment_indices),))
+        fractions = np.where(closed[:, None], np.arange(point_count) / max(point_count, 1),
+                             np.linspace(0, 1, point_count)[None, :])
+        whole = np.array([index is None for index in segment_indices], dtype=bool)
+        indices = np.array([0 if index is None else index for index in segment_indices], dtype=int)
+        offsets = np.where(whole, 0, self.segment_offsets[indices])
+        lengths = np.where(whole, self.length, self.segment_lengths[indices])
+        distances = offsets[:, None] + fractions * lengths[:, None]
+        points = np.empty((len(segment_indices), point_count, 3))
+        points[whole] = self.points_at_distances(distances[whole].ravel()).reshape(-1, point_count, 3)
+        segments = np.repeat(indices[~whole], point_count)
+        points[~whole] = self.points_at_distances(
+            distances[~whole].ravel(), segments=segments).reshape(-1, point_count, 3)
+        return points
+
+    def nearest(self, queries, chunk_size=None):
+        """returns the nearest points on the spline and their arc length fractions for a batch of query points
+        queries are processed in chunks such that the intermediate arrays stay bounded"""
+        queries = np.atleast_2d(np.asarray(queries, dtype=float))
+        if chunk_size is None:
+            chunk_size = max(2 ** 20 // max(len(self.edge_starts), 1), 1)
+        edge_origins = self.points[self.edge_starts]
+        edge_vectors = self.points[self.edge_starts + 1] - edge_origins
+        edge_lengths_squared = np.maximum(
+            np.einsum("ij,ij->i", edge_vectors, edge_vectors), 1e-12)
+        nearest_points = np.empty_like(queries)
+        nearest_distances = np.empty(len(queries))
+        for start in range(0, len(queries), chunk_size):
+            chunk = queries[start:start + chunk_size]
+            # project every query onto every edge
+            offsets = chunk[:, None, :] - edge_origins[None, :, :]
+            weights = np.clip(np.einsum("ijk,jk->ij", offsets, edge_vectors) /
+                              edge_lengths_squared, 0, 1)
+            projections = edge_origins[None, :, :] + \
+                weights[:, :, None] * edge_vectors[None, :, :]
+            distances_squared = np.einsum(
+                "ijk,ijk->ij", chunk[:, None, :] - projections, chunk[:, None, :] - projections)
+            best_edges = np.argmin(distances_squared, axis=1)
+            rows = np.arange(len(chunk))
+            nearest_points[start:start + chunk_size] = projections[rows, best_edges]
+            edge_indices = self.edge_starts[best_edges]
+            nearest_distances[start:start + chunk_size] = self.lengths[edge_indices] + weights[rows, best_edges] * (
+                self.lengths[edge_indices + 1] - self.lengths[edge_indices])
+        fractions = nearest_distances / self.length if self.length else np.zeros(len(queries))
+        return nearest_points, fractions
@@ -0,0 +1,216 @@
+import numpy as np
+
+
+class SpatialIndex:
+    """kd-tree over a set of positions used for neighbour queries
+    nodes are split at the median of their widest axis until they hold at most leaf_size positions,
+    so the tree adapts to the density of the positions and clusters or outliers do not degrade queries
+    the tree is built level by level and all queries descend it for every query at once"""
+
+    def __init__(self, positions, leaf_size=16):
+        self.positions = np.asarray(positions, dtype=float).reshape(-1, 3)
+        self.count = len(self.positions)
+        self.leaf_size = max(leaf_size, 1)
+        self.build()
+
+    def __repr__(self):
+        return f"SpatialIndex: {self.count} positions in {len(self.starts)} nodes"
+
+    def build(self):
+        """builds the nodes as ranges of the position order with their children and bounding boxes"""
+        # the positions of every node are the range [start, stop) of the order
+        self.order = np.arange(self.count)
+        starts, stops, parents = [0], [self.count], [-1]
+        lefts, rights = [-1], [-1]
+        levels = [np.array([0])]
+        while True:
+            nodes = levels[-1]
+            sizes = np.array(stops)[nodes] - np.array(starts)[nodes]
+            splitting = nodes[sizes > self.leaf_size]
+            if not len(splitting):
+                break
+            node_starts = np.array(starts)[splitting]
+            node_stops = np.array(stops)[splitting]
+            sizes = node_stops - node_starts
+            # the positions of the splitting nodes and the node every position belongs to
+            members = np.repeat(node_starts, sizes) + np.arange(sizes.sum()) - \
+                np.repeat(np.cumsum(sizes) - sizes, sizes)
+            member_nodes = np.repeat(np.arange(len(splitting)), sizes)
+            member_positions = self.positions[self.order[members]]
+            # split along the widest axis of every node
+            minima = np.minimum.reduceat(member_positions, np.cumsum(sizes) - sizes)
+            maxima = np.maximum.reduceat(member_positions, np.cumsum(sizes) - sizes)
+            axes = np.argmax(maxima - minima, axis=1)
+            coordinates = member_positions[np.arange(len(members)), axes[member_nodes]]
+            self.order[members] = self.order[members][np.lexsort((coordinates, member_nodes))]
+            # children are created in position order so node ranges stay sorted by id
+            middles = (node_starts + node_stops) // 2
+            children = []
+            for node, start, middle, stop in zip(splitting.tolist(), node_starts.tolist(), middles.tolist(), node_stops.tolist()):
+                lefts[node], rights[node] = len(starts), len(starts) + 1
+                starts += [start, middle]
+                stops += [middle, stop]
+                parents += [node, node]
+                lefts += [-1, -1]
+                rights += [-1, -1]
+                children += [lefts[node], rights[node]]
+            levels.append(np.array(children))
+        self.starts, self.stops = np.array(starts), np.array(stops)
+        self.parents = np.array(parents)
+        self.lefts, self.rights = np.array(lefts), np.array(rights)
+        self.compute_bounding_boxes(levels)
+
+    def compute_bounding_boxes(self, levels):
+        """computes the bounding boxes of the leaves from their positions and of the other nodes bottom up"""
+        self.minima = np.full((len(self.starts), 3), np.inf)
+        self.maxima = np.full((len(self.starts), 3), -np.inf)
+        leaves = np.flatnonzero((self.lefts < 0) & (self.stops > self.starts))
+        if len(leaves):
+            # reduceat reduces up to the next start so the leaves have to be given in position order
+            leaves = leaves[np.argsort(self.starts[leaves])]
+            leaf_positions = self.positions[self.order]
+            self.minima[leaves] = np.minimum.reduceat(leaf_positions, self.starts[leaves])
+            self.maxima[leaves] = np.maximum.reduceat(leaf_positions, self.starts[leaves])
+        for nodes in reversed(levels):
+            inner = nodes[self.lefts[nodes] >= 0]
+            self.minima[inner] = np.minimum(self.minima[self.lefts[inner]], self.minima[self.rights[inner]])
+            self.maxima[inner] = np.maximum(self.maxima[self.lefts[inner]], self.maxima[self.rights[inner]])
+
+    def expand(self, nodes):
+        """returns the positions of the nodes and the index of the node every position belongs to"""
+        sizes = self.stops[nodes] - self.starts[nodes]
+        offsets = np.arange(sizes.sum()) - np.repeat(np.cumsum(sizes) - sizes, sizes)
+        return self.order[np.repeat(self.starts[nodes], sizes) + offsets], np.repeat(np.arange(len(nodes)), sizes)
+
+    def pairs_within(self, queries, radius):
+        """returns all pairs (query index, position index) with distance at most radius and their distances
+        the radius is given for all queries or per query"""
+        queries = np.asarray(queries, dtype=float).reshape(-1, 3)
+        radii = np.broadcast_to(np.asarray(radius, dtype=float), len(queries))
+        empty = np.zeros(0, dtype=np.int64)
+        if not self.count or not len(queries):
+            return empty, empty, np.zeros(0)
+        # descend the tree for all queries at once keeping the nodes whose box is within the radius
+        frontier_queries = np.arange(len(queries))
+        frontier_nodes = np.zeros(len(queries), dtype=np.int64)
+        query_indices, position_indices = [], []
+        # the boxes are pruned with some slack so positions at exactly the radius are not lost to rounding
+        pruning_radii = radii * (1 + 1e-9)
+        while len(frontier_queries):
+            points = queries[frontier_queries]
+            gaps = np.maximum(np.maximum(self.minima[frontier_nodes] - points,
+                                         points - self.maxima[frontier_nodes]), 0)
+            near = np.einsum("ij,ij->i", gaps, gaps) <= pruning_radii[frontier_queries] ** 2
+            frontier_queries, frontier_nodes = frontier_queries[near], frontier_nodes[near]
+            leaf = self.lefts[frontier_nodes] < 0
+            positions, pair_indices = self.expand(frontier_nodes[leaf])
+            query_indices.append(frontier_queries[leaf][pair_indices])
+            position_indices.append(positions)
+            frontier_queries = np.repeat(frontier_queries[~leaf], 2)
+            frontier_nodes = np.column_stack([self.lefts[frontier_nodes[~leaf]],
+                                              self.rights[frontier_nodes[~leaf]]]).ravel()
+        query_indices = np.concatenate(query_indices)
+        position_indices = np.concatenate(position_indices)
+        distances = np.linalg.norm(
+            queries[query_indices] - self.positions[position_indices], axis=1)
+        within = distances <= radii[query_indices]
+        return query_indices[within], position_indices[within], distances[within]
+
+    def radius_edges(self, radius):
+        """returns all edges (i, j) with i < j between positions at most radius apart"""
+        sources, targets, _ = self.pairs_within(self.positions, radius)
+        forward = sources < targets
+        return np.column_stack([sources[forward], targets[forward]])
+
+    @staticmethod
+    def first_per_group(groups, values, count):
+        """returns the mask of the count smallest values per group and their ranks, groups are sorted afterwards"""
+        order = np.lexsort((values, groups))
+        groups = groups[order]
+        ranks = np.arange(len(groups)) - np.searchsorted(groups, groups)
+        return order, ranks < count, ranks
+
+    def get_knn_radii(self, k):
+        """returns radii holding at least k other positions around every position
+        taken from the smallest node around the position that holds twice as many positions,
+        the k nearest of more positions give a tighter radius which prunes more nodes in the query"""
+        leaves = np.empty(self.count, dtype=np.int64)
+        leaf_nodes = np.flatnonzero(self.lefts < 0)
+        leaf_positions, leaf_indices = self.expand(leaf_nodes)
+        leaves[leaf_positions] = leaf_nodes[leaf_indices]
+        nodes = leaves
+        while True:
+            small = ((self.stops[nodes] - self.starts[nodes]) < 2 * (k + 1)) & (self.parents[nodes] >= 0)
+            if not small.any():
+                break
+            nodes = np.where(small, self.parents[nodes], nodes)
+        # distances to the positions of the node, the own position is the nearest at distance zero
+        unique_nodes, node_indices = np.unique(nodes, return_inverse=True)
+        node_positions, _ = self.expand(unique_nodes)
+        sizes = self.stops[unique_nodes] - self.starts[unique_nodes]
+        node_starts = np.cumsum(sizes) - sizes
+        query_sizes = sizes[node_indices]
+        sources = np.repeat(np.arange(self.count), query_sizes)
+        targets = node_positions[np.repeat(node_starts[node_indices], query_sizes) +
+                                 np.arange(query_sizes.sum()) - np.repeat(np.cumsum(query_sizes) - query_sizes, query_sizes)]
+        distances = np.linalg.norm(self.positions[sources] - self.positions[targets], axis=1)
+        order, _, ranks = self.first_per_group(sources, distances, k + 1)
+        radii = np.empty(self.count)
+        kth = ranks == k
+        radii[sources[order][kth]] = distances[order][kth]
+        return radii
+
+    def knn(self, k):
+        """returns the indices and distances of the k nearest neighbours of every position, self excluded"""
+        k = min(k, self.count - 1)
+        neighbours = np.zeros((self.count, max(k, 0)), dtype=np.int64)
+        distances = np.zeros((self.count, max(k, 0)))
+        if k <= 0:
+            return neighbours, distances
+        # every radius holds k other positions so the k nearest lie within it
+        radii = self.get_knn_radii(k)
+        sources, targets, pair_distances = self.pairs_within(self.positions, radii)
+        distinct = sources != targets
+        sources, targets, pair_distances = sources[distinct], targets[distinct], pair_distances[distinct]
+        order, first_k, ranks = self.first_per_group(sources, pair_distances, k)
+        rows = sources[order][first_k]
+        neighbours[rows, ranks[first_k]] = targets[order][first_k]
+        distances[rows, ranks[first_k]] = pair_distances[order][first_k]
+        return neighbours, distances
+
+    def knn_edges(self, k):
+        """returns the undirected edges connecting every position to its k nearest neighbours"""
+        neighbours, _ = self.knn(k)
+        sources = np.repeat(np.arange(self.count), neighbours.shape[1])
+        return self.unique_edges(sources, neighbours.ravel())
+
+    def gabriel_edges(self, k=12, chunk_size=None):
+        """returns the gabriel graph restricted to the k nearest neighbours, a subgraph of the delaunay triangulation
+        an edge (i, j) is kept if no other position lies inside the sphere with diameter ij"""
+        neighbours, distances = self.knn(k)
+        if not neighbours.size:
+            return np.zeros((0, 2), dtype=np.int64)
+        k = neighbours.shape[1]
+        if chunk_size is None:
+            chunk_size = max(2 ** 20 // (k * k), 1)
+        # positions inside the sphere are closer to i than j so they are preceding neighbours of i
+        preceding = np.tri(k, k=-1, dtype=bool).T
+        blocked = np.empty(neighbours.shape, dtype=bool)
+        for start in range(0, self.count, chunk_size):
+            stop = min(start + chunk_size, self.count)
+            neighbour_positions = self.positions[neighbours[start:stop]]
+            centers = (self.positions[start:stop, None, :] + neighbour_positions) / 2
+            # offsets[i, a, b]: distance of neighbour a to the center of the edge to neighbour b
+            offsets = np.linalg.norm(
+                neighbour_positions[:, :, None, :] - centers[:, None, :, :], axis=3)
+            inside = offsets < distances[start:stop, None, :] / 2
+            blocked[start:stop] = np.any(inside & preceding[None, :, :], axis=1)
+        sources = np.repeat(np.arange(self.count), k)
+        free = ~blocked.ravel()
+        return self.unique_edges(sources[free], neighbours.ravel()[free])
+
+    @staticmethod
+    def unique_edges(sources, targets):
+        """returns the sorted unique undirected edges of the given pairs"""
+        edges = np.sort(np.column_stack([sources, targets]), axis=1)
+        return np.unique(edges, axis=0)
@@ -1,21 +1,184 @@
 """
 this file is used to simplify importing the necessary modules for video scripting
-this way we just have to include "from pydeation.imports import *" in our scripts
+
+the recommended entry point is "import pydeation.imports as pd" followed by e.g. "pd.Circle":
+the namespace is resolved lazily so only the submodules binding the accessed names are imported
+"from pydeation.imports import *" keeps working but binds every name and therefore imports all submodules,
+it binds exactly the names of the former star imports listed in __all__, names added since like pd.Stagger
+are reached as attributes or imported from their modules
 """
 
-from pydeation.scene import *
-from pydeation.animation.animation import *
-from pydeation.animation.object_animators import *
-from pydeation.animation.sketch_animators import *
-from pydeation.animation.fill_animators import *
-from pydeation.animation.transition_animators import *
-from pydeation.animation.composed_animators import *
-from pydeation.objects.helper_objects import *
-from pydeation.objects.custom_objects import *
-from pydeation.objects.line_objects import *
-from pydeation.objects.solid_objects import *
-from pydeation.objects.sketch_objects import *
-from pydeation.constants import *
-from pydeation.xpresso.xpresso import *
-from pydeation.xpresso.xpressions import *
-from pydeation.xpresso.userdata import *
+import importlib
+import ast
+import os
+
+# later modules take precedence like in the star imports they replace
+MODULES = [
+    "pydeation.scene",
+    "pydeation.animation.animation",
+    "pydeation.animation.object_animators",
+    "pydeation.animation.sketch_animators",
+    "pydeation.animation.fill_animators",
+    "pydeation.animation.transition_animators",
+    "pydeation.animation.composed_animators",
+    "pydeation.objects.helper_objects",
+    "pydeation.objects.custom_objects",
+    "pydeation.objects.line_objects",
+    "pydeation.objects.solid_objects",
+    "pydeation.objects.sketch_objects",
+    "pydeation.constants",
+    "pydeation.xpresso.xpresso",
+    "pydeation.xpresso.xpressions",
+    "pydeation.xpresso.userdata",
+]
+
+# the names bound by the former star imports of the modules
+__all__ = [
+    # pydeation.animation.abstract_animators
+    "ComposedAnimator", "ComposedXAnimator", "FillAnimator", "ObjectAnimator", "ProtoAnimator",
+    "SketchAnimator",
+    # pydeation.animation.animation
+    "Animation", "AnimationGroup", "CompletionAnimation", "KeyFrame", "StateAnimation",
+    "VectorAnimation",
+    # pydeation.animation.composed_animators
+    "ChangeFillColor", "ChangeFillColorGB", "DrawThenFill", "SuperChangeFillColorB",
+    "SuperChangeFillColorG", "Transform",
+    # pydeation.animation.fill_animators
+    "ChangeFillColorB", "ChangeFillColorG", "ChangeFillColorR", "Fill", "Pulse", "UnFill",
+    # pydeation.animation.object_animators
+    "Hide", "Move", "Rotate", "Scale", "SetVisibility", "Show",
+    # pydeation.animation.sketch_animators
+    "Draw", "UnDraw",
+    # pydeation.animation.transition_animators
+    "Morph", "TransitionAnimator",
+    # pydeation.constants
+    "BLACK", "BLUE", "BOOL_DESCID_IN", "BOOL_DESCID_OUT", "COLOR_DESCID_IN", "COLOR_DESCID_OUT",
+    "CONDITION_DESCID_IN", "CONDITION_SWITCH_DESCID_IN", "FILLER_TRANSPARENCY", "GREEN",
+    "INTEGER_DESCID_IN", "INTEGER_DESCID_OUT", "OBJECT_DESCID_OUT", "PI", "POS", "POS_X", "POS_Y",
+    "POS_Z", "PRIM_THICKNESS", "PURPLE", "REAL_DESCID_IN", "REAL_DESCID_OUT", "RED", "ROT_B",
+    "ROT_H", "ROT_P", "SCALE_X", "SCALE_Y", "SCALE_Z", "SPLINE_THICKNESS", "STRING_DESCID_IN",
+    "STRING_DESCID_OUT", "SVG_PATH", "TEXT_THICKNESS", "VALUE_DESCID_IN", "VG_THICKNESS", "WHITE",
+    "YELLOW",
+    # pydeation.objects.abstract_objects
+    "CustomObject", "LineObject", "ProtoObject", "SolidObject",
+    # pydeation.objects.custom_objects
+    "Connection", "DiaLogosNode", "Eye", "FootPath", "Group", "MonoLogosNode", "Node",
+    "PhysicalCampfire", "ProjectLiminality",
+    # pydeation.objects.helper_objects
+    "Cloner", "Effector", "LinearField", "MoSpline", "Null", "PlainEffector", "RandomEffector",
+    "SphericalField", "SplineEffector",
+    # pydeation.objects.line_objects
+    "Arc", "Arrow", "Circle", "Line", "PySpline", "Rectangle", "SVG", "Spline", "Text", "Tracer",
+    # pydeation.objects.sketch_objects
+    "DNA", "David", "Fire", "Footprint", "GitHub", "Human", "Sketch",
+    # pydeation.objects.solid_objects
+    "Cylinder", "Sphere",
+    # pydeation.scene
+    "RenderSettings", "Scene",
+    # pydeation.tags
+    "XPressoTag",
+    # pydeation.utils
+    "average_color", "match_indices",
+    # pydeation.xpresso.userdata
+    "UAngle", "UBool", "UCheckBox", "UColor", "UCompletion", "UCount", "UData", "UGroup", "UInt",
+    "ULength", "UOptions", "UParameter", "UReal", "UStrength", "UString", "UText",
+    # pydeation.xpresso.xpressions
+    "CustomXPression", "XAccessControl", "XActiveRange", "XAlignToSpline", "XAnimation",
+    "XAnimator", "XClosestPointOnSpline", "XComposer", "XComposition", "XFreezer", "XIdentity",
+    "XInterpolator", "XNotDescending", "XOverrideController", "XPression", "XRelation",
+    "XScaleBetweenPoints", "XSplineLength",
+    # pydeation.xpresso.xpresso
+    "XBool", "XCompare", "XCondition", "XConditionSwitch", "XConstant", "XDelta", "XDistance",
+    "XFormula", "XFreeze", "XGroup", "XInvert", "XMath", "XMatrix2HPB", "XMatrixMulVector",
+    "XMemory", "XMix", "XNearestPointOnSpline", "XNode", "XObject", "XPython", "XRangeMapper",
+    "XReals2Vec", "XSpline", "XVec2Reals", "XVect2Matrix",
+    # imported by the submodules from other packages
+    "ABC", "FieldLayer", "abstractmethod", "c4d", "defaultdict", "np", "os", "random",
+]
+
+PACKAGE_PATH = os.path.dirname(os.path.abspath(__file__))
+
+_origins = None  # maps names to (module, attribute) with the last module binding them taking precedence
+_module_origins = {}  # origins of the public names bound by a submodule by module name
+
+
+def get_module_path(module_name):
+    """returns the file path of a pydeation submodule"""
+    return os.path.join(PACKAGE_PATH, *module_name.split(".")[1:]) + ".py"
+
+
+def iterate_statements(body):
+    """yields the top level statements including those nested in if and try blocks"""
+    for node in body:
+        yield node
+        if isinstance(node, (ast.If, ast.Try)):
+            nested = node.body + node.orelse + getattr(node, "finalbody", [])
+            nested += [statement for handler in getattr(node, "handlers", []) for statement in handler.body]
+            yield from iterate_statements(nested)
+
+
+def find_origins(module_name):
+    """returns the public names a star import of a submodule binds without importing it
+    mapped to the module and attribute they originate from, an attribute of None stands for the module itself
+    imports from other submodules are followed so accessing a name imports the module defining it"""
+    if module_name in _module_origins:
+        return _module_origins[module_name]
+    _module_origins[module_name] = {}  # guards against circular star imports
+    with open(get_module_path(module_name)) as module_file:
+        tree = ast.parse(module_file.read())
+    origins = {}
+    for node in iterate_statements(tree.body):
+        if isinstance(node, (ast.ClassDef, ast.FunctionDef)):
+            origins[node.name] = (module_name, node.name)
+        elif isinstance(node, ast.Assign):
+            origins.update((target.id, (module_name, target.id))
+                           for target in node.targets if isinstance(target, ast.Name))
+        elif isinstance(node, ast.Import):
+            for alias in node.names:
+                if alias.asname:
+                    origins[alias.asname] = (alias.name, None)
+                else:
+                    origins[alias.name.split(".")[0]] = (alias.name.split(".")[0], None)
+        elif isinstance(node, ast.ImportFrom):
+            internal = node.level == 0 and node.module.startswith("pydeation.")
+            for alias in node.names:
+                if alias.name == "*":
+                    if internal:
+                        origins.update(find_origins(node.module))
+                elif node.level:
+                    origins[alias.asname or alias.name] = (module_name, alias.asname or alias.name)
+                elif internal:
+                    origins[alias.asname or alias.name] = find_origins(node.module).get(
+                        alias.name, (node.module, alias.name))
+                else:
+                    origins[alias.asname or alias.name] = (node.module, alias.name)
+    origins = {name: origin for name, origin in origins.items() if not name.startswith("_")}
+    _module_origins[module_name] = origins
+    return origins
+
+
+def get_origins():
+    """indexes the names bound by the submodules once, later modules take precedence"""
+    global _origins
+    if _origins is None:
+        _origins = {}
+        for module_name in MODULES:
+            _origins.update(find_origins(module_name))
+    return _origins
+
+
+def __getattr__(name):
+    """resolves names on first access and caches them in the module namespace"""
+    if name not in get_origins():
+        raise AttributeError(
+            f"module {__name__!r} has no attribute {name!r}")
+    module_name, attribute = get_origins()[name]
+    value = importlib.import_module(module_name)
+    if attribute is not None:
+        value = getattr(value, attribute)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(get_origins()))
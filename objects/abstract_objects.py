@@ -5,13 +5,24 @@ from pydeation.animation.object_animators import Show, Hide
 from pydeation.animation.sketch_animators import Draw
 from pydeation.xpresso.userdata import UGroup, ULength, UCheckBox
 from pydeation.xpresso.xpressions import XRelation, XIdentity, XSplineLength
+from pydeation.geometry.sampling import SplineSampler
+from pydeation.geometry.bounds import box_from_center, transform_box, union_boxes
+from pydeation.utils import matrix_to_array
 from abc import ABC, abstractmethod
+import numpy as np
 import c4d
 
 
 class ProtoObject(ABC):
 
+    registry = None  # collects the objects of the scene under construction, set by the scene
+
     def __init__(self, name=None, x=0, y=0, z=0, h=0, p=0, b=0, scale=1, scale_x=1, scale_y=1, scale_z=1):
+        if ProtoObject.registry is not None:
+            ProtoObject.registry.append(self)
+        self.parent = None  # parent in the bounding box tree
+        self.hierarchy_children = []  # children in the bounding box tree
+        self.bounding_box = None  # cached local bounding box
         self.document = c4d.documents.GetActiveDocument()  # get document
         self.specify_object()
         self.set_unique_desc_ids()
@@ -48,16 +59,19 @@ class ProtoObject(ABC):
         if position is None:
             position = c4d.Vector(x, y, z)
         self.obj[c4d.ID_BASEOBJECT_POSITION] = position
+        self.invalidate_bounding_box(geometry=False)
 
     def set_rotation(self, h=0, p=0, b=0, rotation=None):
         if rotation is None:
             rotation = c4d.Vector(h, p, b)
         self.obj[c4d.ID_BASEOBJECT_ROTATION] = rotation
+        self.invalidate_bounding_box(geometry=False)
 
     def set_frozen_rotation(self, h=0, p=0, b=0, rotation=None):
         if rotation is None:
             rotation = c4d.Vector(h, p, b)
         self.obj[c4d.ID_BASEOBJECT_FROZEN_ROTATION] = rotation
+        self.invalidate_bounding_box(geometry=False)
 
     def set_scale(self, uniform_scale=1, x=1, y=1, z=1):
         if x != 1 or y != 1 or z != 1:
@@ -65,6 +79,7 @@ class ProtoObject(ABC):
         else:
             scale = c4d.Vector(uniform_scale, uniform_scale, uniform_scale)
         self.obj[c4d.ID_BASEOBJECT_SCALE] = scale
+        self.invalidate_bounding_box(geometry=False)
 
     def move(self, x=None, y=None, z=None):
         if x is not None:
@@ -73,6 +88,7 @@ class ProtoObject(ABC):
             self.obj[c4d.ID_BASEOBJECT_POSITION, c4d.VECTOR_Y] += y
         if z is not None:
             self.obj[c4d.ID_BASEOBJECT_POSITION, c4d.VECTOR_Z] += z
+        self.invalidate_bounding_box(geometry=False)
 
     def rotate(self, h=None, p=None, b=None):
         if h is not None:
@@ -81,6 +97,7 @@ class ProtoObject(ABC):
             self.obj[c4d.ID_BASEOBJECT_ROTATION, c4d.VECTOR_Y] += p
         if b is not None:
             self.obj[c4d.ID_BASEOBJECT_ROTATION, c4d.VECTOR_Z] += b
+        self.invalidate_bounding_box(geometry=False)
 
     def scale(self, uniform_scale=None, x=None, y=None, z=None):
         if x is not None:
@@ -92,6 +109,50 @@ class ProtoObject(ABC):
         if uniform_scale is not None:
             scale = c4d.Vector(uniform_scale, uniform_scale, uniform_scale)
         self.obj[c4d.ID_BASEOBJECT_SCALE] = scale
+        self.invalidate_bounding_box(geometry=False)
+
+    def set_parent(self, parent):
+        """registers the object as child of parent in the bounding box tree"""
+        if self.parent is not None:
+            self.parent.hierarchy_children.remove(self)
+            self.parent.invalidate_bounding_box()
+        self.parent = parent
+        parent.hierarchy_children.append(self)
+        parent.invalidate_bounding_box()
+
+    def invalidate_bounding_box(self, geometry=True):
+        """discards the cached bounding boxes affected by a change of the object
+        transform changes only affect the ancestors while geometry changes also affect the object itself"""
+        if geometry:
+            self.bounding_box = None
+        node = self.parent
+        # a cached box implies cached boxes for the whole subtree so we can stop at the first invalid ancestor
+        while node is not None and node.bounding_box is not None:
+            node.bounding_box = None
+            node = node.parent
+
+    def get_bounding_box(self):
+        """returns the bounding box of the object and its children in the bounding box tree
+        in local coordinates as minimum and maximum, unchanged subtrees are read from the cache"""
+        dirty_count = self.obj.GetDirty(
+            c4d.DIRTYFLAGS_DATA | c4d.DIRTYFLAGS_MATRIX | c4d.DIRTYFLAGS_CACHE)
+        if self.bounding_box is not None:
+            if dirty_count == self.bounding_box_dirty_count:
+                return self.bounding_box
+            # the object was changed directly through c4d
+            self.invalidate_bounding_box()
+        boxes = []
+        center, radius = self.obj.GetMp(), self.obj.GetRad()
+        # objects without own geometry like nulls are only bounded by their children
+        if not self.hierarchy_children or radius != c4d.Vector(0):
+            boxes.append(box_from_center(
+                [center.x, center.y, center.z], [radius.x, radius.y, radius.z]))
+        for child in self.hierarchy_children:
+            boxes.append(transform_box(*child.get_bounding_box(),
+                                       matrix_to_array(child.obj.GetMl())))
+        self.bounding_box = union_boxes(boxes)
+        self.bounding_box_dirty_count = dirty_count
+        return self.bounding_box
 
     def insert_to_document(self):
         self.document.InsertObject(self.obj)
@@ -142,7 +203,7 @@ class VisibleObject(ProtoObject):  # visible objects
             name=self.name, filling=filling, color=fill_color)
 
     def set_fill_tag(self):
-        self.fill_tag = FillTag(target=self, material=self.fill_material)
+        self.fill_tag = FillTag(target=self, material=self.fill_material, role="fill")
 
     def set_xpresso_tags(self):
         """initializes the necessary xpresso tags on the object"""
@@ -157,7 +218,7 @@ class VisibleObject(ProtoObject):  # visible objects
         self.freeze_tag = XPressoTag(
             target=self, name="FreezeTag", priority=0, priority_mode="animation")
         # inserts an xpresso tag used for custom xpressions
-        self.custom_tag = XPressoTag(target=self, name="CustomTag")
+        self.custom_tag = XPressoTag(target=self, name="CustomTag", role="custom")
 
     def add_composition_tag(self):
         """adds another layer to the composition hierarchy"""
@@ -165,7 +226,7 @@ class VisibleObject(ProtoObject):  # visible objects
         tag_name = "CompositionTag" + str(len(self.composition_tags))
         tag_priority = -len(self.composition_tags)
         composition_tag = XPressoTag(
-            target=self, name=tag_name, priority=tag_priority, priority_mode="initial")
+            target=self, name=tag_name, role="composition", priority=tag_priority, priority_mode="initial")
         self.composition_tags.append(composition_tag)
         return composition_tag.obj
 
@@ -184,25 +245,21 @@ class VisibleObject(ProtoObject):  # visible objects
 
     def attach_to(self, target, direction="front", offset=0):
         """places the object such that the bounding boxes touch along a given direction and makes object child of target"""
-        bounding_box = self.obj.GetRad()
-        bounding_box_position = self.obj.GetMp()
-        bounding_box_target = target.obj.GetRad()
-        bounding_box_position_target = target.obj.GetMp()
-        new_position = bounding_box_position_target - bounding_box_position
-        if direction == "top":
-            new_position.y += bounding_box_target.y + bounding_box.y + offset
-        if direction == "bottom":
-            new_position.y -= bounding_box_target.y + bounding_box.y + offset
-        if direction == "left":
-            new_position.x -= bounding_box_target.x + bounding_box.x + offset
-        if direction == "right":
-            new_position.x += bounding_box_target.x + bounding_box.x + offset
-        if direction == "front":
-            new_position.z -= bounding_box_target.z + bounding_box.z + offset
-        if direction == "back":
-            new_position.z += bounding_box_target.z + bounding_box.z + offset
+        minimum, maximum = self.get_bounding_box()
+        target_minimum, target_maximum = target.get_bounding_box()
+        bounding_box = (maximum - minimum) / 2
+        bounding_box_target = (target_maximum - target_minimum) / 2
+        new_position = (target_minimum + target_maximum) / 2 - \
+            (minimum + maximum) / 2
+        # axis and sign of the displacement
+        directions = {"top": (1, 1), "bottom": (1, -1), "left": (0, -1),
+                      "right": (0, 1), "front": (2, -1), "back": (2, 1)}
+        axis, sign = directions[direction]
+        new_position[axis] += sign * \
+            (bounding_box_target[axis] + bounding_box[axis] + offset)
         self.obj.InsertUnder(target.obj)
-        self.set_position(position=new_position)
+        self.set_parent(target)
+        self.set_position(position=c4d.Vector(*new_position))
 
     def specify_visibility_parameter(self):
         """specifies visibility parameter"""
@@ -224,6 +281,7 @@ class LineObject(VisibleObject):  # line objects only require sketch material
 
     def __init__(self, color=WHITE, plane="xy", fill_color=None, solid=False, arrow_start=False, arrow_end=False, **kwargs):
         self.plane = plane
+        self.sampler = None  # arc length sampler, created on demand
         super().__init__(**kwargs)
         self.set_plane()
         if solid or fill_color is not None:
@@ -257,6 +315,52 @@ class LineObject(VisibleObject):  # line objects only require sketch material
         self.spline_length_relation = XSplineLength(
             spline=self, whole=self, parameter=self.spline_length_parameter)
 
+    def get_real_spline(self):
+        """returns the spline representation of the object without inserting anything into the document"""
+        real_spline = self.obj.GetRealSpline()
+        if real_spline is None:
+            # generators like the tracer have to be converted from their current state
+            real_spline = c4d.utils.SendModelingCommand(command=c4d.MCOMMAND_CURRENTSTATETOOBJECT, list=[
+                self.obj], mode=c4d.MODELINGCOMMANDMODE_ALL, doc=self.document)[0]
+            if not real_spline.CheckType(c4d.Ospline):
+                real_spline = real_spline.GetDown()
+        return real_spline
+
+    def create_sampler(self):
+        """samples the interpolated segments of the spline into an arc length lookup table"""
+        real_spline = self.get_real_spline()
+        line = real_spline.GetLineObject(self.document, 1.0)
+        points = np.array([[point.x, point.y, point.z]
+                           for point in line.GetAllPoints()], dtype=float).reshape(-1, 3)
+        segment_count = line.GetSegmentCount()
+        if segment_count == 0:
+            segments = [points]
+            closed = [real_spline.IsClosed()]
+        else:
+            segment_infos = [line.GetSegment(i) for i in range(segment_count)]
+            split_indices = np.cumsum([segment_info["cnt"]
+                                       for segment_info in segment_infos])[:-1]
+            segments = np.split(points, split_indices)
+            closed = [segment_info["closed"] for segment_info in segment_infos]
+        return SplineSampler(segments, closed=closed)
+
+    def get_sampler(self):
+        """returns the arc length sampler of the spline, cached until the spline's data or cache changes"""
+        dirty_count = self.obj.GetDirty(
+            c4d.DIRTYFLAGS_DATA | c4d.DIRTYFLAGS_CACHE)
+        if self.sampler is None or self.sampler_dirty_count != dirty_count:
+            self.sampler = self.create_sampler()
+            self.sampler_dirty_count = dirty_count
+        return self.sampler
+
+    def get_spline_length(self):
+        """returns the length of the spline analogous to the XSplineLength relation but without xpresso"""
+        return self.get_sampler().length
+
+    def get_segment_count(self):
+        """returns the number of segments of the spline, cached together with the sampler"""
+        return len(self.get_sampler().segments)
+
 
 class SolidObject(LineObject):  # solid objects also require fill material
 
@@ -307,6 +411,7 @@ class CustomObject(VisibleObject):
         """inserts the parts as children"""
         for part in self.parts:
             part.obj.InsertUnder(self.obj)
+            part.set_parent(self)
 
     def specify_object(self):
         self.obj = c4d.BaseObject(c4d.Onull)
@@ -335,11 +440,8 @@ class CustomObject(VisibleObject):
                 visibility_relations.append(visibility_relation)
 
     def add_bounding_box_information(self):
-        bounding_box_center, bounding_radius = c4d.utils.GetBBox(
-            self.obj, self.obj.GetMg())
-        self.width = bounding_radius.x * 2
-        self.height = bounding_radius.y * 2
-        self.depth = bounding_radius.z * 2
+        minimum, maximum = self.get_bounding_box()
+        self.width, self.height, self.depth = (maximum - minimum).tolist()
 
     def specify_bounding_box_parameters(self):
         """specifies bounding box parameters"""
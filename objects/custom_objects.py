@@ -1,6 +1,6 @@
 from abc import abstractmethod
 from pydeation.objects.abstract_objects import CustomObject
-from pydeation.objects.line_objects import Line, Arc, Circle, Rectangle, Text, Tracer, Spline
+from pydeation.objects.line_objects import Line, Arc, Circle, Rectangle, Text, Tracer, Spline, ConnectionNetwork
 from pydeation.objects.sketch_objects import Human, Fire, Footprint
 from pydeation.objects.helper_objects import *
 from pydeation.xpresso.userdata import UAngle, UGroup, ULength, UOptions, UCompletion, UText
@@ -8,6 +8,9 @@ from pydeation.xpresso.xpressions import XRelation, XIdentity, XClosestPointOnSp
 from pydeation.animation.abstract_animators import AnimationGroup
 from pydeation.animation.sketch_animators import Draw, UnDraw
 from pydeation.tags import XPressoTag
+from pydeation.geometry.layout import circle_layout, line_layout, grid_layout, spiral_layout, force_directed_layout
+from pydeation.geometry.edges import sample_edges
+from pydeation.geometry.spatial import SpatialIndex
 from pydeation.constants import *
 import c4d
 
@@ -49,34 +52,38 @@ class Group(CustomObject):
         for child in children:
             self.children.append(child)
             child.obj.InsertUnder(self.obj)
+            child.set_parent(self)
+
+    def get_positions(self):
+        """returns the positions of the children as an array"""
+        vectors = [child.obj[c4d.ID_BASEOBJECT_POSITION]
+                   for child in self.children]
+        positions = np.array([[vector.x, vector.y, vector.z]
+                              for vector in vectors], dtype=float).reshape(-1, 3)
+        return positions
+
+    def set_positions(self, positions, children=None):
+        """writes an array of positions to the children
+        c4d has no batch setter for the matrices of many objects so every child still takes one SetRelPos call,
+        the cached bounding boxes are invalidated once for the whole group instead of once per child"""
+        if children is None:
+            children = self.children
+        for child, child_position in zip(children, np.asarray(positions, dtype=float).tolist()):
+            child.obj.SetRelPos(c4d.Vector(*child_position))
+        self.invalidate_bounding_box()
 
     def position_on_spline(self, spline):
-        """positions the children the given spline"""
-        number_of_children = len(self.children)
-        editable_spline = spline.get_editable()
-        for i, child in enumerate(self.children):
-            child_position = editable_spline.GetSplinePoint(
-                i / number_of_children)
-            child.set_position(position=child_position)
+        """positions the children evenly along the arc length of the given spline"""
+        child_positions = spline.get_sampler().sample_evenly(len(self.children))
+        self.set_positions(child_positions)
 
     def position_on_circle(self, radius=100, x=0, y=0, z=0, plane="xy", at_bottom=None, at_top=None):
         """positions the children on a circle"""
-        def position(radius, phi, plane):
-            if plane == "xy":
-                return c4d.Vector(radius * np.sin(phi), radius * np.cos(phi), 0)
-            if plane == "zy":
-                return c4d.Vector(0, radius * np.cos(phi), radius * np.sin(phi))
-            if plane == "xz":
-                return c4d.Vector(radius * np.sin(phi), 0, radius * np.cos(phi))
-
-        number_of_children = len(self.children)
         phi_offset = 0  # angle offset if necessary
         if at_bottom:
             phi_offset = np.pi
-        phis = [
-            phi + phi_offset for phi in np.linspace(0, 2 * np.pi, number_of_children + 1)]
-
-        child_positions = [position(radius, phi, plane) for phi in phis]
+        child_positions = circle_layout(len(self.children), radius=radius, center=(
+            x, y, z), plane=plane, phi_offset=phi_offset)
 
         children = self.children
         index = None
@@ -87,38 +94,77 @@ class Group(CustomObject):
         if index:
             # reorder children using index
             children = self.children[index:] + self.children[:index]
-        for child, child_position in zip(children, child_positions):
-            child.set_position(position=child_position)
+        self.set_positions(child_positions, children=children)
 
     def position_on_line(self, point_ini=(-100, 0, 0), point_fin=(100, 0, 0)):
         """positions the children on a line"""
-        number_of_children = len(self.children)
-        vector_ini = c4d.Vector(*point_ini)
-        vector_fin = c4d.Vector(*point_fin)
-        child_positions = [t * (vector_fin - vector_ini) +
-                           vector_ini for t in np.linspace(0, 1, number_of_children)]
-        for child, child_position in zip(self.children, child_positions):
-            child.set_position(position=child_position)
-
-    def create_connections(self, completeness=1, turbulence=False, deterministic=True, random_seed=420, visible=True):
+        child_positions = line_layout(
+            len(self.children), point_ini=point_ini, point_fin=point_fin)
+        self.set_positions(child_positions)
+
+    def position_on_grid(self, columns=None, spacing=100, x=0, y=0, z=0, plane="xy"):
+        """positions the children row by row on a grid"""
+        child_positions = grid_layout(len(self.children), columns=columns, spacing=spacing, center=(
+            x, y, z), plane=plane)
+        self.set_positions(child_positions)
+
+    def position_on_spiral(self, spacing=50, mode="fermat", turns=3, x=0, y=0, z=0, plane="xy"):
+        """positions the children on a spiral"""
+        child_positions = spiral_layout(len(self.children), spacing=spacing, mode=mode, turns=turns, center=(
+            x, y, z), plane=plane)
+        self.set_positions(child_positions)
+
+    def position_force_directed(self, edges, iterations=50, ideal_length=100, plane="xy", random_seed=420):
+        """relaxes the positions of the children as nodes of a graph given by index pairs"""
+        child_positions = force_directed_layout(self.get_positions(), edges, iterations=iterations,
+                                                ideal_length=ideal_length, plane=plane, random_seed=random_seed)
+        self.set_positions(child_positions)
+
+    def get_spatial_index(self):
+        """returns a spatial index over the current positions of the children"""
+        return SpatialIndex(self.get_positions())
+
+    def get_edges(self, mode="random", completeness=1, k=3, radius=100, deterministic=True, random_seed=420):
+        """returns index pairs of children to connect:
+            - random: random sample of all pairs with the given completeness
+            - knn: every child to its k nearest neighbours
+            - radius: all pairs at most radius apart
+            - gabriel: delaunay-style planar-like graph of neighbouring children"""
+        if mode == "random":
+            return sample_edges(len(self.children), completeness=completeness,
+                                random_seed=random_seed if deterministic else None)
+        spatial_index = self.get_spatial_index()
+        if mode == "knn":
+            return spatial_index.knn_edges(k)
+        elif mode == "radius":
+            return spatial_index.radius_edges(radius)
+        elif mode == "gabriel":
+            return spatial_index.gabriel_edges()
+        raise ValueError("mode must be 'random', 'knn', 'radius' or 'gabriel'")
+
+    def create_connections(self, completeness=1, turbulence=False, deterministic=True, random_seed=420, visible=True, edges=None, mode="random", k=3, radius=100):
+        """creates a connection object for every edge between the children"""
         nodes = self.children
-        all_edges = []
-        for i, start_node in enumerate(nodes):
-            for target_node in nodes[i:]:
-                edge = (start_node, target_node)
-                all_edges.append(edge)
-        if not deterministic:
-            random.seed(random_seed)
-        selected_edges = random.sample(
-            all_edges, round(len(all_edges) * completeness))
+        if edges is None:
+            edges = self.get_edges(mode=mode, completeness=completeness, k=k, radius=radius,
+                                   deterministic=deterministic, random_seed=random_seed)
         self.connections = []
-        for edge in selected_edges:
+        for i, j in np.asarray(edges, dtype=int).reshape(-1, 2).tolist():
             connection = Connection(
-                *edge, turbulence=turbulence, turbulence_vector=(40, 0, 0), visible=visible)
+                nodes[i], nodes[j], turbulence=turbulence, turbulence_vector=(40, 0, 0), visible=visible)
             self.connections.append(connection)
 
         return self.connections
 
+    def create_connection_network(self, completeness=1, deterministic=True, random_seed=420, edges=None, mode="random", k=3, radius=100, **kwargs):
+        """creates a single spline holding all edges between the children as segments"""
+        if edges is None:
+            edges = self.get_edges(mode=mode, completeness=completeness, k=k, radius=radius,
+                                   deterministic=deterministic, random_seed=random_seed)
+        self.connection_network = ConnectionNetwork(
+            self.children, edges, name="ConnectionNetwork", **kwargs)
+        return self.connection_network
+
 
 class Eye(CustomObject):
 
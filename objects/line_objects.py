@@ -1,6 +1,10 @@
 from pydeation.objects.abstract_objects import LineObject
 from pydeation.objects.helper_objects import Null
+from pydeation.geometry.sampling import transform_points
+from pydeation.geometry.decimation import MinMaxDecimator, simplify_polyline
+from pydeation.utils import matrix_to_array
 from pydeation.constants import *
+import numpy as np
 import c4d
 import os
 
@@ -170,10 +174,14 @@ class Arrow(Line):
 
 
 class Spline(LineObject):
-    """creates a basic spline"""
+    """creates a basic spline
+    points are given as array of shape (N, 3) optionally with tangents, segment lengths and closures"""
 
-    def __init__(self, points=[], spline_type="bezier", **kwargs):
+    def __init__(self, points=[], spline_type="bezier", tangents=None, segments=None, closed=False, **kwargs):
         self.points = points
+        self.tangents = tangents
+        self.segments = segments
+        self.closed = closed
         self.spline_type = spline_type
         super().__init__(**kwargs)
         self.add_points_to_spline()
@@ -182,11 +190,58 @@ class Spline(LineObject):
         self.obj = c4d.BaseObject(c4d.Ospline)
 
     def add_points_to_spline(self):
-        if self.points:
-            c4d_points = [c4d.Vector(*point) for point in self.points]
-            point_count = len(self.points)
-            self.obj.ResizeObject(point_count)
-            self.obj.SetAllPoints(c4d_points)
+        if len(self.points):
+            self.set_points(self.points, tangents=self.tangents,
+                            segments=self.segments, closed=self.closed)
+
+    def set_points(self, points, tangents=None, segments=None, closed=False, chunk_size=2 ** 16):
+        """writes the points to the spline, the object is only resized if the point or segment count changed
+            - tangents: one tangent per point mirrored to both sides or pairs of left and right tangents
+            - segments: point counts of the segments
+            - closed: closes all segments or is given per segment"""
+        points = np.asarray(points, dtype=float).reshape(-1, 3)
+        point_count = len(points)
+        segments = np.asarray([] if segments is None else segments, dtype=int).ravel()
+        if len(segments) and segments.sum() != point_count:
+            raise ValueError("segment lengths must add up to the point count")
+        if self.obj.GetPointCount() != point_count or self.obj.GetSegmentCount() != len(segments):
+            self.obj.ResizeObject(point_count, len(segments))
+        if len(segments):
+            segment_closures = np.broadcast_to(
+                np.asarray(closed, dtype=bool), segments.shape).tolist()
+            for i, (segment_point_count, segment_closed) in enumerate(zip(segments.tolist(), segment_closures)):
+                self.obj.SetSegment(i, segment_point_count, segment_closed)
+        else:
+            self.obj[c4d.SPLINEOBJECT_CLOSED] = bool(closed)
+        self.update_points(points, tangents=tangents, chunk_size=chunk_size)
+
+    def update_points(self, points, tangents=None, start=0, chunk_size=2 ** 16):
+        """overwrites points in place starting at the given index without rebuilding the object
+        points and tangents are streamed in chunks so only chunk_size vectors exist at a time,
+        a full replace fitting into one chunk writes all points in one call"""
+        points = np.asarray(points, dtype=float).reshape(-1, 3)
+        stop = start + len(points)
+        point_count = self.obj.GetPointCount()
+        if stop > point_count:
+            raise ValueError("points exceed the point count of the spline")
+        if start == 0 and stop == point_count and stop <= chunk_size:
+            self.obj.SetAllPoints([c4d.Vector(*point) for point in points.tolist()])
+        else:
+            for chunk_start in range(0, len(points), chunk_size):
+                chunk = points[chunk_start:chunk_start + chunk_size].tolist()
+                for index, point in enumerate(chunk, start + chunk_start):
+                    self.obj.SetPoint(index, c4d.Vector(*point))
+        if tangents is not None:
+            tangents = np.asarray(tangents, dtype=float)
+            if tangents.ndim == 2:
+                # mirror tangents to the left side
+                tangents = np.stack([-tangents, tangents], axis=1)
+            for chunk_start in range(0, len(tangents), chunk_size):
+                chunk = tangents[chunk_start:chunk_start + chunk_size].tolist()
+                for index, (left, right) in enumerate(chunk, start + chunk_start):
+                    self.obj.SetTangent(index, c4d.Vector(*left), c4d.Vector(*right))
+        self.obj.Message(c4d.MSG_UPDATE)
+        self.invalidate_bounding_box()
 
     def set_object_properties(self):
         spline_types = {
@@ -245,28 +300,140 @@ class SVG(Spline):  # takes care of importing svgs
         self.depth = 0
 
 
-class PySpline(LineObject):
+class ConnectionNetwork(Spline):
+    """renders connections between nodes as two point segments of a single spline
+    all connections share one sketch material and tag"""
+
+    def __init__(self, nodes, edges, **kwargs):
+        self.nodes = list(nodes)
+        self.edges = np.asarray(edges, dtype=int).reshape(-1, 2)
+        super().__init__(spline_type="linear", **kwargs)
+        self.update_connections()
+
+    def get_node_positions(self):
+        """returns the global positions of the nodes"""
+        node_positions = [node.obj.GetMg().off for node in self.nodes]
+        return np.array([[position.x, position.y, position.z] for position in node_positions], dtype=float).reshape(-1, 3)
+
+    def get_end_points(self):
+        """returns the global start and stop points of the connections
+        ends at nodes with a border are moved to the point on the border closest to the opposite node"""
+        node_positions = self.get_node_positions()
+        end_points = node_positions[self.edges]  # shape (edges, 2, 3)
+        bordered_nodes = [i for i, node in enumerate(self.nodes) if hasattr(node, "border")]
+        for side in (0, 1):
+            # group the edge ends by node once
+            order = np.argsort(self.edges[:, side], kind="stable")
+            bounds = np.searchsorted(self.edges[order, side], [bordered_nodes, np.add(bordered_nodes, 1)])
+            for node_index, start, stop in zip(bordered_nodes, *bounds):
+                if start == stop:
+                    continue
+                edge_indices = order[start:stop]
+                border = self.nodes[node_index].border
+                # query the border in its local space
+                border_matrix = border.obj.GetMg()
+                opposite_positions = node_positions[self.edges[edge_indices, 1 - side]]
+                local_positions = transform_points(
+                    opposite_positions, matrix_to_array(~border_matrix))
+                border_points, _ = border.get_sampler().nearest(local_positions)
+                end_points[edge_indices, side] = transform_points(
+                    border_points, matrix_to_array(border_matrix))
+        return end_points
+
+    def update_connections(self):
+        """writes the current end points of all connections as segments of the spline"""
+        end_points = self.get_end_points().reshape(-1, 3)
+        local_points = transform_points(
+            end_points, matrix_to_array(~self.obj.GetMg()))
+        self.set_points(local_points, segments=np.full(len(self.edges), 2))
+
+
+class Plot(Spline):
+    """plots a data series as a linear spline decimated to the horizontal render resolution
+    data is an array of y values or (x, y) pairs ordered by x e.g. a memory mapped file, or an iterable of such chunks
+    the series is streamed in chunks so memory and time stay bounded for millions of samples"""
+
+    def __init__(self, data, width=400, height=200, x_range=None, y_range=None, resolution=None, decimation="minmax", chunk_size=2 ** 16, **kwargs):
+        self.data = data
+        self.width = width
+        self.height = height
+        self.x_range = x_range
+        self.y_range = y_range
+        self.resolution = resolution
+        self.decimation = decimation
+        self.chunk_size = chunk_size
+        super().__init__(spline_type="linear", **kwargs)
+        self.plot_data()
+
+    def get_pixel_count(self):
+        """returns the horizontal resolution, by default the one of the document's render settings"""
+        if self.resolution is None:
+            return self.document.GetActiveRenderData()[c4d.RDATA_XRES]
+        if type(self.resolution) is str:
+            return RESOLUTIONS[self.resolution][0]
+        return int(self.resolution)
+
+    def iterate_chunks(self):
+        """yields the data as chunks of x and y values"""
+        if hasattr(self.data, "shape"):
+            chunks = (self.data[start:start + self.chunk_size]
+                      for start in range(0, len(self.data), self.chunk_size))
+        else:
+            chunks = self.data
+        offset = 0
+        for chunk in chunks:
+            chunk = np.asarray(chunk, dtype=float)
+            if chunk.ndim == 1:
+                # plain values are plotted over their index
+                yield offset + np.arange(len(chunk)), chunk
+            else:
+                yield chunk[:, 0], chunk[:, 1]
+            offset += len(chunk)
+
+    def decimate(self):
+        """streams the data through a min max decimator with one bin per pixel"""
+        x_range = self.x_range
+        if x_range is None and hasattr(self.data, "shape") and len(self.data):
+            # arrays are ordered by x so the range is known up front
+            if self.data.ndim == 1:
+                x_range = (0, len(self.data) - 1)
+            else:
+                x_range = (float(self.data[0, 0]), float(self.data[-1, 0]))
+        decimator = MinMaxDecimator(self.get_pixel_count(), x_range=x_range)
+        for xs, ys in self.iterate_chunks():
+            decimator.add(xs, ys)
+        return decimator
+
+    def plot_data(self):
+        """writes the decimated data scaled to the plot size as points"""
+        decimator = self.decimate()
+        samples = decimator.get_points()
+        if not len(samples):
+            return
+        data_x_range, data_y_range = decimator.get_extent()
+        x_min, x_max = self.x_range or data_x_range
+        y_min, y_max = self.y_range or data_y_range
+        # map data to the plot centered around the origin
+        xs = (samples[:, 0] - x_min) / max(x_max - x_min, 1e-12) * self.width - self.width / 2
+        ys = (samples[:, 1] - y_min) / max(y_max - y_min, 1e-12) * self.height - self.height / 2
+        points = np.column_stack([xs, ys, np.zeros(len(samples))])
+        if self.decimation == "rdp":
+            # deviations below half a pixel are invisible
+            points = simplify_polyline(
+                points, epsilon=self.width / self.get_pixel_count() / 2)
+        self.set_points(points)
+
+
+class PySpline(Spline):
     """turns a c4d spline into a pydeation spline"""
 
     def __init__(self, input_spline, spline_type="bezier", **kwargs):
         self.input_spline = input_spline
-        self.spline_type = spline_type
-        super().__init__(**kwargs)
+        super().__init__(spline_type=spline_type, **kwargs)
 
     def specify_object(self):
         self.obj = self.input_spline.GetClone()
 
-    def set_object_properties(self):
-        spline_types = {
-            "linear": 0,
-            "cubic": 1,
-            "akima": 2,
-            "b-spline": 3,
-            "bezier": 4
-        }
-        # set interpolation
-        self.obj[c4d.SPLINEOBJECT_TYPE] = spline_types[self.spline_type]
-
 
 class Text(LineObject):
 
@@ -0,0 +1,147 @@
+from concurrent.futures import ThreadPoolExecutor
+from abc import ABC, abstractmethod
+import subprocess
+import shutil
+import os
+
+
+class Renderer(ABC):
+    """interface of the renderers used by the render orchestrator
+    a renderer renders an inclusive frame range of a saved document to an image sequence"""
+
+    @abstractmethod
+    def render(self, document_path, first_frame, last_frame, output_prefix):
+        """renders the frames and raises an error on failure"""
+        pass
+
+    @abstractmethod
+    def get_frame_path(self, output_prefix, frame):
+        """returns the path of a rendered frame"""
+        pass
+
+
+class CommandlineRenderer(Renderer):
+    """renders using the cinema 4d command line renderer"""
+
+    def __init__(self, executable="Commandline", image_format="PNG", resolution=None, extra_arguments=()):
+        self.executable = executable
+        self.image_format = image_format
+        self.resolution = resolution
+        self.extra_arguments = list(extra_arguments)
+
+    def render(self, document_path, first_frame, last_frame, output_prefix):
+        command = [self.executable, "-nogui", "-render", document_path,
+                   "-frame", str(first_frame), str(last_frame),
+                   "-oimage", output_prefix, "-oformat", self.image_format]
+        if self.resolution is not None:
+            command += ["-oresolution", *map(str, self.resolution)]
+        subprocess.run(command + self.extra_arguments,
+                       check=True, capture_output=True)
+
+    def get_frame_path(self, output_prefix, frame):
+        return f"{output_prefix}{frame:04d}.{self.image_format.lower()}"
+
+
+class RenderOrchestrator:
+    """splits the frame range of a document into chunks and renders them in parallel
+    every chunk renders into a directory of its own and is marked done once all its frames exist,
+    so interrupted or failed renders resume by skipping the chunks already done
+    the chunks are concatenated into a single image sequence and optionally encoded using ffmpeg"""
+
+    def __init__(self, document_path, output_directory, frame_range, renderer=None, chunk_size=50, workers=None, retries=1):
+        self.document_path = os.path.abspath(document_path)
+        self.output_directory = os.path.abspath(output_directory)
+        self.first_frame, self.last_frame = frame_range
+        self.renderer = CommandlineRenderer() if renderer is None else renderer
+        self.chunk_size = chunk_size
+        self.workers = workers or os.cpu_count()
+        self.retries = retries
+        self.failures = {}
+
+    def get_chunks(self):
+        """returns the inclusive frame ranges of the chunks"""
+        return [(first_frame, min(first_frame + self.chunk_size - 1, self.last_frame))
+                for first_frame in range(self.first_frame, self.last_frame + 1, self.chunk_size)]
+
+    def get_chunk_directory(self, chunk):
+        first_frame, last_frame = chunk
+        return os.path.join(self.output_directory, "chunks", f"{first_frame:06d}_{last_frame:06d}")
+
+    def get_output_prefix(self, chunk):
+        return os.path.join(self.get_chunk_directory(chunk), "frame_")
+
+    def get_marker_path(self, chunk):
+        return os.path.join(self.get_chunk_directory(chunk), "done")
+
+    def is_done(self, chunk):
+        """checks whether the chunk was rendered completely"""
+        return os.path.exists(self.get_marker_path(chunk))
+
+    def get_missing_frames(self, chunk):
+        """returns the frames of the chunk without rendered image"""
+        first_frame, last_frame = chunk
+        output_prefix = self.get_output_prefix(chunk)
+        return [frame for frame in range(first_frame, last_frame + 1)
+                if not os.path.exists(self.renderer.get_frame_path(output_prefix, frame))]
+
+    def render_chunk(self, chunk):
+        """renders a chunk unless it is done and returns whether it succeeded"""
+        if self.is_done(chunk):
+            return True
+        os.makedirs(self.get_chunk_directory(chunk), exist_ok=True)
+        for _ in range(self.retries + 1):
+            try:
+                self.renderer.render(self.document_path, *chunk,
+                                     self.get_output_prefix(chunk))
+                missing_frames = self.get_missing_frames(chunk)
+                if not missing_frames:
+                    open(self.get_marker_path(chunk), "w").close()
+                    self.failures.pop(chunk, None)
+                    return True
+                self.failures[chunk] = f"missing frames {missing_frames}"
+            except Exception as error:
+                self.failures[chunk] = repr(error)
+        return False
+
+    def render(self):
+        """renders all chunks that are not done yet and returns whether all succeeded"""
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            succeeded = list(executor.map(self.render_chunk, self.get_chunks()))
+        return all(succeeded)
+
+    def concatenate(self, directory_name="frames"):
+        """links the frames of all chunks into one consecutively numbered image sequence and returns its directory"""
+        directory = os.path.join(self.output_directory, directory_name)
+        os.makedirs(directory, exist_ok=True)
+        for chunk in self.get_chunks():
+            first_frame, last_frame = chunk
+            for frame in range(first_frame, last_frame + 1):
+                source = self.renderer.get_frame_path(
+                    self.get_output_prefix(chunk), frame)
+                extension = os.path.splitext(source)[1]
+                target = os.path.join(directory, f"frame_{frame - self.first_frame:06d}{extension}")
+                if os.path.exists(target):
+                    os.remove(target)
+                try:
+                    os.link(source, target)
+                except OSError:
+                    shutil.copyfile(source, target)
+        return directory
+
+    def encode(self, fps=30, file_name="render.mp4", ffmpeg="ffmpeg"):
+        """encodes the concatenated image sequence to a video and returns its path"""
+        directory = self.concatenate()
+        extension = os.path.splitext(self.renderer.get_frame_path("", self.first_frame))[1]
+        path = os.path.join(self.output_directory, file_name)
+        subprocess.run([ffmpeg, "-y", "-framerate", str(fps), "-i", os.path.join(directory, f"frame_%06d{extension}"),
+                        "-c:v", "libx264", "-pix_fmt", "yuv420p", path], check=True, capture_output=True)
+        return path
+
+    def run(self, fps=None):
+        """renders, concatenates and optionally encodes the frames
+        returns the path of the video or image sequence, or None if chunks failed"""
+        if not self.render():
+            return None
+        if fps is None:
+            return self.concatenate()
+        return self.encode(fps=fps)
@@ -1,25 +1,281 @@
 from pydeation.animation.animation import VectorAnimation, AnimationGroup
+from pydeation.animation.timing import to_seconds, to_frame
 from pydeation.animation.object_animators import Show, Hide
+from pydeation.constants import RESOLUTIONS, RENDER_PROFILES, TAG_ROLE_ID, DISABLED_MATERIAL_ID
+from pydeation.build_cache import ConstructSource, Snapshot, get_default_build_cache
+from pydeation.utils import iterate_hierarchy
+from pydeation.objects.abstract_objects import ProtoObject
+from pydeation.stats import collect_statistics
+from pydeation.animation.compression import compress_keyframes
+from pydeation.animation.schedule import AnimationSchedule, AnimationConflictWarning
+from pydeation.animation.evaluation import ParameterEvaluator
+from pydeation.timeline import TimelineWriter, TimelineReader, ObjectIds, replay_timeline
 from abc import ABC, abstractmethod
 from collections import defaultdict
+import warnings
+import inspect
+import time
 import c4d
 
+SKETCH_VIDEO_POST = 1011015  # id of the sketch and toon render settings
 
-class Scene(ABC):
-    """abstract class acting as blueprint for scenes"""
 
-    def __init__(self, resolution="default"):
+class Scene(ABC):
+    """abstract class acting as blueprint for scenes
+    passing a build cache (or True for the shared one) saves the built documents and reuses builds as far as it is enabled to:
+        - restoring snapshots resumes from the snapshot of the longest unchanged prefix of construct
+          and restores an unchanged scene built earlier in the session with its python state
+        - loading documents loads an unchanged scene from disk without its python state,
+          stats and the parameter evaluation raise for such a scene
+    scenes writing or replaying a timeline are rebuilt instead
+    start_from resumes from a named checkpoint set by self.checkpoint(name) in construct,
+    it needs a build cache restoring snapshots
+    interactive=False skips the editor specific steps for headless builds
+    render_profile applies one of the RENDER_PROFILES e.g. "draft" for fast previews
+    compress removes redundant keys and constant tracks after construct
+    timeline_path streams the executed animations and the resulting keys to a timeline file, see pydeation.timeline
+    replay_path writes the keys of a timeline file onto the objects instead of executing the played animations
+    animations driving the same parameter in overlapping frame windows are collected in self.conflicts
+    and reported by an AnimationConflictWarning, which warnings.simplefilter("error") turns into an error"""
+
+    # attributes describing the current build rather than the scene state
+    transient_attributes = ("build_cache", "start_from", "timeline_writer", "replay_reader", "construct_source",
+                            "construct_codes", "last_snapshot_time")
+
+    def __init__(self, resolution="default", build_cache=None, start_from=None, interactive=True, render_profile=None, compress=False, timeline_path=None, replay_path=None):
         self.resolution = resolution
+        self.render_profile = render_profile
+        if build_cache is True:
+            build_cache = get_default_build_cache()
+        if start_from is not None and (build_cache is None or not build_cache.restore_snapshots):
+            raise ValueError(
+                "start_from needs a build cache restoring snapshots e.g. build_cache=pydeation.build_cache.BuildCache(restore_snapshots=True)")
+        self.build_cache = build_cache
+        self.start_from = start_from
         self.create_new_document()
         self.set_scene_name()
         self.insert_document()
-        self.construct()
-        self.set_interactive_render_region()
+        # render settings come first so objects can adapt to the resolution
+        self.set_render_settings()
+        self.objects = []  # pydeation objects created by construct
+        self.section_times = {}  # build time per section of construct
+        self.current_section = None
+        self.elapsed_time = to_seconds(0)  # exact time in seconds played so far
+        self.schedule = AnimationSchedule()  # executed animations indexed by their windows
+        self.has_python_state = True  # False if only the document was loaded from the build cache
+        self.timeline_writer = None
+        if timeline_path is not None:
+            self.timeline_writer = TimelineWriter(
+                timeline_path, self.objects, fps=self.document.GetFps())
+        self.replay_reader = None if replay_path is None else TimelineReader(replay_path)
+        self.section("start")
+        ProtoObject.registry = self.objects
+        try:
+            self.build()
+        finally:
+            ProtoObject.registry = None
+        self.section(None)
+        if self.report_conflicts():
+            overlaps = "\n".join(f"{animation_ini} overlaps {animation_fin}"
+                                  for animation_ini, animation_fin in self.conflicts)
+            warnings.warn(f"{len(self.conflicts)} conflicting animations in {self.scene_name}, "
+                          f"see scene.conflicts:\n{overlaps}", AnimationConflictWarning)
+        if self.replay_reader is not None:
+            self.replay_report = replay_timeline(
+                self.replay_reader, self.objects, self.document)
+        if compress:
+            self.compress_keyframes()
+        if self.timeline_writer is not None:
+            self.timeline_writer.add_tracks(self.document)
+            self.timeline_writer.close()
+        self.render_settings.apply_profile_to_document(self.document)
+        if interactive:
+            self.set_interactive_render_region()
+
+    def build(self):
+        """runs construct using the build cache if given and saves the built document:
+            - loads the cached document if the scene is unchanged and the cache loads documents
+            - restores the checkpoint given by start_from if the statements preceding it are unchanged
+            - restores the snapshot of the longest unchanged prefix and runs only the remaining statements
+            - otherwise runs construct taking snapshots along the way if the cache restores snapshots"""
+        if self.build_cache is None:
+            self.construct()
+            return
+        try:
+            self.construct_source = ConstructSource(
+                type(self), {"resolution": self.resolution, "render_profile": self.render_profile})
+        except (OSError, TypeError):
+            # source is unavailable e.g. for interactively defined scenes
+            self.build_cache = None
+            self.construct()
+            return
+        self.construct_codes = {self.construct_source.construct.__code__}
+        self.last_snapshot_time = time.time()
+        if self.load_cached_build():
+            return
+        snapshot = None
+        if self.start_from is not None:
+            snapshot = self.build_cache.find_checkpoint(self.construct_source.scene_key, self.start_from,
+                                                        self.construct_source.fingerprints)
+            if snapshot is None:
+                print(f"checkpoint {self.start_from} not found or outdated, building {self.scene_name} from the start")
+        if snapshot is None and self.build_cache.restore_snapshots:
+            snapshot = self.build_cache.find_snapshot(
+                self.construct_source.fingerprints)
+        if snapshot is None:
+            self.construct()
+        else:
+            self.resume(snapshot)
+        self.build_cache.save_document(
+            self.construct_source.key, self.document)
+        if self.build_cache.restore_snapshots:
+            # keeps the complete state so rebuilding the unchanged scene restores it
+            self.build_cache.add_snapshot(Snapshot(self, len(self.construct_source.statements) - 1,
+                                                   self.construct_source.key, {}))
+
+    def load_cached_build(self):
+        """restores an unchanged scene from the build cache and returns whether it did:
+            - the snapshot of the complete construct restores the document and the python state
+            - the document on disk only restores the document, the render settings are written to it again
+        a timeline writer needs every play to run and a replay needs the objects so they skip the shortcuts"""
+        if self.timeline_writer is not None:
+            return False
+        snapshot = self.build_cache.snapshots.get(self.construct_source.key)
+        if snapshot is not None:
+            self.build_cache.snapshots.move_to_end(self.construct_source.key)
+            self.resume(snapshot)
+            return True
+        if self.replay_reader is not None or not self.build_cache.load_documents:
+            return False
+        document = self.build_cache.load_document(self.construct_source.key)
+        if document is None:
+            return False
+        self.replace_document(document)
+        # the render settings still refer to the killed document
         self.set_render_settings()
+        self.has_python_state = False
+        return True
+
+    def resume(self, snapshot):
+        """restores the snapshot and runs the statements of construct following it"""
+        document, scene_state, local_variables = snapshot.restore(self)
+        self.replace_document(document)
+        self.__dict__.update(scene_state)
+        # continue with the restored objects and the section open at the snapshot
+        ProtoObject.registry = self.objects
+        if self.timeline_writer is not None:
+            self.timeline_writer.object_ids = ObjectIds(self.objects)
+        self.current_section = (self.current_section[0], time.perf_counter())
+        construct_tail = self.construct_source.compile_tail(
+            snapshot.statement_index, local_variables)
+        self.construct_codes.add(construct_tail.__code__)
+        local_variables.pop("self", None)
+        construct_tail(self, **local_variables)
+
+    def replace_document(self, document):
+        """replaces the document of the scene e.g. by a cached or restored one"""
+        if document is not self.document:
+            c4d.documents.KillDocument(self.document)
+        self.document = document
+        c4d.documents.InsertBaseDocument(self.document)
+        c4d.documents.SetActiveDocument(self.document)
+        self.document.SetDocumentName(self.scene_name)
+
+    def get_snapshot_state(self):
+        """returns the attributes making up the state of the scene"""
+        return {name: value for name, value in self.__dict__.items()
+                if name not in self.transient_attributes}
+
+    def find_construct_frame(self):
+        """returns the frame of construct or the resumed part of it"""
+        frame = inspect.currentframe()
+        while frame is not None and frame.f_code not in self.construct_codes:
+            frame = frame.f_back
+        return frame
+
+    def take_snapshot(self, name=None):
+        """snapshots the scene at the end of a top level play, wait or checkpoint statement of construct
+        unnamed snapshots are only taken once the snapshot interval has passed
+        returns the snapshot or None if none was taken"""
+        if self.build_cache is None or not self.build_cache.restore_snapshots:
+            return None
+        if name is None and time.time() - self.last_snapshot_time < self.build_cache.snapshot_interval:
+            return None
+        frame = self.find_construct_frame()
+        if frame is None:
+            return None
+        statement_index = self.construct_source.get_statement_index(
+            frame.f_lineno)
+        if not self.construct_source.is_boundary(statement_index):
+            return None
+        fingerprint = self.construct_source.fingerprints[statement_index]
+        snapshot = self.build_cache.snapshots.get(fingerprint)
+        if snapshot is None or snapshot.name != name:
+            snapshot = Snapshot(self, statement_index, fingerprint,
+                                dict(frame.f_locals), name=name)
+        if name is None:
+            self.build_cache.add_snapshot(snapshot)
+        else:
+            self.build_cache.add_checkpoint(
+                self.construct_source.scene_key, snapshot)
+        self.last_snapshot_time = time.time()
+        return snapshot
+
+    def checkpoint(self, name):
+        """snapshots the document and the scene state under the given name
+        building with start_from=name then only runs the statements of construct following the checkpoint
+        the checkpoint has to be a top level statement of construct"""
+        self.section(name)
+        if self.build_cache is None or not self.build_cache.restore_snapshots:
+            return
+        if self.take_snapshot(name=name) is None:
+            print(f"checkpoint {name} is ignored as it is not a top level statement of construct")
+
+    def section(self, name):
+        """ends the current section of construct and starts timing a new one, checkpoints start sections too
+        None ends the current section without starting a new one"""
+        now = time.perf_counter()
+        if self.current_section is not None:
+            section_name, start_time = self.current_section
+            self.section_times[section_name] = self.section_times.get(
+                section_name, 0) + now - start_time
+        self.current_section = None if name is None else (name, now)
+
+    def report_conflicts(self):
+        """returns the pairs of animations driving the same parameter in overlapping frame windows across plays"""
+        self.conflicts = self.schedule.find_conflicts()
+        return self.conflicts
+
+    def compress_keyframes(self, tolerance=1e-6):
+        """removes redundant keys and constant tracks from the document and returns the report"""
+        self.compression_report = compress_keyframes(
+            self.document, tolerance=tolerance)
+        return self.compression_report
+
+    def values_over(self, obj, param, times):
+        """computes the values of a parameter given by description id or parameter id at the times in seconds
+        from the played animations without evaluating the document, see pydeation.animation.evaluation"""
+        if not self.has_python_state:
+            raise RuntimeError(
+                f"{self.scene_name} was loaded from a cached document without the played animations, build it with build_cache=None to evaluate parameters")
+        return ParameterEvaluator(self.schedule, self.document.GetFps()).values_over(obj, param, times)
+
+    def value_at(self, obj, param, t):
+        """computes the value of a parameter at the time in seconds from the played animations"""
+        return self.values_over(obj, param, [t])[0]
+
+    def stats(self):
+        """returns a report of the document size and the build time per section, see pydeation.stats"""
+        if not self.has_python_state:
+            raise RuntimeError(
+                f"{self.scene_name} was loaded from a cached document without its objects and section times, build it with build_cache=None to collect statistics")
+        return collect_statistics(self)
 
     def set_render_settings(self):
         self.render_settings = RenderSettings()
         self.render_settings.set_resolution(self.resolution)
+        if self.render_profile is not None:
+            self.render_settings.set_profile(self.render_profile)
 
     def create_new_document(self):
         """creates a new project and gets the active document"""
@@ -117,22 +373,33 @@ class Scene(ABC):
         return linked_animations
 
     def feed_run_time(self, animations, run_time):
-        """feeds the run time to animations"""
+        """feeds the run time and the exact start of the play to animations"""
         for animation in animations:
             animation.abs_run_time = run_time
+            animation.play_start = self.elapsed_time
 
     def execute_animations(self, animations):
         """passes the run time to animations and executes them"""
         for animation in animations:
             animation.execute()
 
+    def get_frame(self):
+        """returns the current frame of the document timeline"""
+        return self.document.GetTime().GetFrame(self.document.GetFps())
+
     def add_time(self, run_time):
-        """passes the run time in the document timeline"""
-        time_ini = self.document.GetTime()
-        time_fin = time_ini + c4d.BaseTime(run_time)
-        self.document.SetTime(time_fin)
+        """passes the run time in the document timeline
+        the exact elapsed time is accumulated and only its sum is rounded to a whole frame,
+        so the frames of consecutive plays add up to the frames of their total run time"""
+        fps = self.document.GetFps()
+        self.elapsed_time += to_seconds(run_time)
+        self.document.SetTime(c4d.BaseTime(to_frame(self.elapsed_time, fps), fps))
         c4d.EventAdd()  # update cinema
 
+    def get_frame_range(self):
+        """returns the inclusive frame range played so far e.g. for the render orchestrator"""
+        return 0, max(self.get_frame() - 1, 0)
+
     def flatten(self, animations):
         """flattens animations by wrapping them inside animation group"""
         animation_group = AnimationGroup(*animations)
@@ -181,17 +448,26 @@ class Scene(ABC):
             - flattens animations
             - links animation chains
             - feeds them the run time
-            - executes the animations"""
+            - executes the animations
+        when replaying a timeline only the time is passed as the keys are written after construct"""
+        if self.replay_reader is not None:
+            self.add_time(run_time)
+            return
         animations_with_visibility = self.handle_visibility(animations)
         flattened_animations = self.flatten(animations_with_visibility)
         linked_animations = self.link_animation_chains(flattened_animations)
         self.feed_run_time(linked_animations, run_time)
         self.execute_animations(linked_animations)
+        self.schedule.add(linked_animations)
+        if self.timeline_writer is not None:
+            self.timeline_writer.add_animations(linked_animations)
         self.add_time(run_time)
+        self.take_snapshot()
 
     def wait(self, seconds=1):
         """adds time without any animations"""
         self.add_time(seconds)
+        self.take_snapshot()
 
 
 class RenderSettings():
@@ -199,6 +475,7 @@ class RenderSettings():
 
     def __init__(self):
         self.document = c4d.documents.GetActiveDocument()  # get document
+        self.profile = None
         self.set_base_settings()
         self.set_sketch_settings()
 
@@ -212,28 +489,69 @@ class RenderSettings():
 
     def set_resolution(self, resolution):
         """sets the resolution for the render"""
-
-        if resolution == "verylow":
-            self.settings[c4d.RDATA_XRES] = 320
-            self.settings[c4d.RDATA_YRES] = 180
-        elif resolution == "low":
-            self.settings[c4d.RDATA_XRES] = 480
-            self.settings[c4d.RDATA_YRES] = 270
-        elif resolution == "default":
-            self.settings[c4d.RDATA_XRES] = 1280
-            self.settings[c4d.RDATA_YRES] = 720
-        elif resolution == "high":
-            self.settings[c4d.RDATA_XRES] = 2560
-            self.settings[c4d.RDATA_YRES] = 1440
-        elif resolution == "veryhigh":
-            self.settings[c4d.RDATA_XRES] = 3840
-            self.settings[c4d.RDATA_YRES] = 2160
+        self.settings[c4d.RDATA_XRES], self.settings[c4d.RDATA_YRES] = RESOLUTIONS[resolution]
+
+    def set_profile(self, profile):
+        """applies the render settings of one of the RENDER_PROFILES
+        the options concerning the objects are applied to the document after construct"""
+        self.profile = RENDER_PROFILES[profile]
+        if self.profile["resolution"] is not None:
+            self.set_resolution(self.profile["resolution"])
+        self.settings[c4d.RDATA_FRAMESTEP] = self.profile["frame_step"]
+        self.settings[c4d.RDATA_ANTIALIASING] = self.profile["antialiasing"]
+        self.set_line_quality(self.profile["line_quality"])
+
+    def set_line_quality(self, quality):
+        """sets the quality of the sketch lines"""
+        full = quality == "full"
+        self.sketch_settings[c4d.OUTLINEMAT_EDLINES_REDRAW_FULL] = full
+        self.sketch_settings[c4d.OUTLINEMAT_EDLINES_LINE_DRAW] = 1 if full else 0  # 3D or 2D lines in editor
+
+    def apply_profile_to_document(self, document):
+        """applies the options of the profile concerning the objects by disabling tags rather than removing them:
+            - fills: unlinks the material of the fill tags and keeps it in the tag, see enable_fill_tag
+            - custom_tags: disables the custom and composition xpresso tags
+        the tags are matched by their type id and the role pydeation stored in them"""
+        if self.profile is None:
+            return
+        for obj in iterate_hierarchy(document.GetFirstObject()):
+            for tag in obj.GetTags():
+                role = tag.GetDataInstance().GetString(TAG_ROLE_ID)
+                if tag.GetType() == c4d.Ttexture and role == "fill" and not self.profile["fills"]:
+                    self.disable_fill_tag(tag)
+                elif tag.GetType() == c4d.Texpresso and role in ("custom", "composition") \
+                        and not self.profile["custom_tags"]:
+                    tag[c4d.EXPRESSION_ENABLE] = False
+
+    @staticmethod
+    def disable_fill_tag(tag):
+        """hides the fill by moving the material link of the tag into its container"""
+        material = tag.GetMaterial()
+        if material is not None:
+            tag.GetDataInstance().SetLink(DISABLED_MATERIAL_ID, material)
+            tag.SetMaterial(None)
+
+    @staticmethod
+    def enable_fill_tag(tag):
+        """restores the material of a fill tag disabled by a render profile"""
+        material = tag.GetDataInstance().GetLink(DISABLED_MATERIAL_ID)
+        if material is not None:
+            tag.SetMaterial(material)
+            tag.GetDataInstance().RemoveData(DISABLED_MATERIAL_ID)
 
     def set_sketch_settings(self):
         """sets the sketch and toon settings"""
 
-        sketch_vp = c4d.documents.BaseVideoPost(
-            1011015)  # add sketch render settings
+        # reuse the sketch render settings of a document loaded from the build cache
+        sketch_vp = self.settings.GetFirstVideoPost()
+        while sketch_vp is not None and not sketch_vp.CheckType(SKETCH_VIDEO_POST):
+            sketch_vp = sketch_vp.GetNext()
+        if sketch_vp is None:
+            sketch_vp = c4d.documents.BaseVideoPost(
+                SKETCH_VIDEO_POST)  # add sketch render settings
+            self.settings.InsertVideoPost(
+                sketch_vp)  # insert sketch settings
+        self.sketch_settings = sketch_vp
         # set parameters
         sketch_vp[c4d.OUTLINEMAT_SHADING_BACK_COL] = c4d.Vector(
             0, 0, 0)  # set background to black
@@ -249,6 +567,3 @@ class RenderSettings():
         sketch_vp[c4d.OUTLINEMAT_PIXELUNITS_BASEH] = 700  # set custom height
         sketch_vp[c4d.OUTLINEMAT_EDLINES_REDRAW_FULL] = True  # redraw lines
         sketch_vp[c4d.OUTLINEMAT_LINE_SPLINES] = True  # enable splines
-
-        self.settings.InsertVideoPost(
-            sketch_vp)  # insert sketch settings
@@ -0,0 +1,89 @@
+from collections import Counter
+import json
+
+
+def count_tracks(atom):
+    """returns the number of animation tracks and keys of an atom"""
+    tracks = atom.GetCTracks()
+    return len(tracks), sum(track.GetCurve().GetKeyCount() for track in tracks)
+
+
+def collect_statistics(scene):
+    """returns a report of the size of the scene document and the build time of the construct sections"""
+    # imported here so the reports can be saved, loaded and compared without c4d
+    from pydeation.utils import iterate_hierarchy
+    import c4d
+    document = scene.document
+    document_objects = Counter()
+    tags = Counter()
+    xpresso_nodes = Counter()
+    materials = Counter()
+    user_data = track_count = key_count = 0
+    animated = []
+    for obj in iterate_hierarchy(document.GetFirstObject()):
+        document_objects[obj.GetTypeName()] += 1
+        user_data += len(obj.GetUserDataContainer())
+        animated.append(obj)
+        for tag in obj.GetTags():
+            tags[tag.GetTypeName()] += 1
+            animated.append(tag)
+            if tag.CheckType(c4d.Texpresso):
+                for node in iterate_hierarchy(tag.GetNodeMaster().GetRoot().GetDown()):
+                    xpresso_nodes[node.GetTypeName()] += 1
+    for material in document.GetMaterials():
+        materials[material.GetTypeName()] += 1
+        animated.append(material)
+    for atom in animated:
+        atom_track_count, atom_key_count = count_tracks(atom)
+        track_count += atom_track_count
+        key_count += atom_key_count
+    return {
+        "scene": scene.scene_name,
+        "objects": dict(Counter(type(obj).__name__ for obj in scene.objects)),
+        "document_objects": dict(document_objects),
+        "materials": dict(materials),
+        "tags": dict(tags),
+        "xpresso_nodes": dict(xpresso_nodes),
+        "user_data": user_data,
+        "tracks": track_count,
+        "keys": key_count,
+        "sections": dict(scene.section_times),
+        "build_time": sum(scene.section_times.values())
+    }
+
+
+def save_statistics(report, path):
+    """writes a report to a json file"""
+    with open(path, "w") as report_file:
+        json.dump(report, report_file, indent=4)
+
+
+def load_statistics(path):
+    """reads a report from a json file"""
+    with open(path) as report_file:
+        return json.load(report_file)
+
+
+def flatten_statistics(report, prefix=""):
+    """flattens the nested counts of a report to dotted keys"""
+    flat_report = {}
+    for key, value in report.items():
+        if isinstance(value, dict):
+            flat_report.update(flatten_statistics(value, prefix=f"{prefix}{key}."))
+        elif isinstance(value, (int, float)):
+            flat_report[prefix + key] = value
+    return flat_report
+
+
+def diff_statistics(report_ini, report_fin):
+    """returns the changed counts and times of two reports as (before, after, change) by dotted key
+    sorted by the size of the change"""
+    flat_ini = flatten_statistics(report_ini)
+    flat_fin = flatten_statistics(report_fin)
+    changes = {}
+    for key in flat_ini.keys() | flat_fin.keys():
+        value_ini = flat_ini.get(key, 0)
+        value_fin = flat_fin.get(key, 0)
+        if value_ini != value_fin:
+            changes[key] = (value_ini, value_fin, value_fin - value_ini)
+    return dict(sorted(changes.items(), key=lambda item: -abs(item[1][2])))
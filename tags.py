@@ -1,21 +1,27 @@
 from abc import ABC, abstractmethod
-from pydeation.constants import WHITE
+from pydeation.constants import WHITE, TAG_ROLE_ID
 import c4d
 
 
 class Tag():
 
-    def __init__(self, target=None, name=None):
+    def __init__(self, target=None, name=None, role=None):
         self.document = c4d.documents.GetActiveDocument()  # get document
         self.specify_tag_type()
         self.set_tag_properties()
         self.set_name(name)
+        self.set_role(role)
         self.apply_to_object(target)
 
     def set_name(self, name):
         if name:
             self.obj.SetName(name)
 
+    def set_role(self, role):
+        # stores the role in the container so render profiles find the tag in saved documents
+        if role:
+            self.obj.GetDataInstance().SetString(TAG_ROLE_ID, role)
+
     @abstractmethod
     def specify_tag_type(self):
         pass
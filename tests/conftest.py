@@ -0,0 +1,13 @@
+"""makes the repository importable as the pydeation package when it is not installed under that name
+only the pure numpy modules are tested here, everything touching c4d needs cinema 4d"""
+import importlib.util
+import types
+import sys
+import os
+
+REPOSITORY_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+if importlib.util.find_spec("pydeation") is None:
+    package = types.ModuleType("pydeation")
+    package.__path__ = [REPOSITORY_PATH]
+    sys.modules["pydeation"] = package
@@ -0,0 +1,81 @@
+from pydeation.batch import RESULT_PREFIX, BatchBuilder, get_scene_spec, load_scene_class
+import json
+import stat
+import sys
+import os
+import pytest
+
+# stands in for c4dpy: reads the worker arguments and answers according to the scene name
+STAND_IN_INTERPRETER = f"""#!{sys.executable}
+import json
+import time
+import sys
+_, scene_spec, output_directory, resolution = sys.argv[1:5]
+name = scene_spec.rsplit(":", 1)[1]
+if name == "Broken":
+    sys.exit("Traceback: scene could not be built")
+if name == "Slow":
+    time.sleep(10)
+print("building", name)
+print({RESULT_PREFIX!r} + json.dumps({{"document": output_directory + "/" + name + ".c4d",
+                                      "resolution": resolution, "build_time": 0.0}}))
+"""
+
+SCENE_SCRIPT = """
+class Outer:
+    class Inner:
+        pass
+
+
+class Scene:
+    pass
+"""
+
+
+class StandInScene:
+    pass
+
+
+@pytest.fixture
+def interpreter(tmp_path):
+    path = tmp_path / "c4dpy"
+    path.write_text(STAND_IN_INTERPRETER)
+    path.chmod(path.stat().st_mode | stat.S_IEXEC)
+    return str(path)
+
+
+def test_scene_spec_of_class_points_to_its_source():
+    path, class_name = get_scene_spec(StandInScene).rsplit(":", 1)
+    assert os.path.samefile(path, __file__)
+    assert class_name == "StandInScene"
+    assert get_scene_spec("scenes.py:Intro") == "scenes.py:Intro"
+
+
+def test_load_scene_class_resolves_nested_classes(tmp_path):
+    path = tmp_path / "stand_in_scenes.py"
+    path.write_text(SCENE_SCRIPT)
+    assert load_scene_class(f"{path}:Scene").__name__ == "Scene"
+    assert load_scene_class(f"{path}:Outer.Inner").__qualname__ == "Outer.Inner"
+
+
+def test_batch_builder_collects_results_in_order(tmp_path, interpreter):
+    scenes = [f"scenes.py:Scene{index}" for index in range(5)]
+    builder = BatchBuilder(scenes, tmp_path / "output", workers=3, resolution="low", interpreter=interpreter)
+    results = builder.run()
+    assert [result["scene"] for result in results] == scenes
+    assert all(result["status"] == "built" for result in results)
+    assert results[2]["document"] == str(tmp_path / "output" / "Scene2.c4d")
+    assert results[2]["resolution"] == "low"
+    assert builder.failures == []
+    assert os.path.isdir(tmp_path / "output")
+
+
+def test_batch_builder_reports_failures_and_timeouts(tmp_path, interpreter):
+    builder = BatchBuilder(["scenes.py:Broken", "scenes.py:Slow", "scenes.py:Fine"], tmp_path,
+                           workers=3, timeout=2, interpreter=interpreter)
+    broken, slow, fine = builder.run()
+    assert broken["status"] == "failed"
+    assert "scene could not be built" in json.dumps(broken["error"])
+    assert slow["status"] == "timeout"
+    assert fine["status"] == "built"
+    assert [result["scene"] for result in builder.failures] == ["scenes.py:Broken", "scenes.py:Slow"]
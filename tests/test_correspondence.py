@@ -0,0 +1,65 @@
+from pydeation.geometry import correspondence
+from pydeation.geometry.correspondence import linear_sum_assignment, solve_correspondence
+from itertools import permutations
+import numpy as np
+import pytest
+
+
+def brute_force_cost(cost):
+    """returns the minimal cost of assigning every row or every column whichever are fewer"""
+    row_count, column_count = cost.shape
+    if row_count <= column_count:
+        return min(cost[np.arange(row_count), list(columns)].sum()
+                   for columns in permutations(range(column_count), row_count))
+    return min(cost[list(rows), np.arange(column_count)].sum()
+               for rows in permutations(range(row_count), column_count))
+
+
+@pytest.mark.parametrize("shape", [(1, 1), (1, 4), (3, 3), (5, 5), (7, 7), (3, 6), (6, 3)])
+@pytest.mark.parametrize("integer", [False, True])
+def test_linear_sum_assignment_matches_permutations(shape, integer):
+    rng = np.random.default_rng(sum(shape))
+    for _ in range(10):
+        # integer costs produce ties
+        cost = rng.integers(0, 4, size=shape).astype(float) if integer else rng.uniform(size=shape)
+        rows, columns = linear_sum_assignment(cost)
+        assert len(rows) == len(columns) == min(shape)
+        assert len(set(rows.tolist())) == len(set(columns.tolist())) == min(shape)
+        assert cost[rows, columns].sum() == pytest.approx(brute_force_cost(cost))
+
+
+class StubSampler:
+    """stands in for a spline sampler with precomputed segment features"""
+
+    def __init__(self, geometry_hash, features):
+        self.geometry_hash = geometry_hash
+        self.features = features
+
+    def get_geometry_hash(self):
+        return self.geometry_hash
+
+
+@pytest.mark.parametrize("segment_counts", [(2, 5), (5, 2), (4, 4)])
+def test_solve_correspondence_uses_every_segment(monkeypatch, segment_counts):
+    rng = np.random.default_rng(0)
+    samplers = [StubSampler(("stub", index, count), (rng.normal(size=(count, 3)), rng.uniform(1, 2, count), rng.uniform(1, 2, count)))
+                for index, count in enumerate(segment_counts)]
+    monkeypatch.setattr(correspondence, "segment_features", lambda sampler: sampler.features)
+    monkeypatch.setattr(correspondence, "CORRESPONDENCE_CACHE", type(correspondence.CORRESPONDENCE_CACHE)())
+    indices_ini, indices_fin = solve_correspondence(*samplers)
+    assert len(indices_ini) == max(segment_counts)
+    assert set(indices_ini) == set(range(segment_counts[0]))
+    assert set(indices_fin) == set(range(segment_counts[1]))
+
+
+def test_correspondence_cache_drops_least_recently_used(monkeypatch):
+    rng = np.random.default_rng(0)
+    monkeypatch.setattr(correspondence, "segment_features", lambda sampler: sampler.features)
+    monkeypatch.setattr(correspondence, "CORRESPONDENCE_CACHE", type(correspondence.CORRESPONDENCE_CACHE)())
+    monkeypatch.setattr(correspondence, "MAX_CORRESPONDENCES", 2)
+    samplers = [StubSampler(index, (rng.normal(size=(2, 3)), rng.uniform(1, 2, 2), rng.uniform(1, 2, 2))) for index in range(4)]
+    solve_correspondence(samplers[0], samplers[1])
+    solve_correspondence(samplers[1], samplers[2])
+    solve_correspondence(samplers[0], samplers[1])  # a hit keeps the pair
+    solve_correspondence(samplers[2], samplers[3])
+    assert [key[:2] for key in correspondence.CORRESPONDENCE_CACHE] == [(0, 1), (2, 3)]
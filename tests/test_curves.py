@@ -0,0 +1,123 @@
+from pydeation.animation.curves import find_redundant_keys, find_repeated_keys
+import numpy as np
+import pytest
+import copy
+
+
+class StandInTrack:
+    """value curve of keys with step, linear or spline interpolation and explicit tangents"""
+
+    def __init__(self, keys):
+        # keys are tuples of time, value, interpolation and optionally left and right tangent values
+        self.times = np.array([key[0] for key in keys], dtype=float)
+        self.values = np.array([key[1] for key in keys], dtype=float)
+        self.interpolations = [key[2] for key in keys]
+        self.value_left = np.array([key[3] if len(key) > 3 else 0 for key in keys], dtype=float)
+        self.value_right = np.array([key[4] if len(key) > 4 else 0 for key in keys], dtype=float)
+        self.time_left = -np.diff(self.times, prepend=self.times[0] - 1) / 3
+        self.time_right = np.diff(self.times, append=self.times[-1] + 1) / 3
+
+    def keys(self):
+        return {"times": self.times, "values": self.values,
+                "step": [interpolation == "step" for interpolation in self.interpolations],
+                "linear": [interpolation == "linear" for interpolation in self.interpolations],
+                "value_left": self.value_left, "value_right": self.value_right}
+
+    def remove(self, mask):
+        track = copy.copy(self)
+        for name in ("times", "values", "value_left", "value_right", "time_left", "time_right"):
+            setattr(track, name, getattr(self, name)[~mask])
+        track.interpolations = [interpolation for interpolation, removed in zip(self.interpolations, mask) if not removed]
+        return track
+
+    def evaluate(self, time):
+        if time <= self.times[0]:
+            return self.values[0]
+        if time >= self.times[-1]:
+            return self.values[-1]
+        index = np.searchsorted(self.times, time, side="right") - 1
+        start_time, end_time = self.times[index], self.times[index + 1]
+        start_value, end_value = self.values[index], self.values[index + 1]
+        if self.interpolations[index] == "step":
+            return start_value
+        if self.interpolations[index] == "linear":
+            return start_value + (time - start_time) / (end_time - start_time) * (end_value - start_value)
+        control_times = (start_time, start_time + self.time_right[index], end_time + self.time_left[index + 1], end_time)
+        control_values = (start_value, start_value + self.value_right[index], end_value + self.value_left[index + 1], end_value)
+        low, high = 0.0, 1.0
+        for _ in range(60):
+            u = (low + high) / 2
+            if bezier(control_times, u) < time:
+                low = u
+            else:
+                high = u
+        return bezier(control_values, (low + high) / 2)
+
+    def sample(self, times):
+        return np.array([self.evaluate(time) for time in times])
+
+
+def bezier(points, u):
+    return ((1 - u)**3 * points[0] + 3 * (1 - u)**2 * u * points[1]
+            + 3 * (1 - u) * u**2 * points[2] + u**3 * points[3])
+
+
+TRACKS = {
+    "repeated_linear": [(0, 1, "linear"), (1, 1, "linear"), (2, 1, "linear"), (3, 5, "linear"), (4, 5, "linear")],
+    "collinear": [(0, 0, "linear"), (1, 1, "linear"), (2, 2, "linear"), (4, 4, "linear"), (5, 0, "linear")],
+    "repeated_step": [(0, 2, "step"), (1, 2, "step"), (2, 2, "step"), (3, 0, "step")],
+    "flat_spline": [(0, 0, "spline", 0, 0), (1, 3, "spline", 0, 0), (2, 3, "spline", 0, 0),
+                    (3, 3, "spline", 0, 0), (4, 1, "spline", 0, 0)],
+    "overshooting_spline": [(0, 0, "spline", 0, 0), (1, 3, "spline", 0, 1), (2, 3, "spline", -1, 1),
+                            (3, 3, "spline", -1, 0), (4, 1, "spline", 0, 0)],
+    "spline_into_line": [(0, 0, "spline", 0, 2), (1, 1, "linear", 0.5, 0), (2, 2, "linear"), (3, 3, "spline", 0, 0)],
+}
+
+
+@pytest.mark.parametrize("name", list(TRACKS))
+def test_removing_redundant_keys_keeps_the_curve(name):
+    track = StandInTrack(TRACKS[name])
+    redundant = find_redundant_keys(**track.keys())
+    times = np.linspace(track.times[0] - 1, track.times[-1] + 1, 997)
+    np.testing.assert_allclose(track.remove(redundant).sample(times), track.sample(times), atol=1e-9)
+
+
+def test_redundant_keys_are_found():
+    assert find_redundant_keys(**StandInTrack(TRACKS["repeated_linear"]).keys()).tolist() == [True, True, False, False, True]
+    assert find_redundant_keys(**StandInTrack(TRACKS["collinear"]).keys()).tolist() == [False, True, True, False, False]
+    assert find_redundant_keys(**StandInTrack(TRACKS["flat_spline"]).keys()).tolist() == [False, False, True, False, False]
+
+
+def test_keys_between_spline_tangents_are_kept():
+    redundant = find_redundant_keys(**StandInTrack(TRACKS["overshooting_spline"]).keys())
+    assert not redundant.any()
+
+
+def test_constant_track_is_redundant_as_a_whole():
+    track = StandInTrack([(0, 2, "spline", 0, 0), (1, 2, "linear"), (3, 2, "step")])
+    assert find_redundant_keys(**track.keys()).all()
+    track = StandInTrack([(0, 2, "spline", 0, 0.5), (1, 2, "linear"), (3, 2, "step")])
+    assert not find_redundant_keys(**track.keys()).all()
+
+
+def test_automatic_tangents_of_spline_neighbours_keep_the_key():
+    keys = StandInTrack([(0, 0, "spline"), (1, 1, "spline"), (2, 1, "linear"), (3, 1, "linear"), (4, 0, "spline")]).keys()
+    assert find_redundant_keys(**keys).tolist() == [False, False, True, False, False]
+    # the spline segments before and after the previous key use its recomputed automatic tangents
+    automatic = find_redundant_keys(**keys, auto=[True] * 5)
+    assert automatic.tolist() == [False, False, False, False, False]
+    keys["linear"] = [True, False, True, True, True]
+    assert find_redundant_keys(**keys, auto=[False, True, True, True, True]).tolist() == [False, False, False, False, False]
+    # automatic tangents of neighbours without spline segments around them do not matter
+    keys["linear"] = [True, True, True, True, True]
+    assert find_redundant_keys(**keys, auto=[True] * 5).tolist() == [False, False, True, False, False]
+
+
+def test_short_curves_have_no_redundant_keys():
+    assert find_redundant_keys([], [], [], []).tolist() == []
+    assert find_redundant_keys([0], [1], [False], [True]).tolist() == [False]
+
+
+def test_repeated_data_keys_keep_the_first_key():
+    assert find_repeated_keys([True, True, False, False, True]).tolist() == [False, True, False, True, False]
+    assert find_repeated_keys(["a"]).tolist() == [False]
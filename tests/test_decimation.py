@@ -0,0 +1,69 @@
+from pydeation.geometry.decimation import MinMaxDecimator, simplify_polyline
+import numpy as np
+import pytest
+
+
+def get_series(count=10000, seed=0):
+    rng = np.random.default_rng(seed)
+    xs = np.sort(rng.uniform(0, 100, count))
+    ys = np.cumsum(rng.normal(size=count))
+    return xs, ys
+
+
+def decimate_directly(xs, ys, bin_count):
+    """keeps the first, last, minimum and maximum sample of every bin over the extent of the series"""
+    bin_width = (xs[-1] - xs[0]) / bin_count
+    keys = np.clip(((xs - xs[0]) // bin_width).astype(int), 0, bin_count - 1)
+    kept = []
+    for key in np.unique(keys):
+        indices = np.flatnonzero(keys == key)
+        kept += sorted({indices[0], indices[-1], indices[np.argmin(ys[indices])], indices[np.argmax(ys[indices])]})
+    return np.column_stack([xs[kept], ys[kept]])
+
+
+@pytest.mark.parametrize("chunk_size", [10000, 1000, 7])
+def test_decimator_with_known_range_matches_direct_decimation(chunk_size):
+    xs, ys = get_series()
+    decimator = MinMaxDecimator(100, x_range=(xs[0], xs[-1]))
+    for start in range(0, len(xs), chunk_size):
+        decimator.add(xs[start:start + chunk_size], ys[start:start + chunk_size])
+    np.testing.assert_array_equal(decimator.get_points(), decimate_directly(xs, ys, 100))
+
+
+@pytest.mark.parametrize("chunk_size", [10000, 1000, 7])
+def test_decimator_with_unknown_range_keeps_extremes(chunk_size):
+    xs, ys = get_series()
+    decimator = MinMaxDecimator(100)
+    for start in range(0, len(xs), chunk_size):
+        decimator.add(xs[start:start + chunk_size], ys[start:start + chunk_size])
+    points = decimator.get_points()
+    assert len(points) <= 4 * 100
+    assert np.all(np.diff(points[:, 0]) >= 0)
+    # every point is a sample and the first, last and extreme samples are kept
+    samples = {tuple(sample) for sample in np.column_stack([xs, ys]).tolist()}
+    assert all(tuple(point) in samples for point in points.tolist())
+    for index in (0, -1, np.argmin(ys), np.argmax(ys)):
+        assert [xs[index], ys[index]] in points.tolist()
+    assert decimator.get_extent() == ((xs[0], xs[-1]), (ys.min(), ys.max()))
+
+
+def test_empty_decimator():
+    decimator = MinMaxDecimator(10)
+    decimator.add([], [])
+    assert decimator.get_points().shape == (0, 2)
+
+
+def test_simplify_polyline_stays_within_epsilon():
+    xs, ys = get_series(count=2000)
+    points = np.column_stack([xs, ys])
+    simplified = simplify_polyline(points, 0.5)
+    assert len(simplified) < len(points)
+    np.testing.assert_array_equal(simplified[[0, -1]], points[[0, -1]])
+    # every removed point lies within epsilon of the chord between its kept neighbours
+    kept = np.flatnonzero(np.isin(xs, simplified[:, 0]))
+    for start, stop in zip(kept[:-1], kept[1:]):
+        chord = points[stop] - points[start]
+        offsets = points[start:stop + 1] - points[start]
+        weights = np.clip(offsets @ chord / (chord @ chord), 0, 1)
+        distances = np.linalg.norm(offsets - weights[:, None] * chord, axis=1)
+        assert distances.max() <= 0.5 + 1e-9
@@ -0,0 +1,57 @@
+from pydeation.animation.easing import (EASINGS, CubicBezier, get_easing, check_key_mode,
+                                        sample_dense, sample_adaptive, get_bezier_tangents)
+import numpy as np
+import pytest
+
+
+@pytest.mark.parametrize("name", list(EASINGS))
+def test_easings_fix_the_endpoints(name):
+    np.testing.assert_allclose(EASINGS[name](np.array([0.0, 1.0])), [0, 1], atol=1e-9)
+
+
+@pytest.mark.parametrize("easing", [easing for easing in EASINGS.values() if isinstance(easing, CubicBezier)] +
+                         [CubicBezier(*control_points) for control_points in
+                          np.random.default_rng(0).uniform([0, -1, 0, -1], [1, 2, 1, 2], (20, 4))])
+def test_cubic_bezier_solve_inverts_x(easing):
+    s = np.linspace(0, 1, 1001)
+    u = easing.solve(s)
+    assert np.abs(easing.bezier(u, easing.x1, easing.x2) - s).max() < 1e-6
+
+
+def test_cubic_bezier_rejects_x_outside_unit_interval():
+    with pytest.raises(ValueError):
+        CubicBezier(1.5, 0, 0.5, 1)
+
+
+@pytest.mark.parametrize("name", ["linear", "cubic_in_out", "back_out", "elastic_in", "ease"])
+@pytest.mark.parametrize("tolerance", [1e-2, 1e-3])
+def test_sample_adaptive_stays_within_tolerance(name, tolerance):
+    values = sample_dense(name, 500)
+    kept = sample_adaptive(values, tolerance=tolerance)
+    assert kept[0] == 0 and kept[-1] == len(values) - 1
+    assert np.all(np.diff(kept) > 0)
+    positions = np.arange(len(values))
+    assert np.abs(np.interp(positions, kept, values[kept]) - values).max() <= tolerance
+    if name == "linear":
+        assert len(kept) == 2
+
+
+def test_unknown_names_raise():
+    assert get_easing(None) is None
+    assert get_easing(np.sqrt) is np.sqrt
+    with pytest.raises(ValueError):
+        get_easing("bounce")
+    with pytest.raises(ValueError):
+        check_key_mode(None, "sparse")
+    with pytest.raises(ValueError):
+        check_key_mode(EASINGS["cubic_in"], "tangents")
+    check_key_mode(EASINGS["ease"], "tangents")
+    check_key_mode(EASINGS["cubic_in"], "dense")
+
+
+def test_bezier_tangents():
+    with pytest.raises(ValueError):
+        get_bezier_tangents(EASINGS["cubic_in"], 10, 1)
+    tangent_right, tangent_left = get_bezier_tangents(CubicBezier(0.25, 0.1, 0.75, 1.2), 10, 2)
+    np.testing.assert_allclose(tangent_right, (2.5, 0.2))
+    np.testing.assert_allclose(tangent_left, (-2.5, 0.4))
@@ -0,0 +1,51 @@
+from pydeation.geometry.edges import edge_count, unrank_edges, sample_edges, iterate_edges
+import numpy as np
+import pytest
+
+
+@pytest.mark.parametrize("node_count", [2, 3, 10, 257, 2000])
+def test_unrank_edges_matches_triu_indices(node_count):
+    rows, columns = np.triu_indices(node_count, k=1)
+    edges = unrank_edges(np.arange(edge_count(node_count)), node_count)
+    np.testing.assert_array_equal(edges, np.column_stack([rows, columns]))
+
+
+def test_unrank_edges_at_row_boundaries_of_large_graphs():
+    # the square root loses precision for large ranks so the row boundaries are the critical ranks
+    node_count = 10**7
+    rows = np.array([1, 2, node_count // 3, node_count // 2, node_count - 2])
+    row_starts = rows * (2 * node_count - rows - 1) // 2
+    edges = unrank_edges(np.concatenate([row_starts, row_starts - 1]), node_count)
+    expected = np.concatenate([np.column_stack([rows, rows + 1]),
+                               np.column_stack([rows - 1, np.full(len(rows), node_count - 1)])])
+    np.testing.assert_array_equal(edges, expected)
+
+
+@pytest.mark.parametrize("completeness", [0, 0.01, 0.3, 0.5, 0.7, 0.99, 1])
+def test_sample_edges_returns_unique_sorted_pairs(completeness):
+    node_count = 500
+    edges = sample_edges(node_count, completeness=completeness, random_seed=0)
+    assert edges.shape == (round(edge_count(node_count) * completeness), 2)
+    assert np.all(edges[:, 0] < edges[:, 1])
+    # pairs are ordered by rank and therefore unique
+    ranks = edges[:, 0] * (2 * node_count - edges[:, 0] - 1) // 2 + edges[:, 1] - edges[:, 0] - 1
+    assert np.all(np.diff(ranks) > 0)
+    np.testing.assert_array_equal(edges, sample_edges(node_count, completeness=completeness, random_seed=0))
+
+
+def test_sample_all_edges():
+    node_count = 300
+    np.testing.assert_array_equal(sample_edges(node_count, completeness=1),
+                                  np.column_stack(np.triu_indices(node_count, k=1)))
+    chunks = list(iterate_edges(node_count, completeness=1, chunk_size=1000))
+    assert max(len(chunk) for chunk in chunks) == 1000
+    np.testing.assert_array_equal(np.concatenate(chunks), np.column_stack(np.triu_indices(node_count, k=1)))
+
+
+def test_sample_edges_of_huge_graph():
+    # a permutation of the half a trillion edge ranks would not fit into memory
+    node_count = 10**6
+    edges = sample_edges(node_count, completeness=1e-8, random_seed=0)
+    assert len(edges) == round(edge_count(node_count) * 1e-8)
+    assert np.all((edges[:, 0] < edges[:, 1]) & (edges[:, 1] < node_count))
+    assert len(np.unique(edges, axis=0)) == len(edges)
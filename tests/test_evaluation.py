@@ -0,0 +1,120 @@
+from pydeation.animation.evaluation import (ParameterEvaluator, evaluate_keys, evaluate_formula, get_param_id,
+                                            SPLINE, LINEAR, STEP)
+from pydeation.animation.schedule import AnimationSchedule
+import numpy as np
+import pytest
+
+PARAM = 1001
+COMPLETION = 2001
+TARGET_VALUE = 2002
+
+
+class StandInTarget:
+    """holds static parameter values like an atom"""
+
+    def __init__(self, values=None):
+        self.obj = {PARAM: 0.0, COMPLETION: 0.0, TARGET_VALUE: 0.0}
+        self.obj.update(values or {})
+        self.accessed_parameters = {}
+        self.xpressions = {}
+
+
+class StandInEvaluator(ParameterEvaluator):
+    """reads the keys of the parameters from a dictionary instead of the animations of the schedule"""
+
+    def __init__(self, keys, fps=30):
+        super().__init__(AnimationSchedule(), fps)
+        self.keys = keys
+
+    def get_keys(self, target, param_id):
+        return self.keys.get((id(target), param_id), ([], [], []))
+
+
+class StandIn:
+    def __init__(self, **attributes):
+        self.__dict__.update(attributes)
+
+
+def drive(target, source, interpolate=False, reverse=False):
+    """drives the parameter of the target by an input source like an xanimator"""
+    access_control = StandIn(input_sources=[(source, interpolate, None)], link_target=None, target=target,
+                             parameter=StandIn(desc_id=PARAM), reverse_parameter_range=reverse)
+    target.accessed_parameters[str(PARAM)] = StandIn(access_control=access_control)
+
+
+def create_source(target, formula=None):
+    return StandIn(target=target, completion_slider=StandIn(desc_id=COMPLETION), udatas=[], param_names=[],
+                   formula=formula, interpolation_target=StandIn(desc_id=TARGET_VALUE))
+
+
+def test_evaluate_keys_interpolates_by_segment():
+    times = [0, 5, 10, 15, 20, 25]
+    values = evaluate_keys([0, 10, 20], [0, 10, 30], [LINEAR, STEP, SPLINE], times)
+    np.testing.assert_allclose(values, [0, 5, 10, 10, 30, 30])
+    spline = evaluate_keys([0, 10], [0, 1], [SPLINE, SPLINE], [2.5, 5, 7.5])
+    np.testing.assert_allclose(spline, [0.15625, 0.5, 0.84375])
+
+
+def test_evaluate_keys_is_constant_outside_and_keeps_the_last_coincident_key():
+    values = evaluate_keys([10, 0, 10], [4, 2, 6], [LINEAR, LINEAR, LINEAR], [-5, 0, 5, 10, 15])
+    np.testing.assert_allclose(values, [2, 2, 4, 6, 6])
+    np.testing.assert_allclose(evaluate_keys([3], [7], [SPLINE], [0, 3, 9]), [7, 7, 7])
+
+
+def test_evaluate_formula_follows_the_xpresso_syntax():
+    t = np.array([0.0, 0.5, 1.0])
+    np.testing.assert_allclose(evaluate_formula("t^2*100", {"t": t}), [0, 25, 100])
+    np.testing.assert_allclose(evaluate_formula("round(t*3)-Pi", {"t": t}), np.array([0, 2, 3]) - np.pi)
+    np.testing.assert_allclose(evaluate_formula("round(x)", {"x": np.array([-2.5, -0.5, 0.5, 2.5])}), [-3, -1, 1, 3])
+    with pytest.raises(NameError):
+        evaluate_formula("__import__('os')", {"t": t})
+
+
+def test_get_param_id_passes_parameter_ids():
+    assert get_param_id(5) == 5
+    assert get_param_id((903, 1000)) == (903, 1000)
+
+
+def test_keyed_parameter_follows_its_curve():
+    target = StandInTarget()
+    evaluator = StandInEvaluator({(id(target), PARAM): ([0, 30], [0, 60], [LINEAR, LINEAR])})
+    np.testing.assert_allclose(evaluator.values_over(target, PARAM, [0, 0.5, 1, 2]), [0, 30, 60, 60])
+
+
+def test_unkeyed_parameter_holds_its_static_value():
+    target = StandInTarget({PARAM: 12.5})
+    np.testing.assert_allclose(StandInEvaluator({}).evaluate(target, PARAM, [0, 10, 100]), 12.5)
+
+
+def test_formula_source_drives_the_parameter_while_active():
+    target = StandInTarget({PARAM: 7})
+    drive(target, create_source(target, formula="t*100"))
+    completion = ([10, 20], [0, 1], [LINEAR, LINEAR])
+    evaluator = StandInEvaluator({(id(target), COMPLETION): completion})
+    values = evaluator.evaluate(target, PARAM, np.arange(30))
+    # the parameter holds its value until the completion starts and after it ends
+    np.testing.assert_allclose(values[:11], 7)
+    np.testing.assert_allclose(values[11:20], np.arange(1, 10) * 10)
+    np.testing.assert_allclose(values[20:], values[19])
+    # times between frames take the value of the frame
+    assert evaluator.evaluate(target, PARAM, [15.5])[0] == values[15]
+
+
+def test_interpolating_source_moves_from_the_held_value_to_its_target():
+    target = StandInTarget({PARAM: 10, TARGET_VALUE: 50})
+    drive(target, create_source(target), interpolate=True)
+    evaluator = StandInEvaluator({(id(target), COMPLETION): ([5, 15], [0, 1], [LINEAR, LINEAR])})
+    values = evaluator.evaluate(target, PARAM, np.arange(25))
+    np.testing.assert_allclose(values[:6], 10)
+    assert np.all(np.diff(values[5:16]) >= 0)
+    np.testing.assert_allclose(values[15:], 50)
+
+
+def test_reversed_parameter_range_mirrors_the_values():
+    target = StandInTarget({PARAM: 0.25})
+    drive(target, create_source(target, formula="t"), reverse=True)
+    evaluator = StandInEvaluator({(id(target), COMPLETION): ([0, 10], [0, 1], [LINEAR, LINEAR])})
+    values = evaluator.evaluate(target, PARAM, np.arange(12))
+    assert values[0] == 0.25
+    # the driver output is mapped onto the reversed parameter range
+    np.testing.assert_allclose(values[1:10], 1 - np.arange(1, 10) / 10)
@@ -0,0 +1,25 @@
+import pydeation.imports as pd
+import pytest
+
+
+def test_star_import_binds_the_names_of_the_former_star_imports():
+    assert len(pd.__all__) == len(set(pd.__all__))
+    origins = pd.get_origins()
+    assert set(pd.__all__) <= set(origins)
+    # helpers and standard library modules imported by newer code stay out of user scenes
+    for name in ("build_cache", "batch", "render", "stats", "timeline", "sys", "json", "time", "subprocess",
+                 "inspect", "Snapshot", "TimelineWriter", "sample_edges"):
+        assert name not in pd.__all__
+    assert {"Scene", "Circle", "Draw", "Morph", "Group", "WHITE", "np", "c4d"} <= set(pd.__all__)
+
+
+def test_names_resolve_to_their_defining_module():
+    origins = pd.get_origins()
+    assert origins["Circle"] == ("pydeation.objects.line_objects", "Circle")
+    assert origins["Stagger"] == ("pydeation.animation.composed_animators", "Stagger")
+    assert origins["np"] == ("numpy", None)
+
+
+def test_unknown_names_raise_attribute_errors():
+    with pytest.raises(AttributeError):
+        pd.NotAPydeationName
@@ -0,0 +1,60 @@
+import pytest
+
+# the morph rigs are built from cinema 4d objects, run e.g. using c4dpy -m pytest
+c4d = pytest.importorskip("c4d")
+
+from pydeation.animation.transition_animators import Morph
+from pydeation.objects.line_objects import Circle, Rectangle
+
+
+@pytest.fixture(autouse=True)
+def document():
+    document = c4d.documents.BaseDocument()
+    c4d.documents.InsertBaseDocument(document)
+    c4d.documents.SetActiveDocument(document)
+    yield document
+    c4d.documents.KillDocument(document)
+
+
+def get_rig(spline_ini, spline_fin):
+    rigs = [rig for rig_key, rig in spline_ini.helper_objects["morph_rigs"].items() if rig_key[0] is spline_fin]
+    assert len(rigs) == 1
+    return rigs[0]
+
+
+def assert_wired(spline_ini, rig):
+    xanimator = spline_ini.xpressions[("Morph", rig["morph_setup"])]
+    parameters = [parameter for parameter_key, parameter in spline_ini.accessed_parameters.items()
+                  if isinstance(parameter_key, tuple) and parameter_key[1] is rig["field"]]
+    assert len(parameters) == 1
+    assert parameters[0].link_target is rig["field"]
+    return xanimator
+
+
+def test_morph_chain_wires_a_rig_per_step():
+    spline_a, spline_b, spline_c = Circle(), Rectangle(), Circle(radius=50)
+    Morph(spline_a, spline_b)
+    Morph(spline_b, spline_c)
+    rig_ab = get_rig(spline_a, spline_b)
+    rig_bc = get_rig(spline_b, spline_c)
+    assert rig_ab["field"] is not rig_bc["field"]
+    assert_wired(spline_a, rig_ab)
+    assert_wired(spline_b, rig_bc)
+
+
+def test_morphs_from_one_spline_drive_their_own_rigs():
+    spline_a, spline_b, spline_c = Circle(), Rectangle(), Circle(radius=50)
+    Morph(spline_a, spline_b)
+    Morph(spline_a, spline_c)
+    xanimator_ab = assert_wired(spline_a, get_rig(spline_a, spline_b))
+    xanimator_ac = assert_wired(spline_a, get_rig(spline_a, spline_c))
+    assert xanimator_ab is not xanimator_ac
+
+
+def test_repeated_morph_reuses_its_rig_and_xanimator():
+    spline_a, spline_b = Circle(), Rectangle()
+    Morph(spline_a, spline_b)
+    xanimators = dict(spline_a.xpressions)
+    Morph(spline_a, spline_b)
+    assert len(spline_a.helper_objects["morph_rigs"]) == 1
+    assert spline_a.xpressions == xanimators
@@ -0,0 +1,94 @@
+from pydeation.render import Renderer, RenderOrchestrator
+import threading
+import os
+import pytest
+
+
+class StandInRenderer(Renderer):
+    """writes the frame number into text files instead of rendering images
+    chunks listed in failing raise that many times, frames listed in skipped are never written"""
+
+    def __init__(self, failing=None, skipped=()):
+        self.failing = dict(failing or {})
+        self.skipped = set(skipped)
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def render(self, document_path, first_frame, last_frame, output_prefix):
+        with self.lock:
+            self.calls.append((first_frame, last_frame))
+            if self.failing.get(first_frame, 0) > 0:
+                self.failing[first_frame] -= 1
+                raise RuntimeError(f"renderer crashed on frame {first_frame}")
+        for frame in range(first_frame, last_frame + 1):
+            if frame not in self.skipped:
+                with open(self.get_frame_path(output_prefix, frame), "w") as frame_file:
+                    frame_file.write(str(frame))
+
+    def get_frame_path(self, output_prefix, frame):
+        return f"{output_prefix}{frame:04d}.txt"
+
+
+def create_orchestrator(tmp_path, renderer, frame_range=(10, 134), chunk_size=50, retries=1):
+    return RenderOrchestrator(tmp_path / "scene.c4d", tmp_path / "render", frame_range,
+                              renderer=renderer, chunk_size=chunk_size, workers=2, retries=retries)
+
+
+def test_chunks_cover_the_frame_range():
+    orchestrator = RenderOrchestrator("scene.c4d", "render", (10, 134), renderer=StandInRenderer(), chunk_size=50)
+    assert orchestrator.get_chunks() == [(10, 59), (60, 109), (110, 134)]
+    orchestrator.first_frame, orchestrator.last_frame = 0, 0
+    assert orchestrator.get_chunks() == [(0, 0)]
+
+
+def test_render_concatenates_the_chunks_in_order(tmp_path):
+    renderer = StandInRenderer()
+    directory = create_orchestrator(tmp_path, renderer).run()
+    file_names = sorted(os.listdir(directory))
+    assert len(file_names) == 125
+    assert file_names[0] == "frame_000000.txt" and file_names[-1] == "frame_000124.txt"
+    for index in (0, 49, 50, 124):
+        with open(os.path.join(directory, f"frame_{index:06d}.txt")) as frame_file:
+            assert frame_file.read() == str(index + 10)
+    # concatenating again replaces the links
+    assert len(os.listdir(create_orchestrator(tmp_path, renderer).concatenate())) == 125
+
+
+def test_render_resumes_by_skipping_done_chunks(tmp_path):
+    renderer = StandInRenderer(failing={60: 2})
+    orchestrator = create_orchestrator(tmp_path, renderer)
+    assert not orchestrator.render()
+    assert list(orchestrator.failures) == [(60, 109)]
+    assert "renderer crashed" in orchestrator.failures[(60, 109)]
+    renderer.calls.clear()
+    resumed = create_orchestrator(tmp_path, renderer)
+    assert resumed.render()
+    assert renderer.calls == [(60, 109)]
+    assert resumed.failures == {}
+
+
+def test_failed_chunk_is_retried(tmp_path):
+    renderer = StandInRenderer(failing={110: 1})
+    orchestrator = create_orchestrator(tmp_path, renderer, retries=1)
+    assert orchestrator.render()
+    assert sorted(renderer.calls) == [(10, 59), (60, 109), (110, 134), (110, 134)]
+    assert orchestrator.failures == {}
+
+
+def test_chunk_with_missing_frames_is_not_done(tmp_path):
+    renderer = StandInRenderer(skipped={75})
+    orchestrator = create_orchestrator(tmp_path, renderer, retries=0)
+    assert orchestrator.run() is None
+    assert orchestrator.failures == {(60, 109): "missing frames [75]"}
+    assert not orchestrator.is_done((60, 109))
+    assert orchestrator.is_done((10, 59))
+    renderer.skipped.clear()
+    assert create_orchestrator(tmp_path, renderer, retries=0).render()
+
+
+@pytest.mark.parametrize("retries", [0, 2])
+def test_persistent_failure_gives_up_after_the_retries(tmp_path, retries):
+    renderer = StandInRenderer(failing={10: 10})
+    orchestrator = create_orchestrator(tmp_path, renderer, frame_range=(10, 20), retries=retries)
+    assert not orchestrator.render()
+    assert renderer.calls == [(10, 20)] * (retries + 1)
@@ -0,0 +1,50 @@
+from pydeation.animation.schedule import IntervalTree, AnimationSchedule
+import numpy as np
+import pytest
+
+
+def overlap_directly(starts, stops, start, stop):
+    return np.flatnonzero((np.asarray(starts) <= stop) & (np.asarray(stops) >= start))
+
+
+@pytest.mark.parametrize("count", [0, 1, 2, 7, 200])
+def test_interval_tree_matches_linear_scan(count):
+    rng = np.random.default_rng(count)
+    starts = rng.integers(0, 100, count).astype(float)
+    # include degenerate intervals of zero length
+    stops = starts + rng.integers(0, 20, count) * (rng.random(count) < 0.8)
+    tree = IntervalTree(starts, stops)
+    assert len(tree) == count
+    for start in range(-5, 125, 3):
+        for length in (0, 1, 10):
+            np.testing.assert_array_equal(tree.overlapping(start, start + length),
+                                          overlap_directly(starts, stops, start, start + length))
+        np.testing.assert_array_equal(tree.active_at(start), overlap_directly(starts, stops, start, start))
+
+
+class StubAnimation:
+
+    def __init__(self, target, param_id, frame_start, frame_stop=None):
+        self.target = target
+        self.param_id = param_id
+        self.frame_start = frame_start
+        if frame_stop is not None:
+            self.frame_stop = frame_stop
+
+
+def test_animation_schedule_queries():
+    target = object()
+    animations = [StubAnimation(target, "x", 0, 10), StubAnimation(target, "x", 10, 20),
+                  StubAnimation(target, "y", 5), StubAnimation(object(), "x", 15, 16)]
+    schedule = AnimationSchedule()
+    schedule.add(animations[:2])
+    assert schedule.active_at(9) == animations[:1]
+    schedule.add(animations[2:])
+    # windows are half open so the first animation ends before frame ten
+    assert schedule.active_at(10) == animations[1:2]
+    assert schedule.active_at(5) == [animations[0], animations[2]]
+    assert schedule.active_at(15) == [animations[1], animations[3]]
+    assert schedule.overlapping(9, 15) == animations[:2] + animations[3:]
+    assert schedule.find(target, "x") == [0, 1]
+    assert schedule.find(target, "z") == []
+    assert AnimationSchedule().active_at(0) == []
@@ -0,0 +1,45 @@
+from pydeation.geometry.spatial import SpatialIndex
+import numpy as np
+import pytest
+
+
+def get_position_sets():
+    rng = np.random.default_rng(0)
+    return {
+        "uniform": rng.uniform(size=(300, 3)),
+        "outlier": np.vstack([rng.normal(size=(300, 3)), [[1e6, 0, 0]]]),
+        "duplicates": np.repeat(rng.normal(size=(75, 3)), 4, axis=0),
+        "planar": np.column_stack([rng.normal(size=(300, 2)), np.zeros(300)]),
+    }
+
+
+def brute_force_distances(positions):
+    distances = np.linalg.norm(positions[:, None] - positions[None], axis=2)
+    np.fill_diagonal(distances, np.inf)
+    return distances
+
+
+@pytest.mark.parametrize("name", get_position_sets())
+@pytest.mark.parametrize("k", [1, 4, 12])
+def test_knn_matches_brute_force(name, k):
+    positions = get_position_sets()[name]
+    neighbours, distances = SpatialIndex(positions, leaf_size=8).knn(k)
+    expected = np.sort(brute_force_distances(positions), axis=1)[:, :k]
+    np.testing.assert_allclose(distances, expected)
+    np.testing.assert_allclose(np.linalg.norm(positions[neighbours] - positions[:, None], axis=2), expected)
+
+
+@pytest.mark.parametrize("name", get_position_sets())
+def test_radius_edges_match_brute_force(name):
+    positions = get_position_sets()[name]
+    edges = SpatialIndex(positions, leaf_size=8).radius_edges(0.3)
+    expected = np.argwhere(np.triu(brute_force_distances(positions) <= 0.3, k=1))
+    np.testing.assert_array_equal(np.unique(edges, axis=0), expected)
+
+
+@pytest.mark.parametrize("count", [0, 1, 2])
+def test_small_position_sets(count):
+    index = SpatialIndex(np.zeros((count, 3)))
+    neighbours, _ = index.knn(4)
+    assert neighbours.shape == (count, max(count - 1, 0))
+    assert len(index.gabriel_edges()) == (1 if count == 2 else 0)
@@ -0,0 +1,85 @@
+from pydeation.stats import flatten_statistics, diff_statistics, save_statistics, load_statistics
+import pytest
+
+REPORT_INI = {
+    "scene": "Intro",
+    "objects": {"Circle": 4, "Rectangle": 2},
+    "document_objects": {"Spline": 6, "Null": 3},
+    "tags": {"XPresso": 24, "Sketch Style": 6},
+    "xpresso_nodes": {"Object": 96, "Formula": 12},
+    "user_data": 40,
+    "tracks": 30,
+    "keys": 120,
+    "sections": {"start": 0.5, "intro": 1.25},
+    "build_time": 1.75
+}
+
+REPORT_FIN = {
+    "scene": "Intro",
+    "objects": {"Circle": 4, "Rectangle": 2, "Text": 1},
+    "document_objects": {"Spline": 7, "Null": 3},
+    "tags": {"XPresso": 12, "Sketch Style": 6},
+    "xpresso_nodes": {"Object": 48},
+    "user_data": 40,
+    "tracks": 30,
+    "keys": 80,
+    "sections": {"start": 0.5, "intro": 0.75},
+    "build_time": 1.25
+}
+
+
+def test_flatten_statistics_uses_dotted_keys_and_skips_text():
+    flat_report = flatten_statistics(REPORT_INI)
+    assert flat_report["objects.Circle"] == 4
+    assert flat_report["xpresso_nodes.Formula"] == 12
+    assert flat_report["sections.intro"] == 1.25
+    assert flat_report["keys"] == 120
+    assert "scene" not in flat_report
+    assert flatten_statistics({"a": {"b": {"c": 1}}, "d": [1, 2]}) == {"a.b.c": 1}
+
+
+def test_diff_statistics_reports_changes_sorted_by_size():
+    changes = diff_statistics(REPORT_INI, REPORT_FIN)
+    assert changes == {
+        "xpresso_nodes.Object": (96, 48, -48),
+        "keys": (120, 80, -40),
+        "tags.XPresso": (24, 12, -12),
+        "xpresso_nodes.Formula": (12, 0, -12),
+        "objects.Text": (0, 1, 1),
+        "document_objects.Spline": (6, 7, 1),
+        "sections.intro": (1.25, 0.75, -0.5),
+        "build_time": (1.75, 1.25, -0.5)
+    }
+    assert list(changes)[:2] == ["xpresso_nodes.Object", "keys"]
+    sizes = [abs(change) for _, _, change in changes.values()]
+    assert sizes == sorted(sizes, reverse=True)
+    assert diff_statistics(REPORT_INI, REPORT_INI) == {}
+
+
+def test_saved_report_loads_unchanged(tmp_path):
+    path = tmp_path / "intro.json"
+    save_statistics(REPORT_INI, path)
+    assert load_statistics(path) == REPORT_INI
+    assert diff_statistics(load_statistics(path), REPORT_FIN) == diff_statistics(REPORT_INI, REPORT_FIN)
+
+
+def test_collect_statistics_counts_the_document():
+    c4d = pytest.importorskip("c4d")
+    from pydeation.stats import collect_statistics
+
+    class StandInScene:
+        scene_name = "StandIn"
+        objects = []
+        section_times = {"start": 0.25, "main": 0.5}
+
+        def __init__(self):
+            self.document = c4d.documents.BaseDocument()
+            null = c4d.BaseObject(c4d.Onull)
+            null.InsertTag(c4d.BaseTag(c4d.Texpresso))
+            self.document.InsertObject(null)
+            c4d.BaseObject(c4d.Ocube).InsertUnder(null)
+
+    report = collect_statistics(StandInScene())
+    assert sum(report["document_objects"].values()) == 2
+    assert sum(report["tags"].values()) == 1
+    assert report["build_time"] == 0.75
@@ -0,0 +1,90 @@
+import pytest
+
+# timelines hold description ids and tracks of cinema 4d atoms, run e.g. using c4dpy -m pytest
+c4d = pytest.importorskip("c4d")
+
+from pydeation.timeline import TimelineWriter, TimelineReader, ObjectIds, replay_timeline, get_param_key
+
+POS_X = c4d.DescID(c4d.DescLevel(c4d.ID_BASEOBJECT_POSITION, c4d.DTYPE_VECTOR, 0),
+                   c4d.DescLevel(c4d.VECTOR_X, c4d.DTYPE_REAL, 0))
+KEYS = [(0, 0.0, c4d.CINTERPOLATION_LINEAR), (10, 50.0, c4d.CINTERPOLATION_SPLINE),
+        (25, -20.0, c4d.CINTERPOLATION_STEP), (40, 5.0, c4d.CINTERPOLATION_SPLINE)]
+
+
+class StandInObject:
+    """holds an atom like the pydeation objects"""
+
+    def __init__(self, document, name):
+        self.name = name
+        self.obj = c4d.BaseObject(c4d.Ocube)
+        document.InsertObject(self.obj)
+
+
+def create_scene():
+    document = c4d.documents.BaseDocument()
+    document.SetFps(30)
+    objects = [StandInObject(document, "Box"), StandInObject(document, "Box"), StandInObject(document, None)]
+    return document, objects
+
+
+def add_keys(atom, keys):
+    track = c4d.CTrack(atom, POS_X)
+    atom.InsertTrackSorted(track)
+    curve = track.GetCurve()
+    for frame, value, interpolation in keys:
+        key = curve.AddKey(c4d.BaseTime(frame, 30))["key"]
+        key.SetValue(curve, value)
+        key.SetInterpolation(curve, interpolation)
+
+
+def read_keys(atom):
+    curve = atom.FindCTrack(POS_X).GetCurve()
+    keys = [curve.GetKey(index) for index in range(curve.GetKeyCount())]
+    return [(key.GetTime().GetFrame(30), key.GetValue(), key.GetInterpolation()) for key in keys]
+
+
+def test_object_ids_are_stable_and_distinct():
+    _, objects = create_scene()
+    ids = [ObjectIds(objects).get_id(obj) for obj in objects]
+    assert ids == ["StandInObject:Box:0", "StandInObject:Box:1", "StandInObject::0"]
+    assert [ObjectIds(objects).get_id(obj) for obj in objects] == ids
+
+
+def test_timeline_round_trip(tmp_path):
+    document, objects = create_scene()
+    add_keys(objects[1].obj, KEYS)
+    path = str(tmp_path / "timeline.npz")
+    writer = TimelineWriter(path, objects, fps=30, buffer_size=3)
+    writer.add_row(writer.object_ids.get_id(objects[0]), POS_X, 0, 1.5, "start")
+    writer.add_row(writer.object_ids.get_id(objects[0]), POS_X, 29, c4d.Vector(1, 2, 3), "stop")
+    writer.add_tracks(document)
+    writer.close()
+
+    reader = TimelineReader(path)
+    assert len(reader) == 2 + len(KEYS)
+    keys = reader.keys_for("StandInObject:Box:1", param=POS_X)
+    assert keys["frame"].tolist() == [frame for frame, _, _ in KEYS]
+    assert keys["value"].tolist() == [value for _, value, _ in KEYS]
+    assert keys["interpolation"].tolist() == [interpolation for _, _, interpolation in KEYS]
+    rows = reader.select(object_id="StandInObject:Box:0")
+    assert [reader.kinds[kind] for kind in rows["kind"]] == ["start", "stop"]
+    assert rows["value"][0] == 1.5 and rows["value"][1] != rows["value"][1]  # vectors are not scalar
+    assert reader.select(frames=(10, 25), kind="key")["frame"].tolist() == [10, 25]
+    assert reader.params == [get_param_key(POS_X)]
+
+    replay_document, replay_objects = create_scene()
+    report = replay_timeline(reader, replay_objects, replay_document)
+    assert report == {"keys": len(KEYS), "tracks": 1, "unmatched_tracks": 0, "unsupported_tracks": []}
+    assert read_keys(replay_objects[1].obj) == KEYS
+    assert replay_objects[0].obj.FindCTrack(POS_X) is None
+
+
+def test_reader_selects_nothing_for_unknown_ids(tmp_path):
+    document, objects = create_scene()
+    path = str(tmp_path / "timeline.npz")
+    writer = TimelineWriter(path, objects)
+    writer.add_tracks(document)
+    writer.close()
+    reader = TimelineReader(path)
+    assert len(reader) == 0
+    assert len(reader.keys_for("StandInObject:Box:0")["frame"]) == 0
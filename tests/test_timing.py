@@ -0,0 +1,30 @@
+from pydeation.animation.timing import to_seconds, to_frame
+from fractions import Fraction
+import pytest
+
+
+def test_to_frame_rounds_halves_up():
+    assert to_frame(0.5, 25) == 13
+    assert to_frame(0.02, 25) == 1
+    assert to_frame(0.15, 30) == 5
+    assert to_frame(Fraction(1, 60), 30) == 1
+    assert to_frame(1 / 3, 30) == 10
+    assert to_frame(0.1 * 3, 30) == 9
+
+
+@pytest.mark.parametrize("run_time, fps, count", [(0.5, 25, 2), (0.5, 25, 101), (1 / 3, 25, 30),
+                                                  (0.1, 24, 1000), (0.07, 30, 77), (1.01, 60, 500)])
+def test_consecutive_plays_add_up_to_the_rounded_total(run_time, fps, count):
+    # the scene accumulates the exact elapsed time and only rounds the absolute boundaries
+    elapsed_time = to_seconds(0)
+    frame = 0
+    play_lengths = []
+    for _ in range(count):
+        elapsed_time += to_seconds(run_time)
+        frame_fin = to_frame(elapsed_time, fps)
+        play_lengths.append(frame_fin - frame)
+        frame = frame_fin
+    assert sum(play_lengths) == to_frame(to_seconds(run_time) * count, fps)
+    # every play lasts its run time rounded down or up
+    exact_length = to_seconds(run_time) * fps
+    assert all(abs(length - exact_length) < 1 for length in play_lengths)
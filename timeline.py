@@ -0,0 +1,345 @@
+from pydeation.animation.animation import VectorAnimation, StateAnimation
+from pydeation.utils import iterate_atoms
+from collections import Counter
+import numpy as np
+import tempfile
+import zipfile
+import shutil
+import os
+import c4d
+
+# columns of the timeline file and their data types
+COLUMNS = {"object": np.int32, "param": np.int32,
+           "frame": np.int64, "value": np.float64, "kind": np.int8,
+           "interpolation": np.int8, "time_left": np.float64, "value_left": np.float64,
+           "time_right": np.float64, "value_right": np.float64}
+
+# values of the key columns for rows without them e.g. animations and files written before they were added,
+# no interpolation leaves the default and nan tangents leave the automatic tangents
+KEY_DEFAULTS = {"interpolation": -1, "time_left": np.nan, "value_left": np.nan,
+                "time_right": np.nan, "value_right": np.nan}
+
+# kinds of rows, animations contribute their start and stop, tracks their keys
+KINDS = ("start", "stop", "state", "key")
+
+
+def get_param_key(desc_id):
+    """returns a string identifying the parameter of a description id or parameter id"""
+    if isinstance(desc_id, c4d.DescID):
+        desc_id = tuple(desc_id[level].id for level in range(desc_id.GetDepth()))
+    if not isinstance(desc_id, tuple):
+        desc_id = (desc_id,)
+    return ".".join(str(level) for level in desc_id)
+
+
+def get_description(desc_id):
+    """returns a string holding the id, data type and creator of every level of a description id"""
+    return "|".join(f"{desc_id[level].id},{desc_id[level].dtype},{desc_id[level].creator}"
+                    for level in range(desc_id.GetDepth()))
+
+
+def parse_description(description):
+    """returns the description id encoded by get_description"""
+    levels = [c4d.DescLevel(*map(int, level.split(",")))
+              for level in description.split("|")]
+    return c4d.DescID(*levels)
+
+
+def to_scalar(value):
+    """converts a value to float, non scalar values become nan"""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def get_name(obj):
+    """returns the name of an object or an empty string if it has none"""
+    name = getattr(obj, "name", None)
+    return "" if name is None else name
+
+
+def write_array_to_zip(archive, name, array):
+    """writes an array as npy member of an open zip file"""
+    with archive.open(f"{name}.npy", "w", force_zip64=True) as member:
+        np.lib.format.write_array(member, np.asarray(array))
+
+
+class ObjectIds:
+    """assigns stable ids to pydeation objects from their class, name and occurrence in creation order
+    materials are identified by the object they are linked to"""
+
+    def __init__(self, objects):
+        self.objects = objects  # grows while the scene is constructed
+        self.processed_count = 0
+        self.counts = Counter()
+        self.ids = {}
+
+    def update(self):
+        """assigns ids to the objects created since the last update
+        objects without a name yet, e.g. while they are constructed, share the empty name and differ by occurrence"""
+        for obj in self.objects[self.processed_count:]:
+            base_id = f"{type(obj).__name__}:{get_name(obj)}"
+            self.ids[obj] = f"{base_id}:{self.counts[base_id]}"
+            self.counts[base_id] += 1
+        self.processed_count = len(self.objects)
+
+    def get_id(self, target):
+        """returns the id of an object or material"""
+        if target not in self.ids:
+            self.update()
+        if target in self.ids:
+            return self.ids[target]
+        linked_tag = getattr(target, "linked_tag", None)
+        if linked_tag is not None:
+            return f"{self.get_id(linked_tag.linked_object)}/{type(target).__name__}"
+        return f"{type(target).__name__}:{get_name(target)}:?"
+
+    def get_atom_ids(self):
+        """maps the atoms of the objects and their materials to ids"""
+        self.update()
+        atom_ids = {}
+        for obj, object_id in self.ids.items():
+            atom_ids[obj.obj] = object_id
+            for attribute in ("sketch_material", "fill_material"):
+                material = getattr(obj, attribute, None)
+                if material is not None:
+                    atom_ids[material.obj] = f"{object_id}/{type(material).__name__}"
+        return atom_ids
+
+
+class TimelineWriter:
+    """streams the executed animations and the resulting keys of a scene to a columnar npz file
+    rows are buffered and appended to one temporary file per column, on closing the columns are
+    copied into the npz file block by block so the timeline never has to fit into memory"""
+
+    def __init__(self, path, objects, fps=30, buffer_size=2**16):
+        self.path = path
+        self.object_ids = ObjectIds(objects)
+        self.fps = fps
+        self.buffer_size = buffer_size
+        self.row_count = 0
+        self.tables = {"objects": {}, "params": {}}
+        self.descriptions = {}  # full description ids of the parameters written by tracks
+        self.buffer = {column: [] for column in COLUMNS}
+        self.temporary_directory = tempfile.mkdtemp(prefix="pydeation_timeline_")
+        self.column_files = {column: open(os.path.join(self.temporary_directory, f"{column}.bin"), "wb")
+                             for column in COLUMNS}
+
+    def get_code(self, table, key):
+        """returns the code of a key in one of the string tables"""
+        return self.tables[table].setdefault(key, len(self.tables[table]))
+
+    def add_row(self, object_id, param, frame, value, kind, interpolation=-1, tangents=None):
+        """adds a row, the parameter is given as description id, parameter id or string
+        keys optionally carry their interpolation and tangents given as (time_left, value_left, time_right, value_right)"""
+        param_key = get_param_key(param)
+        if isinstance(param, c4d.DescID) and param_key not in self.descriptions:
+            self.descriptions[param_key] = get_description(param)
+        self.buffer["object"].append(self.get_code("objects", object_id))
+        self.buffer["param"].append(self.get_code("params", param_key))
+        self.buffer["frame"].append(frame)
+        self.buffer["value"].append(to_scalar(value))
+        self.buffer["kind"].append(KINDS.index(kind))
+        self.buffer["interpolation"].append(interpolation)
+        for column, tangent in zip(("time_left", "value_left", "time_right", "value_right"), tangents or [np.nan] * 4):
+            self.buffer[column].append(tangent)
+        if len(self.buffer["frame"]) >= self.buffer_size:
+            self.flush()
+
+    def add_animations(self, animations):
+        """adds the rows of executed animations at the frames of their keyframes"""
+        for animation in animations:
+            object_id = self.object_ids.get_id(animation.target)
+            param = animation.param_id
+            if isinstance(animation, VectorAnimation):
+                self.add_row(object_id, param, animation.frame_start, animation.value_ini, "start")
+                self.add_row(object_id, param, animation.frame_stop - 1, animation.value_fin, "stop")
+            elif isinstance(animation, StateAnimation):
+                self.add_row(object_id, param, animation.frame_start, animation.value, "state")
+
+    def add_tracks(self, document):
+        """adds the keys of all tracks of the document with the interpolation and the tangents of value keys,
+        tangents are only recorded if they are not automatic"""
+        atom_ids = self.object_ids.get_atom_ids()
+        for atom in iterate_atoms(document):
+            tracks = atom.GetCTracks()
+            if not tracks:
+                continue
+            object_id = atom_ids.get(atom, f"#{atom.GetName()}")
+            for track in tracks:
+                param = track.GetDescriptionID()
+                value_track = track.GetTrackCategory() == c4d.CTRACK_CATEGORY_VALUE
+                curve = track.GetCurve()
+                for index in range(curve.GetKeyCount()):
+                    key = curve.GetKey(index)
+                    if not value_track:
+                        self.add_row(object_id, param,
+                                     key.GetTime().GetFrame(self.fps), key.GetGeData(), "key")
+                        continue
+                    tangents = None
+                    if not key.GetNBit(c4d.NBIT_CKEY_AUTO):
+                        tangents = (key.GetTimeLeft().Get(), key.GetValueLeft(),
+                                    key.GetTimeRight().Get(), key.GetValueRight())
+                    self.add_row(object_id, param, key.GetTime().GetFrame(self.fps), key.GetValue(), "key",
+                                 interpolation=key.GetInterpolation(), tangents=tangents)
+
+    def flush(self):
+        """appends the buffered rows to the column files"""
+        for column, dtype in COLUMNS.items():
+            np.asarray(self.buffer[column], dtype=dtype).tofile(
+                self.column_files[column])
+        self.row_count += len(self.buffer["frame"])
+        self.buffer = {column: [] for column in COLUMNS}
+
+    def close(self):
+        """writes the npz file and removes the temporary column files"""
+        self.flush()
+        with zipfile.ZipFile(self.path, "w", allowZip64=True) as archive:
+            for column, dtype in COLUMNS.items():
+                self.column_files[column].close()
+                with archive.open(f"{column}.npy", "w", force_zip64=True) as member:
+                    np.lib.format.write_array_header_1_0(member, {"descr": np.lib.format.dtype_to_descr(np.dtype(dtype)),
+                                                                  "fortran_order": False, "shape": (self.row_count,)})
+                    with open(os.path.join(self.temporary_directory, f"{column}.bin"), "rb") as column_file:
+                        shutil.copyfileobj(column_file, member)
+            for table, codes in self.tables.items():
+                write_array_to_zip(archive, table, np.array(list(codes), dtype=str))
+            write_array_to_zip(archive, "kinds", np.array(KINDS))
+            write_array_to_zip(archive, "descriptions", np.array(
+                [self.descriptions.get(param_key, "") for param_key in self.tables["params"]], dtype=str))
+        shutil.rmtree(self.temporary_directory)
+
+
+class TimelineReader:
+    """reads a timeline file written by the TimelineWriter
+    rows are indexed by object on first query so selecting the rows of an object is a binary search"""
+
+    def __init__(self, path):
+        with np.load(path) as timeline_file:
+            self.columns = {column: timeline_file[column] for column in COLUMNS if column in timeline_file.files}
+            for column, default in KEY_DEFAULTS.items():
+                if column not in self.columns:
+                    self.columns[column] = np.full(len(self.columns["frame"]), default, dtype=COLUMNS[column])
+            self.objects = timeline_file["objects"].tolist()
+            self.params = timeline_file["params"].tolist()
+            self.kinds = timeline_file["kinds"].tolist()
+            if "descriptions" in timeline_file.files:
+                self.descriptions = timeline_file["descriptions"].tolist()
+            else:
+                self.descriptions = [""] * len(self.params)
+        self.object_codes = {object_id: code for code, object_id in enumerate(self.objects)}
+        self.param_codes = {param_key: code for code, param_key in enumerate(self.params)}
+        self.object_order = None
+
+    def __len__(self):
+        return len(self.columns["frame"])
+
+    def get_object_rows(self, object_id):
+        """returns the indices of the rows of an object"""
+        if self.object_order is None:
+            self.object_order = np.argsort(self.columns["object"], kind="stable")
+            self.sorted_objects = self.columns["object"][self.object_order]
+        code = self.object_codes.get(object_id, -1)
+        start, stop = np.searchsorted(self.sorted_objects, [code, code + 1])
+        return self.object_order[start:stop]
+
+    def select(self, object_id=None, param=None, kind=None, frames=None):
+        """returns the columns of the rows matching all given conditions
+        frames is an inclusive range, objects and params are given by their id strings"""
+        if object_id is None:
+            rows = np.arange(len(self))
+        else:
+            rows = self.get_object_rows(object_id)
+        mask = np.ones(len(rows), dtype=bool)
+        if param is not None:
+            mask &= self.columns["param"][rows] == self.param_codes.get(get_param_key(param), -1)
+        if kind is not None:
+            mask &= self.columns["kind"][rows] == self.kinds.index(kind)
+        if frames is not None:
+            frame_column = self.columns["frame"][rows]
+            mask &= (frame_column >= frames[0]) & (frame_column <= frames[1])
+        rows = rows[mask]
+        return {column: values[rows] for column, values in self.columns.items()}
+
+    def keys_for(self, object_id, param=None):
+        """returns the keys written to the tracks of an object"""
+        return self.select(object_id=object_id, param=param, kind="key")
+
+
+def write_keys(atom, desc_id, frames, values, fps, interpolations=None, tangents=None):
+    """writes keys to the track of an atom in one batch, existing keys at the same frames are overwritten
+    nan values stand for non scalar values and are skipped, no track is created if no value is left
+    interpolations of -1 keep the default and tangents given as rows (time_left, value_left, time_right, value_right)
+    replace the automatic tangents unless they are nan"""
+    if interpolations is None:
+        interpolations = np.full(len(frames), -1)
+    if tangents is None:
+        tangents = np.full((len(frames), 4), np.nan)
+    scalar = ~np.isnan(values)
+    if not scalar.any():
+        return 0
+    frames, values, interpolations, tangents = frames[scalar], values[scalar], interpolations[scalar], tangents[scalar]
+    track = atom.FindCTrack(desc_id)
+    if track is None:
+        track = c4d.CTrack(atom, desc_id)
+        atom.InsertTrackSorted(track)
+    curve = track.GetCurve()
+    value_track = track.GetTrackCategory() == c4d.CTRACK_CATEGORY_VALUE
+    data_type = bool if desc_id[desc_id.GetDepth() - 1].dtype == c4d.DTYPE_BOOL else int
+    key_count = 0
+    for frame, value, interpolation, key_tangents in zip(frames.tolist(), values.tolist(), interpolations.tolist(), tangents.tolist()):
+        time = c4d.BaseTime(frame, fps)
+        found_key = curve.FindKey(time, c4d.FINDANIM_EXACT)
+        key = found_key["key"] if found_key else curve.AddKey(time)["key"]
+        if not value_track:
+            key.SetGeData(curve, data_type(value))
+            key_count += 1
+            continue
+        key.SetValue(curve, value)
+        if interpolation >= 0:
+            key.SetInterpolation(curve, interpolation)
+        if not np.isnan(key_tangents[0]):
+            time_left, value_left, time_right, value_right = key_tangents
+            key.ChangeNBit(c4d.NBIT_CKEY_AUTO, c4d.NBITCONTROL_CLEAR)
+            key.SetTimeLeft(curve, c4d.BaseTime(time_left))
+            key.SetValueLeft(curve, value_left)
+            key.SetTimeRight(curve, c4d.BaseTime(time_right))
+            key.SetValueRight(curve, value_right)
+        key_count += 1
+    return key_count
+
+
+def replay_timeline(reader, objects, document):
+    """writes the keys of a timeline onto the objects matched by their stable ids
+    returns a report of the written keys, the number of tracks without matching object or description
+    and the ids of the unsupported tracks holding non scalar values e.g. the point tracks of baked morphs,
+    their keys are not replayed"""
+    atoms = {object_id: atom for atom, object_id in ObjectIds(objects).get_atom_ids().items()}
+    fps = document.GetFps()
+    keys = reader.select(kind="key")
+    order = np.lexsort((keys["frame"], keys["param"], keys["object"]))
+    keys = {column: values[order] for column, values in keys.items()}
+    # split the keys into one group per track
+    changes = np.flatnonzero((np.diff(keys["object"]) != 0) | (np.diff(keys["param"]) != 0)) + 1
+    starts = np.concatenate([[0], changes]) if len(order) else np.zeros(0, dtype=int)
+    stops = np.append(starts[1:], len(order)).astype(int)
+    report = {"keys": 0, "tracks": 0, "unmatched_tracks": 0, "unsupported_tracks": []}
+    for start, stop in zip(starts.tolist(), stops.tolist()):
+        object_id = reader.objects[keys["object"][start]]
+        atom = atoms.get(object_id)
+        description = reader.descriptions[keys["param"][start]]
+        if atom is None or not description:
+            report["unmatched_tracks"] += 1
+            continue
+        if np.isnan(keys["value"][start:stop]).any():
+            report["unsupported_tracks"].append(
+                f"{object_id}/{reader.params[keys['param'][start]]}")
+            continue
+        tangents = np.column_stack([keys[column][start:stop]
+                                    for column in ("time_left", "value_left", "time_right", "value_right")])
+        report["keys"] += write_keys(atom, parse_description(description), keys["frame"][start:stop],
+                                     keys["value"][start:stop], fps, interpolations=keys["interpolation"][start:stop],
+                                     tangents=tangents)
+        report["tracks"] += 1
+    return report
@@ -39,3 +39,34 @@ def match_indices(indices1, indices2):
         return indices_m, indices_n
     else:
         return indices_n, indices_m
+
+
+def matrix_to_array(matrix):
+    # converts a c4d matrix into a 4x3 array of offset and axes
+    return [[vector.x, vector.y, vector.z] for vector in (matrix.off, matrix.v1, matrix.v2, matrix.v3)]
+
+
+def iterate_hierarchy(node):
+    """yields a node, its descendants and its following siblings depth first"""
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        while node is not None:
+            yield node
+            stack.append(node.GetNext())
+            node = node.GetDown()
+
+
+def iterate_atoms(document):
+    """yields the atoms of a document in a deterministic order"""
+    yield document
+    for obj in iterate_hierarchy(document.GetFirstObject()):
+        yield obj
+        for tag in obj.GetTags():
+            yield tag
+            if tag.CheckType(c4d.Texpresso):
+                yield from iterate_hierarchy(tag.GetNodeMaster().GetRoot())
+    yield from document.GetMaterials()
+    for render_data in iterate_hierarchy(document.GetFirstRenderData()):
+        yield render_data
+        yield from iterate_hierarchy(render_data.GetFirstVideoPost())
@@ -342,6 +342,8 @@ class XComposer(XAnimator):
 
     def add_range_mapping(self, input_range):
         """adds a range mapper node and an out port to the xpression"""
+        # remember the input range of the current driver output
+        self.input_range = input_range
         # create nodes
         # this formula ensures that the output value is 1 at frame = frame_fin - 1
         formula = "ceil(t*round(1/(delta_t))*(1+delta_t))/round(1/(delta_t))"
@@ -383,6 +385,8 @@ class XAccessControl(XPression):
     def __init__(self, target, parameter=None, link_target=None, reverse_parameter_range=False, composition_level=None):
         # input counter for adding input sources
         self.input_count = 0
+        # input sources with their interpolation and input range used for analytic evaluation
+        self.input_sources = []
         # specify link target
         self.link_target = link_target
         # specify if range mapper should be inserted before parameter
@@ -463,6 +467,8 @@ class XAccessControl(XPression):
         """adds and connects a bool input and a real input to a given input source"""
         # update input count
         self.input_count += 1
+        self.input_sources.append(
+            (source, interpolate, getattr(source, "input_range", None)))
 
         # create ports
         self.active_interfaces_in.append(